@@ -0,0 +1,5 @@
+# Generated by `python -m commands.build_vercel_entrypoints`. Do not edit.
+from app.factory import create_group_app
+from app.routes.images import router
+
+app = create_group_app("images", router)
@@ -1,4 +1,4 @@
-from typing import Set
+from typing import List, Literal, Optional, Set
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -7,6 +7,21 @@ class Settings(BaseSettings):
     # OpenAPI docs
     OPENAPI_URL: str = "/openapi.json"
 
+    # Database
+    DATABASE_URL: str
+    TEST_DATABASE_URL: Optional[str] = None
+    EXPIRE_ON_COMMIT: bool = False
+    DATABASE_READ_REPLICA_URL: Optional[str] = None
+
+    # Connection pool; 0 disables pooling, as serverless functions need
+    DB_POOL_SIZE: int = 0
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 30 * 60
+    DB_POOL_PRE_PING: bool = True
+    # Disables asyncpg's prepared statement caches, for pgbouncer in transaction mode
+    DB_PGBOUNCER: bool = False
+
 
     # Frontend
     FRONTEND_URL: str = "http://localhost:3000"
@@ -16,6 +31,88 @@ class Settings(BaseSettings):
     
     ANTHROPIC_API_KEY: str
 
+    # "anthropic" uses the Message Batches API, "local" runs items in-process
+    NEW_CARD_BATCH_BACKEND: Literal["anthropic", "local"] = "anthropic"
+
+    # Deep search agent pool
+    DEEP_SEARCH_POOL_SIZE: int = 2
+    DEEP_SEARCH_MAX_QUEUE: int = 8
+    DEEP_SEARCH_QUEUE_TIMEOUT: float = 120.0
+
+    # Deep search result cache
+    DEEP_SEARCH_CACHE_TTL: int = 24 * 60 * 60
+    DEEP_SEARCH_CACHE_MAX_ENTRIES: int = 256
+    DEEP_SEARCH_CACHE_PERSIST: bool = True
+
+    # Generated image cache
+    IMAGE_CACHE_DIR: str = "/tmp/generated-images"
+    IMAGE_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+    IMAGE_VARIANT_WORKERS: int = 4
+
+    # Vapi phone numbers calls are spread over, each throttled separately
+    VAPI_PHONE_NUMBER_IDS: List[str] = ["a8e48b07-00d4-40dc-89bd-25211eaf744b"]
+    VAPI_NUMBER_SELECTION: Literal["lru", "least_loaded"] = "least_loaded"
+    VAPI_NUMBER_CALLS_PER_MINUTE: float = 10.0
+    VAPI_NUMBER_FAILURE_THRESHOLD: int = 3
+    VAPI_NUMBER_QUARANTINE_SECONDS: int = 5 * 60
+
+    # Assistant managed by VapiService, synced to Vapi when its config changes.
+    # Set VAPI_ASSISTANT_ID to call an existing assistant as-is instead.
+    VAPI_ASSISTANT_ID: Optional[str] = None
+    VAPI_ASSISTANT_NAME: str = "InsightBot"
+    VAPI_ASSISTANT_MODEL_PROVIDER: str = "openai"
+    VAPI_ASSISTANT_MODEL: str = "gpt-4o"
+    VAPI_ASSISTANT_VOICE_PROVIDER: str = "vapi"
+    VAPI_ASSISTANT_VOICE_ID: str = "Elliot"
+
+    # Outbound call dispatch (Vapi calls.create), account-wide
+    VAPI_CALLS_PER_SECOND: float = 1.0
+    VAPI_CALL_BURST: int = 3
+    VAPI_MAX_CONCURRENT_CALLS: int = 4
+    VAPI_MAX_RETRIES: int = 4
+    VAPI_RETRY_BASE_DELAY: float = 2.0
+
+    # Vapi webhook ingestion (shared secret sent in X-Vapi-Secret, required to accept events)
+    VAPI_WEBHOOK_SECRET: Optional[str] = None
+    CALL_EVENT_BATCH_SIZE: int = 500
+    CALL_EVENT_FLUSH_INTERVAL: float = 0.25
+    CALL_EVENT_QUEUE_SIZE: int = 10000
+
+    # Background agent jobs: a job still unfinished this many seconds after
+    # it started (or was created, if it never started) is failed
+    JOB_TIMEOUT: int = 30 * 60
+
+    # Outbound call campaigns
+    CAMPAIGN_SCHEDULER_ENABLED: bool = True
+    CAMPAIGN_POLL_INTERVAL: float = 2.0
+    CAMPAIGN_DEFAULT_CALLS_PER_MINUTE: int = 30
+    CAMPAIGN_MAX_CALLS_PER_MINUTE: int = 60
+    CAMPAIGN_STALE_CALL_TIMEOUT: int = 10 * 60
+
+    # Repository indexer: shallow checkouts and a process pool for extraction
+    GITHUB_TOKEN: Optional[str] = None
+    INDEXER_CHECKOUT_DIR: str = "/tmp/repositories"
+    INDEXER_WORKERS: Optional[int] = None  # defaults to one per CPU
+    INDEXER_MAX_FILE_BYTES: int = 512 * 1024
+
+    # Local embedding index of indexed repositories ("hashing" is a lexical
+    # fallback for tests and offline machines)
+    EMBEDDING_INDEX_DIR: str = "/tmp/embedding-index"
+    EMBEDDING_BACKEND: Literal["fastembed", "hashing"] = "fastembed"
+    EMBEDDING_MODEL: str = "BAAI/bge-small-en-v1.5"
+    EMBEDDING_CACHE_DIR: Optional[str] = None  # where the model is downloaded
+    EMBEDDING_DIMENSION: int = 512  # hashing backend only
+    EMBEDDING_SHARD_ROWS: int = 16384
+    EMBEDDING_OPEN_INDEXES: int = 64
+
+    # Repository chat context: retrieved candidates packed under a token budget
+    CHAT_RETRIEVED_CANDIDATES: int = 24
+    CHAT_CONTEXT_TOKEN_BUDGET: int = 3000
+    CHAT_CONTEXT_BLOCK_TOKENS: int = 600  # larger configs are summarized, other files truncated
+
+    # Create service clients in a background task at startup
+    WARM_UP_SERVICES: bool = False
+
     model_config = SettingsConfigDict(
         env_file=".env", env_file_encoding="utf-8", extra="ignore"
     )
@@ -0,0 +1,187 @@
+import time
+import uuid
+from typing import Any, AsyncGenerator, Dict, Optional
+from urllib.parse import urlparse
+
+from fastapi import Depends
+from fastapi_users.db import SQLAlchemyUserDatabase
+from sqlalchemy import NullPool, event, exc
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from .config import settings
+from .models import Base, User
+
+
+def to_async_url(url: str, statement_cache: bool = True) -> str:
+    parsed_db_url = urlparse(url)
+    async_url = (
+        f"postgresql+asyncpg://{parsed_db_url.username}:{parsed_db_url.password}@"
+        f"{parsed_db_url.hostname}{':' + str(parsed_db_url.port) if parsed_db_url.port else ''}"
+        f"{parsed_db_url.path}"
+    )
+    if not statement_cache:
+        async_url += "?prepared_statement_cache_size=0"
+    return async_url
+
+
+class PoolMetrics:
+    """
+    Cumulative metrics of one engine's pool: how long checkouts waited for
+    a connection, how many timed out (starvation) and how many connections
+    were opened or invalidated (churn).
+    """
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.total_wait_time = 0.0
+        self.max_wait_time = 0.0
+
+    def record_wait(self, wait_time: float) -> None:
+        self.checkouts += 1
+        self.total_wait_time += wait_time
+        self.max_wait_time = max(self.max_wait_time, wait_time)
+
+
+class _TimedPoolMixin:
+    # Times the wait for a pooled (or, without pooling, new) connection
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            entry = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        self.metrics.record_wait(time.perf_counter() - start)
+        return entry
+
+    def recreate(self):
+        # Called by engine.dispose(); the new pool keeps counting
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class InstrumentedQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+class InstrumentedNullPool(_TimedPoolMixin, NullPool):
+    pass
+
+
+def build_engine(url: str) -> AsyncEngine:
+    """
+    Engine tuned from the DB_* settings. DB_POOL_SIZE=0 disables pooling for
+    serverless deployments like Vercel, where connections must not outlive
+    a request. DB_PGBOUNCER turns off asyncpg's prepared statement caches,
+    which break behind pgbouncer in transaction pooling mode.
+    """
+    options: Dict[str, Any] = {}
+    connect_args: Dict[str, Any] = {}
+    if settings.DB_POOL_SIZE > 0:
+        options.update(
+            poolclass=InstrumentedQueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+        )
+    else:
+        options["poolclass"] = InstrumentedNullPool
+    if settings.DB_PGBOUNCER:
+        connect_args["statement_cache_size"] = 0
+        # Unique names, since pgbouncer may hand each statement another server connection
+        connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid.uuid4()}__"
+
+    engine = create_async_engine(
+        to_async_url(url, statement_cache=not settings.DB_PGBOUNCER),
+        connect_args=connect_args,
+        **options,
+    )
+    metrics = PoolMetrics()
+    engine.pool.metrics = metrics
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        metrics.connects += 1
+
+    @event.listens_for(engine.sync_engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.invalidations += 1
+
+    return engine
+
+
+def pool_stats(engine: AsyncEngine) -> Dict[str, Any]:
+    """Current occupancy and cumulative metrics of an engine's pool."""
+    pool = engine.pool
+    metrics: PoolMetrics = pool.metrics
+    pooled = isinstance(pool, AsyncAdaptedQueuePool)
+    return {
+        "pooled": pooled,
+        "size": pool.size() if pooled else 0,
+        "checked_out": pool.checkedout() if pooled else None,
+        "idle": pool.checkedin() if pooled else None,
+        "overflow": max(pool.overflow(), 0) if pooled else None,
+        "checkouts": metrics.checkouts,
+        "timeouts": metrics.timeouts,
+        "connects": metrics.connects,
+        "invalidations": metrics.invalidations,
+        "average_wait_time": (
+            metrics.total_wait_time / metrics.checkouts if metrics.checkouts else 0.0
+        ),
+        "max_wait_time": metrics.max_wait_time,
+    }
+
+
+# --- One-Time Initialization ---
+engine = build_engine(settings.DATABASE_URL)
+
+async_session_maker = async_sessionmaker(
+    engine, expire_on_commit=settings.EXPIRE_ON_COMMIT
+)
+
+# Read-only queries go to the replica when one is configured
+read_engine: Optional[AsyncEngine] = (
+    build_engine(settings.DATABASE_READ_REPLICA_URL) if settings.DATABASE_READ_REPLICA_URL else None
+)
+
+read_session_maker = (
+    async_sessionmaker(read_engine, expire_on_commit=settings.EXPIRE_ON_COMMIT)
+    if read_engine is not None
+    else async_session_maker
+)
+
+
+async def create_db_and_tables():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    async with async_session_maker() as session:
+        yield session
+
+
+async def get_read_session() -> AsyncGenerator[AsyncSession, None]:
+    """Session for read-only queries, on the replica if DATABASE_READ_REPLICA_URL is set."""
+    async with read_session_maker() as session:
+        yield session
+
+
+async def get_user_db(session: AsyncSession = Depends(get_async_session)):
+    yield SQLAlchemyUserDatabase(session, User)
+
+
+def get_pool_stats() -> Dict[str, Dict[str, Any]]:
+    stats = {"primary": pool_stats(engine)}
+    if read_engine is not None:
+        stats["replica"] = pool_stats(read_engine)
+    return stats
@@ -1,14 +1,339 @@
 from datetime import datetime
-from typing import Any, Dict, List
-from sqlalchemy import select
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import (
+    Insert, Integer, Select, String, Update, cast, column, delete, func, insert, literal_column, select,
+    update, values,
+)
+from sqlalchemy.dialects.postgresql import JSONB, REGCONFIG, aggregate_order_by, insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 import logging
 
-from app.services.github.schema import RepositoryStatusResponse
-from app.models.models import RepoStatus, Repository
+from app.services.github.schema import RepositorySearchResponse, RepositoryStatusResponse
+from app.models.models import CodeUnit, IndexedFileKind, RepoStatus, Repository, RepositoryFile
 
 logger = logging.getLogger(__name__)
 
+INDEXED_SECTIONS = ("documentation", "documentation_md", "config")
+
+SEARCH_LANGUAGE = "english"
+HEADLINE_OPTIONS = "MaxFragments=1, MaxWords=30, MinWords=10"
+
+# Rows per bulk upsert; asyncpg allows 32767 bind parameters per statement
+REPOSITORY_UPSERT_BATCH = 1000
+# Paths per DELETE of stale repository_files rows, for the same reason
+STALE_PATH_BATCH = 5000
+
+SECTION_KINDS = {
+    "documentation": IndexedFileKind.DOCUMENTATION,
+    "documentation_md": IndexedFileKind.MARKDOWN,
+    "config": IndexedFileKind.CONFIG,
+}
+# Per-kind file counters of the indexed_data summary
+SUMMARY_COUNTERS = {
+    IndexedFileKind.DOCUMENTATION: "documentation_files",
+    IndexedFileKind.MARKDOWN: "markdown_files",
+    IndexedFileKind.CONFIG: "config_files",
+}
+
+
+def build_file_rows(
+    documentation: List[Dict[str, Any]],
+    documentation_md: List[Dict[str, Any]],
+    config: List[Dict[str, Any]],
+) -> List[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+    """
+    Flattens indexed entries into repository_files rows, each paired with
+    the code_units rows of its functions, classes and methods. Entries
+    without a path are skipped, as are repeated paths of the same kind.
+    """
+    rows = []
+    seen = set()
+    for kind, entries in (
+        (IndexedFileKind.DOCUMENTATION, documentation),
+        (IndexedFileKind.MARKDOWN, documentation_md),
+        (IndexedFileKind.CONFIG, config),
+    ):
+        for entry in entries:
+            path = entry.get("path")
+            if not path or (kind, path) in seen:
+                continue
+            seen.add((kind, path))
+            file_row = {
+                "kind": kind,
+                "path": path,
+                "language": entry.get("language"),
+                "description": entry.get("description"),
+                "content": entry.get("content"),
+                "blob_sha": entry.get("blob_sha"),
+            }
+            units = [
+                {
+                    "type": unit["type"],
+                    "name": unit["name"],
+                    "parent": unit.get("parent"),
+                    "description": unit.get("description"),
+                    "line": unit.get("line"),
+                }
+                for unit in entry.get("units", [])
+                if unit.get("type") and unit.get("name")
+            ]
+            rows.append((file_row, units))
+    return rows
+
+def repository_row(owner: str, repo: str, repo_info: Dict[str, Any]) -> Dict[str, Any]:
+    """Column values of a repository from its GitHub metadata (see fetch_repository_info)."""
+    return {
+        "github_id": repo_info["id"],
+        "owner": owner,
+        "name": repo,
+        "full_name": f"{owner}/{repo}",
+        "description": repo_info["description"],
+        "default_branch": repo_info["default_branch"],
+        "stars": repo_info["stars"],
+        "forks": repo_info["forks"],
+        "size": repo_info["size"],
+    }
+
+
+def repository_upsert(rows: List[Dict[str, Any]], status: Optional[RepoStatus] = None) -> Insert:
+    """
+    INSERT ... ON CONFLICT (full_name) DO UPDATE of repository rows. Existing
+    rows get the new metadata; their status (and indexed_at) only changes
+    when `status` is given. New rows start NOT_INDEXED unless `status` is.
+    """
+    now = datetime.utcnow()
+    values = [
+        {
+            **row,
+            "status": status or RepoStatus.NOT_INDEXED,
+            "created_at": now,
+            "updated_at": now,
+            "indexed_at": now if status == RepoStatus.INDEXED else None,
+        }
+        for row in rows
+    ]
+    statement = pg_insert(Repository).values(values)
+    excluded = statement.excluded
+    updates = {
+        name: excluded[name]
+        for name in ("github_id", "description", "default_branch", "stars", "forks", "size")
+    }
+    # onupdate defaults do not apply to ON CONFLICT DO UPDATE
+    updates["updated_at"] = now
+    if status is not None:
+        updates["status"] = excluded.status
+        if status == RepoStatus.INDEXED:
+            updates["indexed_at"] = excluded.indexed_at
+    return statement.on_conflict_do_update(index_elements=[Repository.full_name], set_=updates)
+
+
+def repository_renames(rows: List[Dict[str, Any]]) -> Optional[Update]:
+    """
+    UPDATE moving stored repositories that `rows` list under another full
+    name (renamed or transferred on GitHub, same github_id) to their new
+    owner, name and full_name, so repository_upsert then finds them by
+    full_name instead of inserting a second row with the same github_id.
+    None when no row carries a github_id.
+    """
+    moved_rows = [
+        (row["github_id"], row["owner"], row["name"], row["full_name"])
+        for row in rows
+        if row["github_id"] is not None
+    ]
+    if not moved_rows:
+        return None
+    moved = values(
+        column("github_id", Integer),
+        column("owner", String),
+        column("name", String),
+        column("full_name", String),
+        name="moved",
+    ).data(moved_rows)
+    return (
+        update(Repository)
+        .where(Repository.github_id == moved.c.github_id, Repository.full_name != moved.c.full_name)
+        .values(owner=moved.c.owner, name=moved.c.name, full_name=moved.c.full_name, updated_at=datetime.utcnow())
+    )
+
+
+def _json_fields(**fields: Any) -> List[Any]:
+    # Keys are inlined: jsonb_build_object takes "any", so a bound key has no type
+    return [item for key, value in fields.items() for item in (literal_column(f"'{key}'"), value)]
+
+
+def indexed_entries_query(
+    full_name: str,
+    section: str,
+    path_prefix: Optional[str] = None,
+    names: Optional[List[str]] = None,
+    limit: Optional[int] = None,
+) -> Select:
+    """
+    Selects the entries of one section ("documentation", "documentation_md"
+    or "config") as JSON objects built from repository_files inside
+    Postgres, in path order; code files carry their "units". `path_prefix`
+    keeps paths starting with it; `names` keeps files whose name (last path
+    segment) is listed.
+    """
+    if section not in INDEXED_SECTIONS:
+        raise ValueError(f"Unknown indexed data section: {section}")
+    fields = _json_fields(
+        path=RepositoryFile.path,
+        language=RepositoryFile.language,
+        description=RepositoryFile.description,
+        content=RepositoryFile.content,
+        blob_sha=RepositoryFile.blob_sha,
+    )
+    if section == "documentation":
+        unit = func.jsonb_build_object(
+            *_json_fields(
+                type=CodeUnit.type,
+                name=CodeUnit.name,
+                parent=CodeUnit.parent,
+                description=CodeUnit.description,
+                line=CodeUnit.line,
+            )
+        )
+        units = (
+            select(
+                func.coalesce(
+                    func.jsonb_agg(aggregate_order_by(unit, CodeUnit.id)),
+                    literal_column("'[]'::jsonb"),
+                )
+            )
+            .where(CodeUnit.file_id == RepositoryFile.id)
+            .scalar_subquery()
+        )
+        fields += _json_fields(units=units)
+    statement = (
+        select(func.jsonb_build_object(*fields, type_=JSONB))
+        .select_from(RepositoryFile)
+        .join(Repository, Repository.id == RepositoryFile.repository_id)
+        .where(
+            Repository.full_name == full_name,
+            RepositoryFile.kind == SECTION_KINDS[section],
+        )
+        .order_by(RepositoryFile.path)
+    )
+    if path_prefix:
+        statement = statement.where(RepositoryFile.path.startswith(path_prefix, autoescape=True))
+    if names:
+        file_name = func.regexp_replace(RepositoryFile.path, "^.*/", "")
+        statement = statement.where(file_name.in_(names))
+    if limit is not None:
+        statement = statement.limit(limit)
+    return statement
+
+
+def search_statements(full_name: str, query: str, limit: int) -> Tuple[Select, Select]:
+    """
+    Full-text searches over a repository's files and code units, best match
+    first. Matching and ranking use the GIN-indexed search_vector columns;
+    headlines are only computed for the `limit` rows kept.
+    """
+    language = cast(SEARCH_LANGUAGE, REGCONFIG)
+    tsquery = func.websearch_to_tsquery(language, query)
+    repository_id = (
+        select(Repository.id).where(Repository.full_name == full_name).scalar_subquery()
+    )
+
+    file_rank = func.ts_rank_cd(RepositoryFile.search_vector, tsquery)
+    top_files = (
+        select(RepositoryFile.id, file_rank.label("score"))
+        .where(
+            RepositoryFile.repository_id == repository_id,
+            RepositoryFile.search_vector.op("@@")(tsquery),
+        )
+        .order_by(file_rank.desc())
+        .limit(limit)
+        .subquery()
+    )
+    files = (
+        select(
+            RepositoryFile.path,
+            RepositoryFile.kind,
+            func.ts_headline(
+                language,
+                func.coalesce(RepositoryFile.content, RepositoryFile.description, ""),
+                tsquery,
+                HEADLINE_OPTIONS,
+            ).label("snippet"),
+            top_files.c.score,
+        )
+        .join(top_files, top_files.c.id == RepositoryFile.id)
+        .order_by(top_files.c.score.desc())
+    )
+
+    unit_rank = func.ts_rank_cd(CodeUnit.search_vector, tsquery)
+    top_units = (
+        select(CodeUnit.id, unit_rank.label("score"))
+        .where(
+            CodeUnit.repository_id == repository_id,
+            CodeUnit.search_vector.op("@@")(tsquery),
+        )
+        .order_by(unit_rank.desc())
+        .limit(limit)
+        .subquery()
+    )
+    units = (
+        select(
+            CodeUnit.name,
+            CodeUnit.type,
+            CodeUnit.parent,
+            CodeUnit.line,
+            RepositoryFile.path,
+            func.ts_headline(
+                language, func.coalesce(CodeUnit.description, ""), tsquery, HEADLINE_OPTIONS
+            ).label("snippet"),
+            top_units.c.score,
+        )
+        .join(top_units, top_units.c.id == CodeUnit.id)
+        .join(RepositoryFile, RepositoryFile.id == CodeUnit.file_id)
+        .order_by(top_units.c.score.desc())
+    )
+    return files, units
+
+
+def build_search_response(
+    query: str, file_rows: List[Any], unit_rows: List[Any], limit: int
+) -> RepositorySearchResponse:
+    """Merges file and code unit hits by score into ChatResponse-style snippets."""
+    hits = [
+        {
+            "file": row.path,
+            "kind": row.kind.value,
+            "snippet": row.snippet,
+            "score": row.score,
+        }
+        for row in file_rows
+    ] + [
+        {
+            "function": row.name,
+            "type": row.type,
+            "parent": row.parent,
+            "file": row.path,
+            "line": row.line,
+            "snippet": row.snippet or None,
+            "score": row.score,
+        }
+        for row in unit_rows
+    ]
+    return search_response(query, hits, limit)
+
+
+def search_response(query: str, hits: List[Dict[str, Any]], limit: int) -> RepositorySearchResponse:
+    """Keeps the `limit` best scored hits and lists their files once each."""
+    hits = sorted(hits, key=lambda hit: hit["score"], reverse=True)[:limit]
+
+    source_files = []
+    seen = set()
+    for hit in hits:
+        if hit["file"] not in seen:
+            seen.add(hit["file"])
+            source_files.append({hit["file"].rsplit("/", 1)[-1]: hit["file"]})
+    return RepositorySearchResponse(query=query, code_snippets=hits, source_files=source_files)
+
+
 class GithubDataService:
     
     async def get_repository_status(
@@ -20,26 +345,24 @@ class GithubDataService:
         """
         Get the status of a repository.
         """
-        # Check if repository exists in the database
+        # Only the stored counters are read, never the indexed data itself
         result = await session.execute(
-            select(Repository).where(Repository.full_name == f"{owner}/{repo}")
+            select(
+                Repository.status,
+                Repository.file_count,
+                Repository.code_unit_count,
+                Repository.indexed_at,
+            ).where(Repository.full_name == f"{owner}/{repo}")
         )
-        repository = result.scalars().first()
+        repository = result.first()
         if repository:
-            # Count files from indexed_data if available
-            file_count = 0
-            if repository.indexed_data:
-                documentation = repository.indexed_data.get("documentation", [])
-                documentation_md = repository.indexed_data.get("documentation_md", [])
-                config = repository.indexed_data.get("config", [])
-                file_count = len(documentation) + len(documentation_md) + len(config)
-            
             return RepositoryStatusResponse(
-                status=repository.status,
-                file_count=file_count,
+                status=repository.status.value,
+                file_count=repository.file_count,
+                code_unit_count=repository.code_unit_count,
                 indexed_at=repository.indexed_at.isoformat() if repository.indexed_at else None,
             )
-        return RepositoryStatusResponse(status=RepoStatus.NOT_INDEXED, file_count=None, message="Repository not indexed yet")
+        return RepositoryStatusResponse(status=RepoStatus.NOT_INDEXED.value, file_count=None, message="Repository not indexed yet")
     
     async def create_or_update_repository(
         self, 
@@ -50,89 +373,159 @@ class GithubDataService:
         session: AsyncSession
     ) -> Repository:
         """
-        Create or update a repository in the database.
+        Create or update a repository in the database, in one
+        INSERT ... ON CONFLICT statement that returns the stored row.
         """
-        # Check if repository already exists
-        result = await session.execute(
-            select(Repository).where(Repository.full_name == f"{owner}/{repo}")
+        row = repository_row(owner, repo, repo_info)
+        renames = repository_renames([row])
+        if renames is not None:
+            await session.execute(renames)
+        statement = repository_upsert([row], status)
+        repository = await session.scalar(
+            statement.returning(Repository),
+            execution_options={"populate_existing": True},
         )
-        repository = result.scalars().first()
-        
-        if repository:
-            repository.status = status
-            repository.github_id = repo_info["id"]
-            repository.description = repo_info["description"]
-            repository.default_branch = repo_info["default_branch"]
-            repository.stars = repo_info["stars"]
-            repository.forks = repo_info["forks"]
-            repository.size = repo_info["size"]
-            repository.updated_at = datetime.utcnow()
-            if status == RepoStatus.INDEXED:
-                repository.indexed_at = datetime.utcnow()
-        else:
-            repository = Repository(
-                github_id=repo_info["id"],
-                owner=owner,
-                name=repo,
-                full_name=f"{owner}/{repo}",
-                description=repo_info["description"],
-                default_branch=repo_info["default_branch"],
-                stars=repo_info["stars"],
-                forks=repo_info["forks"],
-                size=repo_info["size"],
-                status=status,
-                indexed_at=datetime.utcnow() if status == RepoStatus.INDEXED else None,
-            )
-            session.add(repository)
-        
         await session.commit()
-        await session.refresh(repository)
         return repository
 
+    async def upsert_repositories(
+        self,
+        repositories: List[Dict[str, Any]],
+        session: AsyncSession,
+        batch_size: int = REPOSITORY_UPSERT_BATCH,
+    ) -> Dict[str, int]:
+        """
+        Registers or refreshes many repositories, `batch_size` rows per
+        statement, in one transaction. Each item holds "owner" and "repo"
+        plus the metadata create_or_update_repository takes. New
+        repositories are NOT_INDEXED; existing ones keep their status, and
+        renamed or transferred ones (same GitHub id) take their new name.
+        Returns the id of each repository by full name.
+        """
+        # A statement cannot update the same row twice, so the last entry for
+        # a GitHub id, then for a full name, wins
+        by_github_id = {}
+        for item in repositories:
+            row = repository_row(item["owner"], item["repo"], item)
+            by_github_id[row["github_id"] if row["github_id"] is not None else row["full_name"]] = row
+        rows = list({row["full_name"]: row for row in by_github_id.values()}.values())
+
+        ids = {}
+        try:
+            for start in range(0, len(rows), batch_size):
+                batch = rows[start : start + batch_size]
+                renames = repository_renames(batch)
+                if renames is not None:
+                    await session.execute(renames)
+                result = await session.execute(
+                    repository_upsert(batch).returning(Repository.full_name, Repository.id)
+                )
+                ids.update(result.tuples().all())
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Error registering {len(rows)} repositories: {str(e)}")
+            raise
+        logger.info(f"Registered or refreshed {len(rows)} repositories")
+        return ids
+
+    async def get_file_blobs(
+        self, repository_id: int, session: AsyncSession
+    ) -> Dict[str, Tuple[str, Optional[str]]]:
+        """
+        Section and blob SHA of each stored file by path: all a re-index
+        needs to tell unchanged files apart, without reading their content.
+        """
+        result = await session.execute(
+            select(RepositoryFile.path, RepositoryFile.kind, RepositoryFile.blob_sha).where(
+                RepositoryFile.repository_id == repository_id
+            )
+        )
+        sections = {kind: section for section, kind in SECTION_KINDS.items()}
+        return {row.path: (sections[row.kind], row.blob_sha) for row in result.all()}
+
     async def save_indexed_data(
         self,
         repository: Repository,
-        documentation_data: Dict[str, Any],
-        documentation_md_data: Dict[str, Any],
-        config_data: Dict[str, Any],
+        changed: Dict[str, List[Dict[str, Any]]],
+        stale_paths: List[str],
         session: AsyncSession
     ) -> None:
         """
-        Save indexed repository data to the single JSON field.
+        Applies an indexing run to the repository_files / code_units tables:
+        the rows of `stale_paths` (files changed or removed since the last
+        run) are deleted, then the `changed` entries are inserted. Rows of
+        unchanged files are neither read nor written; the counters and the
+        summary are adjusted by the rows deleted and inserted.
         
         Args:
             repository: The repository object
-            documentation_data: JSON data from docstrings_json
-            documentation_md_data: JSON data from ducomentations_json  
-            config_data: JSON data from configs_json
+            changed: New entries by section ("documentation", "documentation_md", "config")
+            stale_paths: Paths whose stored rows are replaced or removed
             session: Database session
         """
         try:
-            # Combine all data into a single JSON structure
-            combined_data = {
-                "documentation": documentation_data.get("documentation", []),
-                "documentation_md": documentation_md_data.get("documentation_md", []),
-                "config": config_data.get("config", []),
+            summary = (repository.indexed_data or {}).get("summary") or {}
+            counts = {kind: summary.get(name, 0) for kind, name in SUMMARY_COUNTERS.items()}
+
+            deleted_units = 0
+            for start in range(0, len(stale_paths), STALE_PATH_BATCH):
+                stale_files = (
+                    RepositoryFile.repository_id == repository.id,
+                    RepositoryFile.path.in_(stale_paths[start : start + STALE_PATH_BATCH]),
+                )
+                # Deleted explicitly (not by cascade) to keep the unit counter exact
+                result = await session.execute(
+                    delete(CodeUnit).where(
+                        CodeUnit.file_id.in_(select(RepositoryFile.id).where(*stale_files))
+                    )
+                )
+                deleted_units += result.rowcount
+                result = await session.execute(
+                    delete(RepositoryFile).where(*stale_files).returning(RepositoryFile.kind)
+                )
+                for kind in result.scalars().all():
+                    counts[kind] -= 1
+
+            file_rows = build_file_rows(
+                changed.get("documentation", []),
+                changed.get("documentation_md", []),
+                changed.get("config", []),
+            )
+            unit_rows = []
+            if file_rows:
+                now = datetime.utcnow()
+                result = await session.execute(
+                    insert(RepositoryFile).returning(RepositoryFile.id, sort_by_parameter_order=True),
+                    [{**file_row, "repository_id": repository.id, "created_at": now} for file_row, _ in file_rows],
+                )
+                for file_id, (_, units) in zip(result.scalars().all(), file_rows):
+                    unit_rows.extend(
+                        {**unit, "repository_id": repository.id, "file_id": file_id} for unit in units
+                    )
+            if unit_rows:
+                await session.execute(insert(CodeUnit), unit_rows)
+            for file_row, _ in file_rows:
+                counts[file_row["kind"]] += 1
+
+            indexed_at = datetime.utcnow()
+            repository.indexed_data = {
                 "summary": {
-                    "total_files": (
-                        len(documentation_data.get("documentation", [])) +
-                        len(documentation_md_data.get("documentation_md", [])) +
-                        len(config_data.get("config", []))
-                    ),
-                    "indexed_at": datetime.utcnow().isoformat(),
-                    "documentation_files": len(documentation_data.get("documentation", [])),
-                    "markdown_files": len(documentation_md_data.get("documentation_md", [])),
-                    "config_files": len(config_data.get("config", []))
+                    "total_files": sum(counts.values()),
+                    "indexed_at": indexed_at.isoformat(),
+                    **{SUMMARY_COUNTERS[kind]: count for kind, count in counts.items()},
                 }
             }
-            
-            # Save to the single JSON field
-            repository.indexed_data = combined_data
+            repository.file_count = sum(counts.values())
+            repository.code_unit_count = (repository.code_unit_count or 0) - deleted_units + len(unit_rows)
             repository.status = RepoStatus.INDEXED
-            repository.indexed_at = datetime.utcnow()
+            repository.indexed_at = indexed_at
             
             await session.commit()
-            logger.info(f"Successfully saved indexed data for repository {repository.full_name}")
+            logger.info(
+                f"Saved indexed data for repository {repository.full_name}: "
+                f"{len(file_rows)} file(s) written, {len(stale_paths)} replaced or removed"
+            )
             
         except Exception as e:
             await session.rollback()
@@ -149,14 +542,162 @@ class GithubDataService:
         Retrieve indexed data for a repository.
         
         Returns:
-            Dictionary containing all indexed data or empty dict if not found
+            Dictionary with the entries of each section and the summary, or
+            empty dict if not found
         """
         result = await session.execute(
-            select(Repository).where(Repository.full_name == f"{owner}/{repo}")
+            select(Repository.indexed_data).where(Repository.full_name == f"{owner}/{repo}")
         )
-        repository = result.scalars().first()
+        indexed_data = result.scalar()
         
-        if repository and repository.indexed_data:
-            return repository.indexed_data
-        
-        return {}
\ No newline at end of file
+        if not indexed_data:
+            return {}
+
+        return {
+            **{
+                section: await self.get_indexed_entries(owner, repo, section, session)
+                for section in INDEXED_SECTIONS
+            },
+            "summary": indexed_data.get("summary", {}),
+        }
+
+    async def get_indexed_entries(
+        self,
+        owner: str,
+        repo: str,
+        section: str,
+        session: AsyncSession,
+        path_prefix: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Entries of one section ("documentation", "documentation_md" or
+        "config"), optionally only those under `path_prefix`. Filtering runs
+        in Postgres, so only matching entries are transferred.
+        """
+        result = await session.execute(
+            indexed_entries_query(
+                f"{owner}/{repo}", section, path_prefix=path_prefix, limit=limit
+            )
+        )
+        return list(result.scalars().all())
+
+    async def get_config_files(
+        self,
+        owner: str,
+        repo: str,
+        names: List[str],
+        session: AsyncSession,
+    ) -> List[Dict[str, Any]]:
+        """
+        Config entries whose file name is one of `names`, in any directory
+        (e.g. ["pyproject.toml", "package.json"]).
+        """
+        if not names:
+            return []
+        result = await session.execute(
+            indexed_entries_query(f"{owner}/{repo}", "config", names=names)
+        )
+        return list(result.scalars().all())
+
+    async def get_indexed_summary(
+        self,
+        owner: str,
+        repo: str,
+        session: AsyncSession
+    ) -> Dict[str, Any]:
+        """
+        The summary block of the indexed data, without its entries.
+        """
+        result = await session.execute(
+            select(Repository.indexed_data["summary"]).where(
+                Repository.full_name == f"{owner}/{repo}"
+            )
+        )
+        return result.scalar() or {}
+
+    async def search_repository(
+        self,
+        owner: str,
+        repo: str,
+        query: str,
+        session: AsyncSession,
+        limit: int = 10,
+    ) -> RepositorySearchResponse:
+        """
+        Top `limit` files and code units matching `query` (web search
+        syntax: quoted phrases, OR, -exclusions), each with a highlighted
+        snippet and its path.
+        """
+        files, units = search_statements(f"{owner}/{repo}", query, limit)
+        file_rows = (await session.execute(files)).all()
+        unit_rows = (await session.execute(units)).all()
+        return build_search_response(query, file_rows, unit_rows, limit)
+
+    async def get_embedding_rows(
+        self,
+        owner: str,
+        repo: str,
+        session: AsyncSession,
+        content_chars: int = 2000,
+    ) -> Tuple[List[Any], List[Any]]:
+        """
+        File rows (path, kind, description, the first `content_chars` of
+        content) and code unit rows (name, type, parent, line, description,
+        path) to build the repository's embedding index from.
+        """
+        repository_id = (
+            select(Repository.id)
+            .where(Repository.full_name == f"{owner}/{repo}")
+            .scalar_subquery()
+        )
+        files = await session.execute(
+            select(
+                RepositoryFile.path,
+                RepositoryFile.kind,
+                RepositoryFile.description,
+                func.left(RepositoryFile.content, content_chars).label("content"),
+            )
+            .where(RepositoryFile.repository_id == repository_id)
+            .order_by(RepositoryFile.id)
+        )
+        units = await session.execute(
+            select(
+                CodeUnit.name,
+                CodeUnit.type,
+                CodeUnit.parent,
+                CodeUnit.line,
+                CodeUnit.description,
+                RepositoryFile.path,
+            )
+            .join(RepositoryFile, RepositoryFile.id == CodeUnit.file_id)
+            .where(CodeUnit.repository_id == repository_id)
+            .order_by(CodeUnit.id)
+        )
+        return files.all(), units.all()
+
+    async def get_file_contents(
+        self,
+        owner: str,
+        repo: str,
+        paths: List[str],
+        session: AsyncSession,
+        max_chars: int,
+    ) -> Dict[str, str]:
+        """
+        The first `max_chars` of the stored content of the markdown and
+        config files among `paths`, by path. Truncated in Postgres, so large
+        files are never transferred whole.
+        """
+        if not paths:
+            return {}
+        result = await session.execute(
+            select(RepositoryFile.path, func.left(RepositoryFile.content, max_chars).label("content"))
+            .join(Repository, Repository.id == RepositoryFile.repository_id)
+            .where(
+                Repository.full_name == f"{owner}/{repo}",
+                RepositoryFile.path.in_(paths),
+                RepositoryFile.content.is_not(None),
+            )
+        )
+        return {row.path: row.content for row in result}
\ No newline at end of file
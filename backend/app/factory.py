@@ -0,0 +1,80 @@
+import logging, sys
+
+logging.basicConfig(
+    level=logging.INFO,                        # show INFO+ globally
+    format="%(asctime)s %(levelname)-8s %(name)s: %(message)s",
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import List, Optional
+
+from fastapi import APIRouter, FastAPI, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from app.routes.groups import ROUTE_GROUPS
+from app.services.registry import ServiceUnavailableError, services
+from app.utils import simple_generate_unique_route_id
+from app.config import settings
+
+
+def build_app(routers: List[APIRouter], lifespan=None) -> FastAPI:
+    """
+    A FastAPI app serving `routers`, with the CORS and error handling every
+    entry shares. Imports nothing but the routers it is given.
+    """
+    app = FastAPI(
+        generate_unique_id_function=simple_generate_unique_route_id,
+        openapi_url=settings.OPENAPI_URL,
+        lifespan=lifespan,
+    )
+
+    @app.exception_handler(ServiceUnavailableError)
+    async def service_unavailable_handler(request: Request, exc: ServiceUnavailableError):
+        return JSONResponse(status_code=503, content={"detail": str(exc)})
+
+    # Middleware for CORS configuration
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.CORS_ORIGINS,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    for router in routers:
+        app.include_router(router)
+    return app
+
+
+def warm_up_lifespan(names: Optional[List[str]]):
+    """
+    Lifespan that optionally starts creating the services `names` (all of
+    them when None) in the background, so the first requests do not pay
+    for it.
+    """
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        warm_up = (
+            asyncio.create_task(services.warm_up(names))
+            if settings.WARM_UP_SERVICES
+            else None
+        )
+        yield
+        if warm_up is not None:
+            warm_up.cancel()
+
+    return lifespan
+
+
+def create_group_app(route_group: str, router: APIRouter) -> FastAPI:
+    """
+    App of one serverless route group (see app.routes.groups): only the
+    group's router is mounted, and its services are created on first use
+    (or warmed up in the background with WARM_UP_SERVICES).
+    """
+    return build_app(
+        [router], lifespan=warm_up_lifespan(ROUTE_GROUPS[route_group]["services"])
+    )
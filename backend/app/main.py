@@ -1,29 +1,45 @@
-import logging, sys
-
-logging.basicConfig(
-    level=logging.INFO,                        # show INFO+ globally
-    format="%(asctime)s %(levelname)-8s %(name)s: %(message)s",
-    handlers=[logging.StreamHandler(sys.stdout)]
-)
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
+from app.factory import build_app, warm_up_lifespan
+from app.routes import agent, calls, deep_search, images, jobs, new_card
 from app.routes.interface import router as chat_router
-from app.utils import simple_generate_unique_route_id
+from app.services.campaigns.service import campaign_scheduler
+from app.services.vapi.webhooks import call_event_writer
 from app.config import settings
 
-app = FastAPI(
-    generate_unique_id_function=simple_generate_unique_route_id,
-    openapi_url=settings.OPENAPI_URL,
-)
-
-# Middleware for CORS configuration
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.CORS_ORIGINS,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-app.include_router(chat_router)
+# Every route group's router plus the routes outside the groups. Serverless
+# group entries (api/<group>.py) mount only their own router instead.
+ROUTERS = [
+    agent.router,
+    new_card.router,
+    deep_search.router,
+    images.router,
+    calls.router,
+    jobs.router,
+    chat_router,
+]
+
+
+def create_app() -> FastAPI:
+    """
+    Builds the whole application, with the background workers that need a
+    long-lived process.
+    """
+    warm_up = warm_up_lifespan(None)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        async with warm_up(app):
+            if settings.CAMPAIGN_SCHEDULER_ENABLED:
+                campaign_scheduler.start()
+            call_event_writer.start()
+            yield
+            await call_event_writer.stop()
+            if settings.CAMPAIGN_SCHEDULER_ENABLED:
+                await campaign_scheduler.stop()
+
+    return build_app(ROUTERS, lifespan=lifespan)
+
+
+app = create_app()
@@ -2,5 +2,9 @@
 Database models for the application.
 """
 
-from app.models.models import Repository, RepoStatus
+from app.models.models import Repository, RepoStatus, DeepSearchCacheEntry
+from app.models.models import RepositoryFile, CodeUnit, IndexedFileKind
+from app.models.models import AgentJob, JobKind, JobStatus
+from app.models.models import CallCampaign, CampaignCall, CampaignStatus, CampaignCallStatus
+from app.models.models import CallEvent, VapiAssistant
 from app.models.models import Base, User
\ No newline at end of file
@@ -1,8 +1,8 @@
 from fastapi_users.db import SQLAlchemyBaseUserTableUUID
 from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy import Column, String, Integer, ForeignKey, Text, DateTime, Enum, JSON
+from sqlalchemy import BigInteger, Column, Computed, String, Integer, ForeignKey, Text, DateTime, Enum, JSON, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR, UUID
 from uuid import uuid4
 from datetime import datetime
 import enum
@@ -50,15 +50,232 @@ class Repository(Base):
     size = Column(Integer, default=0)
     status = Column(Enum(RepoStatus), default=RepoStatus.NOT_INDEXED)
     
-    # Single JSON field containing all indexed data
-    # Structure: {
-    #   "documentation": [...],      # Code files with docstrings
-    #   "documentation_md": [...],   # Markdown files
-    #   "config": [...],            # Configuration files
-    #   "summary": {...}            # Optional summary metadata
-    # }
-    indexed_data = Column(JSON)
+    # Summary of the last indexing run: {"summary": {"total_files",
+    # "documentation_files", "markdown_files", "config_files", "indexed_at"}}.
+    # The indexed files themselves live in repository_files and code_units,
+    # so a run only writes the rows of the files that changed.
+    indexed_data = Column(JSONB)
+
+    # Maintained when indexed data is saved, so status checks never read it
+    file_count = Column(Integer, default=0, server_default="0", nullable=False)
+    code_unit_count = Column(Integer, default=0, server_default="0", nullable=False)
     
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    indexed_at = Column(DateTime) 
\ No newline at end of file
+    indexed_at = Column(DateTime) 
+
+    files = relationship(
+        "RepositoryFile", back_populates="repository", cascade="all, delete-orphan", passive_deletes=True
+    )
+
+
+class IndexedFileKind(enum.Enum):
+    DOCUMENTATION = "documentation"
+    MARKDOWN = "markdown"
+    CONFIG = "config"
+
+
+class RepositoryFile(Base):
+    __tablename__ = "repository_files"
+    __table_args__ = (
+        UniqueConstraint("repository_id", "path", "kind"),
+        Index("ix_repository_files_repository_id_kind", "repository_id", "kind"),
+        Index("ix_repository_files_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    repository_id = Column(
+        Integer, ForeignKey("repositories.id", ondelete="CASCADE"), nullable=False
+    )
+    kind = Column(Enum(IndexedFileKind), nullable=False)
+    path = Column(String, nullable=False)
+    language = Column(String)
+    # Module docstring for code files, first heading or paragraph otherwise
+    description = Column(Text)
+    # Raw text of markdown and config files; code files keep their units
+    content = Column(Text)
+    # Git blob the row was extracted from; unchanged files are skipped on re-index
+    blob_sha = Column(String)
+    # Full-text search document: path and description rank above content
+    search_vector = Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', translate(path, '/._-', '    ')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'A') || "
+            "setweight(to_tsvector('english', left(coalesce(content, ''), 200000)), 'B')",
+            persisted=True,
+        ),
+    )
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    repository = relationship("Repository", back_populates="files")
+    code_units = relationship(
+        "CodeUnit", back_populates="file", cascade="all, delete-orphan", passive_deletes=True
+    )
+
+
+class CodeUnit(Base):
+    __tablename__ = "code_units"
+    __table_args__ = (
+        Index("ix_code_units_repository_id_type", "repository_id", "type"),
+        Index("ix_code_units_search_vector", "search_vector", postgresql_using="gin"),
+    )
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    # Denormalized from the file so per-repository queries skip the join
+    repository_id = Column(
+        Integer, ForeignKey("repositories.id", ondelete="CASCADE"), nullable=False
+    )
+    file_id = Column(
+        BigInteger, ForeignKey("repository_files.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    # function, class or method
+    type = Column(String, nullable=False)
+    name = Column(String, nullable=False, index=True)
+    # Enclosing class of a method
+    parent = Column(String)
+    description = Column(Text)
+    line = Column(Integer)
+    search_vector = Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', name || ' ' || coalesce(parent, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+    )
+
+    file = relationship("RepositoryFile", back_populates="code_units")
+
+class DeepSearchCacheEntry(Base):
+    __tablename__ = "deep_search_cache"
+
+    # sha256 of the normalized prompt and the agent configuration
+    cache_key = Column(String(64), primary_key=True)
+    prompt = Column(Text, nullable=False)
+    response = Column(Text, nullable=False)
+    agent_config = Column(JSON)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+
+class JobKind(enum.Enum):
+    DEEP_SEARCH = "deep_search"
+    IMAGE_GENERATION = "image_generation"
+    OUTBOUND_CALL = "outbound_call"
+
+
+class JobStatus(enum.Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class AgentJob(Base):
+    __tablename__ = "agent_jobs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    kind = Column(Enum(JobKind), nullable=False, index=True)
+    status = Column(Enum(JobStatus), default=JobStatus.PENDING, nullable=False, index=True)
+    request = Column(JSON)
+    result = Column(JSON)
+    error = Column(Text)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+
+
+class CampaignStatus(enum.Enum):
+    RUNNING = "running"
+    COMPLETED = "completed"
+    CANCELED = "canceled"
+
+
+class CampaignCallStatus(enum.Enum):
+    PENDING = "pending"
+    IN_PROGRESS = "in_progress"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELED = "canceled"
+
+
+class CallCampaign(Base):
+    __tablename__ = "call_campaigns"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    status = Column(
+        Enum(CampaignStatus), default=CampaignStatus.RUNNING, nullable=False, index=True
+    )
+    calls_per_minute = Column(Integer, nullable=False)
+    duplicates_skipped = Column(Integer, nullable=False, default=0)
+    # Local hours [start, end) during which no call is placed; may wrap midnight
+    quiet_hours_start = Column(Integer)
+    quiet_hours_end = Column(Integer)
+    timezone = Column(String, nullable=False, default="UTC")
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    finished_at = Column(DateTime)
+
+    calls = relationship("CampaignCall", back_populates="campaign", cascade="all, delete-orphan")
+
+
+class CampaignCall(Base):
+    __tablename__ = "campaign_calls"
+    __table_args__ = (
+        UniqueConstraint("campaign_id", "target_number"),
+        Index("ix_campaign_calls_campaign_id_status", "campaign_id", "status"),
+        Index("ix_campaign_calls_claimed_at", "claimed_at"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    campaign_id = Column(
+        UUID(as_uuid=True), ForeignKey("call_campaigns.id", ondelete="CASCADE"), nullable=False
+    )
+    # Order of the call in the campaign request; calls are placed in this order
+    position = Column(Integer, nullable=False)
+    target_number = Column(String, nullable=False)
+    request = Column(JSON, nullable=False)
+    status = Column(
+        Enum(CampaignCallStatus), default=CampaignCallStatus.PENDING, nullable=False
+    )
+    call_id = Column(String)
+    error = Column(Text)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    # Taken by a scheduler worker; counts against the per-minute budgets
+    claimed_at = Column(DateTime)
+    # Accepted by Vapi
+    dispatched_at = Column(DateTime)
+    finished_at = Column(DateTime)
+
+    campaign = relationship("CallCampaign", back_populates="calls")
+
+
+class CallEvent(Base):
+    __tablename__ = "call_events"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    call_id = Column(String, nullable=False, index=True)
+    # Vapi server message type, e.g. status-update or end-of-call-report
+    event_type = Column(String, nullable=False)
+    status = Column(String)
+    payload = Column(JSON, nullable=False)
+    received_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class VapiAssistant(Base):
+    __tablename__ = "vapi_assistants"
+
+    # One managed assistant per name, updated in place when its config changes
+    name = Column(String, primary_key=True)
+    assistant_id = Column(String, nullable=False)
+    # sha256 of the config last pushed to Vapi
+    config_hash = Column(String(64), nullable=False)
+    config = Column(JSON, nullable=False)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,93 @@
+import uuid
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+import logging
+from typing import Any, Dict, List
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_async_session
+from app.models.models import JobKind
+from app.services.github.schema import JobResponse
+from app.services.registry import services
+from app.services.vapi.schema import OutboundCallRequest, OutboundCallResponse, CallResultResponse
+from app.services.vapi.webhooks import get_call_result
+from app.services.jobs.service import JobFailedError, job_service, to_job_response
+
+router = APIRouter(prefix="/chat", tags=["chat"])
+
+logger = logging.getLogger(__name__)
+
+
+@router.post("/outbound-call", response_model=OutboundCallResponse)
+async def trigger_outbound_call(
+    call_request: OutboundCallRequest,
+):
+    """
+    Déclenche un appel sortant avec une Market Overview.
+    
+    - **target_number**: Numéro de téléphone du destinataire (format E.164, ex: +33611421334)
+    - **market_overview**: Texte de la Market Overview à résumer pendant l'appel
+    - **name**: Nom de la personne à qui on passe l'appel
+    - **action_to_take**: Action à entreprendre pendant l'appel
+    """
+    vapi_service = await services.aget("vapi")
+    try:
+        logger.info(f"Triggering owund call to {call_request.target_number}")
+        return await vapi_service.make_outbound_call(call_request)
+    except Exception as e:
+        logger.error(f"Error triggering outbound call: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Outbound call failed: {str(e)}")
+
+
+async def _place_outbound_call(call_request: OutboundCallRequest) -> OutboundCallResponse:
+    """Job runner for outbound calls: an unsuccessful call fails the job."""
+    vapi_service = await services.aget("vapi")
+    result = await vapi_service.make_outbound_call(call_request)
+    if not result.success:
+        raise JobFailedError(result.message)
+    return result
+
+
+@router.post("/outbound-call/jobs", response_model=JobResponse, status_code=202)
+async def create_outbound_call_job(
+    call_request: OutboundCallRequest,
+    background_tasks: BackgroundTasks,
+    session: AsyncSession = Depends(get_async_session),
+):
+    """
+    Places an outbound call in the background and returns a job id to poll
+    with GET /jobs/{job_id}.
+    """
+    await services.aget("vapi")
+    job = await job_service.create_job(
+        JobKind.OUTBOUND_CALL, call_request.model_dump(mode="json"), session
+    )
+    background_tasks.add_task(
+        job_service.run_job, job.id, lambda: _place_outbound_call(call_request)
+    )
+    return to_job_response(job)
+
+
+@router.get("/outbound-call/calls/{call_id}", response_model=CallResultResponse)
+async def get_outbound_call_result(
+    call_id: str,
+    session: AsyncSession = Depends(get_async_session),
+):
+    """
+    Returns the latest status, transcript and summary of a call, as reported
+    by Vapi webhooks.
+    """
+    result = await get_call_result(call_id, session)
+    if result is None:
+        raise HTTPException(status_code=404, detail="No events received for this call.")
+    return result
+
+
+@router.get("/outbound-call/numbers")
+async def get_phone_number_stats() -> List[Dict[str, Any]]:
+    """
+    Returns load, failures and quarantine state of each outbound phone number.
+    """
+    vapi_service = await services.aget("vapi")
+    return vapi_service.phone_numbers.stats()
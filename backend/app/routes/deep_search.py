@@ -0,0 +1,130 @@
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+import logging
+from typing import Any, Dict
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_async_session
+from app.models.models import JobKind
+from app.services.agent.agent_pool import AgentPoolExhaustedError
+from app.services.github.schema import AgentRequest, AgentResponse, AgentPoolStats, JobResponse
+from app.services.jobs.service import job_service, to_job_response
+from app.services.registry import services
+
+router = APIRouter(prefix="/chat", tags=["chat"])
+
+logger = logging.getLogger(__name__)
+
+
+def _too_many_requests(error: AgentPoolExhaustedError) -> HTTPException:
+    """Maps a full agent pool to a 429 telling the client when to retry."""
+    return HTTPException(
+        status_code=429,
+        detail=str(error),
+        headers={"Retry-After": str(error.retry_after)},
+    )
+
+
+@router.post("/deep-search", response_model=AgentResponse)
+async def perform_deep_search(
+    agent_request: AgentRequest,
+    bypass_cache: bool = False,
+    refresh_cache: bool = False,
+):
+    """
+    Takes a prompt and uses a web-searching agent to find a
+    comprehensive answer.
+
+    - **bypass_cache**: Neither read nor store a cached answer
+    - **refresh_cache**: Run the agent again and replace the cached answer
+    """
+    if not agent_request.prompt or not agent_request.prompt.strip():
+        raise HTTPException(status_code=400, detail="Prompt cannot be empty.")
+
+    try:
+        deep_search_service = await services.aget("deep_search")
+        return await deep_search_service.run_deep_search(
+            agent_request, bypass_cache=bypass_cache, refresh_cache=refresh_cache
+        )
+    except AgentPoolExhaustedError as e:
+        raise _too_many_requests(e)
+    except RuntimeError as e:
+        # Catches backend service failures (e.g., agent execution)
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        # Catch-all for any other unexpected server error
+        logger.exception(f"Unhandled exception in /deep-search endpoint: {e}")
+        raise HTTPException(
+            status_code=500, detail="An internal server error occurred."
+        )
+
+@router.post("/deep-search/stream")
+async def stream_deep_search(
+    agent_request: AgentRequest,
+):
+    """
+    Streaming variant of /deep-search. Sends each agent step as an NDJSON
+    line as soon as it is produced, then the final answer in chunks.
+    """
+    if not agent_request.prompt or not agent_request.prompt.strip():
+        raise HTTPException(status_code=400, detail="Prompt cannot be empty.")
+
+    deep_search_service = await services.aget("deep_search")
+    try:
+        events = await deep_search_service.stream_deep_search(agent_request)
+    except AgentPoolExhaustedError as e:
+        raise _too_many_requests(e)
+
+    async def event_lines():
+        async for event in events:
+            yield event.model_dump_json(exclude_none=True) + "\n"
+
+    return StreamingResponse(
+        event_lines(),
+        media_type="application/x-ndjson",
+        # Keeps reverse proxies from buffering the stream.
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.get("/deep-search/pool", response_model=AgentPoolStats)
+async def get_deep_search_pool_stats():
+    """
+    Returns occupancy, queue depth and wait-time metrics of the deep search
+    agent pool.
+    """
+    deep_search_service = await services.aget("deep_search")
+    return deep_search_service.deep_search_pool.stats()
+
+@router.get("/deep-search/cache")
+async def get_deep_search_cache_stats() -> Dict[str, Any]:
+    """
+    Returns hit/miss counters and the hit rate of the deep search result cache.
+    """
+    deep_search_service = await services.aget("deep_search")
+    return deep_search_service.result_cache.stats()
+
+
+@router.post("/deep-search/jobs", response_model=JobResponse, status_code=202)
+async def create_deep_search_job(
+    agent_request: AgentRequest,
+    background_tasks: BackgroundTasks,
+    session: AsyncSession = Depends(get_async_session),
+):
+    """
+    Starts a deep search in the background and returns a job id to poll
+    with GET /jobs/{job_id}.
+    """
+    if not agent_request.prompt or not agent_request.prompt.strip():
+        raise HTTPException(status_code=400, detail="Prompt cannot be empty.")
+
+    deep_search_service = await services.aget("deep_search")
+    job = await job_service.create_job(
+        JobKind.DEEP_SEARCH, agent_request.model_dump(mode="json"), session
+    )
+    background_tasks.add_task(
+        job_service.run_job,
+        job.id,
+        lambda: deep_search_service.run_deep_search(agent_request),
+    )
+    return to_job_response(job)
@@ -0,0 +1,52 @@
+"""
+Route groups deployed as separate serverless functions.
+
+Each group's routes live in their own router module, app/routes/<group>.py,
+and are served by their own ASGI entry (api/<group>.py, generated by
+`python -m commands.build_vercel_entrypoints`) that imports only that
+router. Paths that match no group, or one of its `excludes`, fall through
+to api/index.py, which serves the whole app.
+
+Kept free of app imports so the entrypoint builder runs without settings.
+"""
+
+from typing import Dict, List, TypedDict
+
+
+class RouteGroup(TypedDict):
+    # Path prefixes, matched on whole path segments.
+    prefixes: List[str]
+    # Prefixes under `prefixes` served by the whole app instead, for routes
+    # that need its long-lived workers (see app.main).
+    excludes: List[str]
+    # Service registry names warmed up at startup when WARM_UP_SERVICES is set.
+    services: List[str]
+
+
+ROUTE_GROUPS: Dict[str, RouteGroup] = {
+    "agent": {"prefixes": ["/chat/agent"], "excludes": [], "services": []},
+    "new_card": {"prefixes": ["/chat/new-card"], "excludes": [], "services": ["new_card"]},
+    "deep_search": {"prefixes": ["/chat/deep-search"], "excludes": [], "services": ["deep_search"]},
+    "images": {
+        "prefixes": ["/chat/generate-image", "/chat/images"],
+        "excludes": [],
+        "services": ["image_generation"],
+    },
+    "calls": {
+        "prefixes": ["/chat/outbound-call"],
+        # Campaigns are dialled by the campaign scheduler and webhook events
+        # are batched by the event writer; neither runs in a serverless entry.
+        "excludes": ["/chat/outbound-call/campaigns", "/chat/outbound-call/webhook"],
+        "services": ["vapi"],
+    },
+    "jobs": {"prefixes": ["/chat/jobs"], "excludes": [], "services": []},
+}
+
+
+def _under(path: str, prefixes: List[str]) -> bool:
+    return any(path == prefix or path.startswith(prefix + "/") for prefix in prefixes)
+
+
+def matches_group(path: str, group: str) -> bool:
+    definition = ROUTE_GROUPS[group]
+    return _under(path, definition["prefixes"]) and not _under(path, definition["excludes"])
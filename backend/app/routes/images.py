@@ -0,0 +1,84 @@
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException
+from fastapi.responses import FileResponse, Response
+import asyncio
+import logging
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_async_session
+from app.models.models import JobKind
+from app.services.agent.image_cache import image_cache, media_type_for
+from app.services.github.schema import ImageGenerationResponse, ImageGenerationRequest, JobResponse
+from app.services.jobs.service import job_service, to_job_response
+from app.services.registry import services
+
+router = APIRouter(prefix="/chat", tags=["chat"])
+
+logger = logging.getLogger(__name__)
+
+
+@router.get("/images/{image_key}", response_class=FileResponse)
+async def get_generated_image(
+    image_key: str,
+    if_none_match: Optional[str] = Header(None),
+):
+    """
+    Serves a generated image by content address. The bytes behind a key never
+    change, so clients may cache it forever and revalidate with the ETag.
+    """
+    try:
+        path = await asyncio.to_thread(image_cache.get, image_key)
+    except ValueError:
+        path = None
+    if path is None:
+        raise HTTPException(status_code=404, detail="Image not found.")
+
+    etag = f'"{image_key}"'
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=31536000, immutable"}
+    if if_none_match:
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if etag in candidates or "*" in candidates:
+            return Response(status_code=304, headers=headers)
+    return FileResponse(path, media_type=media_type_for(image_key), headers=headers)
+
+@router.post("/generate-image", response_model=ImageGenerationResponse)
+async def generate_image_endpoint(
+    request: ImageGenerationRequest,
+):
+    """
+    Generates an image based on a descriptive prompt using a text-to-image model.
+    """
+    try:
+        image_generation = await services.aget("image_generation")
+        return await image_generation.generate_image_for_task(request)
+    except RuntimeError as e:
+        # Catches backend service failures (e.g., HF API is down)
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        logger.exception(f"Unhandled exception in /generate-image endpoint: {e}")
+        raise HTTPException(
+            status_code=500, detail="An internal server error occurred."
+        )
+
+
+@router.post("/generate-image/jobs", response_model=JobResponse, status_code=202)
+async def create_image_generation_job(
+    request: ImageGenerationRequest,
+    background_tasks: BackgroundTasks,
+    session: AsyncSession = Depends(get_async_session),
+):
+    """
+    Starts an image generation in the background and returns a job id to
+    poll with GET /jobs/{job_id}.
+    """
+    image_generation = await services.aget("image_generation")
+    job = await job_service.create_job(
+        JobKind.IMAGE_GENERATION, request.model_dump(mode="json"), session
+    )
+    background_tasks.add_task(
+        job_service.run_job,
+        job.id,
+        lambda: image_generation.generate_image_for_task(request),
+    )
+    return to_job_response(job)
@@ -1,122 +1,154 @@
-from fastapi import APIRouter, HTTPException
-import logging
+import uuid
 
-from app.services.agent import new_card_service, deep_search_service
-from app.services.agent.image_generation_logic import generate_image_for_task
-from app.services.github.schema import AgentRequest, AgentResponse, NewCardAgentResponse, ImageGenerationResponse, \
-    ImageGenerationRequest
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+import hmac
+from typing import Any, Dict, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import get_async_session, get_pool_stats, get_read_session
+from app.db.github_data_service import GithubDataService
+from app.services.github.schema import RepositorySearchResponse, ServiceStatus, ChatRequest, ChatResponse
+from app.services.campaigns.service import CampaignService
 from app.services.chat.service import ChatService
-from app.services.agent.service import AgentService
-from app.services.vapi.service import VapiService
-from app.services.vapi.schema import OutboundCallRequest, OutboundCallResponse
+from app.services.registry import services
+from app.services.vapi.schema import CampaignRequest, CampaignResponse, VapiWebhookRequest
+from app.services.vapi.webhooks import call_event_writer, to_call_event
 
+# Routes outside the serverless route groups (see app.routes.groups); each
+# group has its own router module. The webhook and campaign routes are
+# here because they need the full app's long-lived workers: the webhook
+# event writer and the campaign scheduler (see app.main).
 router = APIRouter(prefix="/chat", tags=["chat"])
 
-logger = logging.getLogger(__name__)
-
-# Initialize services
 chat_service = ChatService()
-agent_service = AgentService()
-vapi_service = VapiService()
+campaign_service = CampaignService()
+github_data_service = GithubDataService()
 
 
-
-@router.post("/agent", response_model=AgentResponse)
-async def trigger_agent(
-    agent_request: AgentRequest,
+@router.get("/repositories/{owner}/{repo}/search", response_model=RepositorySearchResponse)
+async def search_repository(
+    owner: str,
+    repo: str,
+    q: str = Query(..., min_length=1, max_length=500),
+    limit: int = Query(10, ge=1, le=50),
+    session: AsyncSession = Depends(get_read_session),
 ):
     """
-    Simple mock endpoint that takes a prompt and triggers an agent.
+    Full-text search over an indexed repository's docs, markdown, configs
+    and code units. Returns the best snippets with their file paths.
     """
-    try:
-        return await agent_service.process_prompt(agent_request)
-    except Exception as e:
-        logger.error(f"Error processing agent request: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Agent processing failed: {str(e)}")
+    return await github_data_service.search_repository(owner, repo, q, session, limit=limit)
 
 
-@router.post("/outbound-call", response_model=OutboundCallResponse)
-async def trigger_outbound_call(
-    call_request: OutboundCallRequest,
+@router.post("/repositories/{owner}/{repo}", response_model=ChatResponse)
+async def chat_with_repository(
+    owner: str,
+    repo: str,
+    chat_request: ChatRequest,
+    session: AsyncSession = Depends(get_read_session),
 ):
     """
-    Déclenche un appel sortant avec une Market Overview.
-    
-    - **target_number**: Numéro de téléphone du destinataire (format E.164, ex: +33611421334)
-    - **market_overview**: Texte de la Market Overview à résumer pendant l'appel
-    - **name**: Nom de la personne à qui on passe l'appel
-    - **action_to_take**: Action à entreprendre pendant l'appel
+    Answers a question about an indexed repository with the files and code
+    units closest to it.
     """
-    try:
-        logger.info(f"Triggering owund call to {call_request.target_number}")
-        return await vapi_service.make_outbound_call(call_request)
-    except Exception as e:
-        logger.error(f"Error triggering outbound call: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Outbound call failed: {str(e)}")
-
-@router.post("/new-card", response_model=NewCardAgentResponse)
-async def create_new_card_from_prompt(
-        agent_request: AgentRequest,
-):
-        """
-        Takes a natural language promptand uses a smolagent to create a
-        structured new task card.
-        """
-        if not agent_request.prompt or not agent_request.prompt.strip():
-            raise HTTPException(status_code=400, detail="Prompt cannot be emty.")
+    return await chat_service.chat_with_repository(owner, repo, chat_request, session)
+
+
+@router.get("/database/pool")
+async def get_database_pool_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Occupancy, wait times, timeouts and connection churn of the database
+    pools (the replica's too, when one is configured).
+    """
+    return get_pool_stats()
+
+
+@router.get("/services", response_model=Dict[str, ServiceStatus])
+async def get_service_status():
+    """
+    Returns the readiness of each lazily created backend service and how
+    long its import and initialization took.
+    """
+    return services.status()
+
+
+@router.post("/outbound-call/webhook")
+async def receive_vapi_webhook(
+    webhook_request: VapiWebhookRequest,
+    x_vapi_secret: Optional[str] = Header(None),
+) -> Dict[str, bool]:
+    """
+    Server URL for Vapi. Call status, final transcripts and end-of-call
+    reports are buffered and written to Postgres in batches; the request is
+    acknowledged right away. Requests must carry VAPI_WEBHOOK_SECRET in
+    X-Vapi-Secret; without a configured secret no event is accepted.
+    """
+    if not settings.VAPI_WEBHOOK_SECRET:
+        raise HTTPException(
+            status_code=503, detail="Vapi webhooks are disabled: VAPI_WEBHOOK_SECRET is not set."
+        )
+    if not hmac.compare_digest(x_vapi_secret or "", settings.VAPI_WEBHOOK_SECRET):
+        raise HTTPException(status_code=401, detail="Invalid webhook secret.")
 
+    event = to_call_event(webhook_request.message)
+    if event is not None:
         try:
-            return await new_card_service.create_new_card_from_prompt(agent_request)
-        except ValueError as e:
-            # Catches user errors or bad output from the model (4xx error)
-            raise HTTPException(status_code=400, detail=str(e))
+            await call_event_writer.submit(event)
         except RuntimeError as e:
-            # Catches backend service failures (5xx error)
             raise HTTPException(status_code=503, detail=str(e))
-        except Exception as e:
-            # Catch-all for any other unexpected server error
-            logger.exception(f"Unhandled exception in /new-card endpoint: {e}")
-            raise HTTPException(
-                status_code=500, detail="An internal server error occurred."
-            )
-
-@router.post("/deep-search", response_model=AgentResponse)
-async def perform_deep_search(
-    agent_request: AgentRequest,
-):
+    return {"received": True}
+
+
+@router.get("/outbound-call/webhook/stats")
+async def get_webhook_stats() -> Dict[str, int]:
     """
-    Takes a prompt and uses a web-searching agent to find a
-    comprehensive answer.
+    Returns counters of the webhook event buffer.
     """
-    if not agent_request.prompt or not agent_request.prompt.strip():
-        raise HTTPException(status_code=400, detail="Prompt cannot be empty.")
+    return call_event_writer.stats()
 
-    try:
-        return await deep_search_service.run_deep_search(agent_request)
-    except RuntimeError as e:
-        # Catches backend service failures (e.g., agent execution)
-        raise HTTPException(status_code=503, detail=str(e))
-    except Exception as e:
-        # Catch-all for any other unexpected server error
-        logger.exception(f"Unhandled exception in /deep-search endpoint: {e}")
-        raise HTTPException(
-            status_code=500, detail="An internal server error occurred."
-        )
 
-@router.post("/generate-image", response_model=ImageGenerationResponse)
-async def generate_image_endpoint(
-    request: ImageGenerationRequest,
+@router.post("/outbound-call/campaigns", response_model=CampaignResponse, status_code=202)
+async def create_call_campaign(
+    campaign_request: CampaignRequest,
+    session: AsyncSession = Depends(get_async_session),
 ):
     """
-    Generates an image based on a descriptive prompt using a text-to-image model.
+    Queues a list of outbound calls, one per unique target number. The
+    campaign scheduler places them within the calls-per-minute budget and
+    outside quiet hours; poll GET /outbound-call/campaigns/{campaign_id}
+    for progress.
     """
     try:
-        return await generate_image_for_task(request)
-    except RuntimeError as e:
-        # Catches backend service failures (e.g., HF API is down)
-        raise HTTPException(status_code=503, detail=str(e))
-    except Exception as e:
-        logger.exception(f"Unhandled exception in /generate-image endpoint: {e}")
-        raise HTTPException(
-            status_code=500, detail="An internal server error occurred."
-        )
\ No newline at end of file
+        return await campaign_service.create_campaign(campaign_request, session)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/outbound-call/campaigns/{campaign_id}", response_model=CampaignResponse)
+async def get_call_campaign(
+    campaign_id: uuid.UUID,
+    session: AsyncSession = Depends(get_async_session),
+):
+    """
+    Returns the status of a campaign and how many calls are in each state.
+    """
+    campaign = await campaign_service.get_campaign(campaign_id, session)
+    if campaign is None:
+        raise HTTPException(status_code=404, detail="Campaign not found.")
+    return campaign
+
+
+@router.post("/outbound-call/campaigns/{campaign_id}/cancel", response_model=CampaignResponse)
+async def cancel_call_campaign(
+    campaign_id: uuid.UUID,
+    session: AsyncSession = Depends(get_async_session),
+):
+    """
+    Cancels the calls of a campaign that have not been placed yet.
+    """
+    campaign = await campaign_service.cancel_campaign(campaign_id, session)
+    if campaign is None:
+        raise HTTPException(status_code=404, detail="Campaign not found.")
+    return campaign
@@ -0,0 +1,25 @@
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_async_session
+from app.services.github.schema import JobResponse
+from app.services.jobs.service import job_service
+
+router = APIRouter(prefix="/chat", tags=["chat"])
+
+
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: uuid.UUID,
+    session: AsyncSession = Depends(get_async_session),
+):
+    """
+    Returns the status of an asynchronous job and its result once finished.
+    """
+    job = await job_service.get_job(job_id, session)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    return job
@@ -0,0 +1,130 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+import logging
+
+from app.services.agent.card_executor import CardGraphExecutor
+from app.services.agent.service import agent_service
+from app.services.github.schema import AgentRequest, NewCardAgentResponse, CardExecutionRequest, \
+    CardExecutionResponse, NewCardBatchRequest, NewCardBatchResponse
+from app.services.registry import services
+
+router = APIRouter(prefix="/chat", tags=["chat"])
+
+logger = logging.getLogger(__name__)
+
+
+@router.post("/new-card", response_model=NewCardAgentResponse)
+async def create_new_card_from_prompt(
+        agent_request: AgentRequest,
+):
+        """
+        Takes a natural language promptand uses a smolagent to create a
+        structured new task card.
+        """
+        if not agent_request.prompt or not agent_request.prompt.strip():
+            raise HTTPException(status_code=400, detail="Prompt cannot be emty.")
+
+        try:
+            new_card_service = await services.aget("new_card")
+            return await new_card_service.create_new_card_from_prompt(agent_request)
+        except ValueError as e:
+            # Catches user errors or bad output from the model (4xx error)
+            raise HTTPException(status_code=400, detail=str(e))
+        except RuntimeError as e:
+            # Catches backend service failures (5xx error)
+            raise HTTPException(status_code=503, detail=str(e))
+        except Exception as e:
+            # Catch-all for any other unexpected server error
+            logger.exception(f"Unhandled exception in /new-card endpoint: {e}")
+            raise HTTPException(
+                status_code=500, detail="An internal server error occurred."
+            )
+
+@router.post("/new-card/batch", response_model=NewCardBatchResponse)
+async def submit_new_card_batch(
+        batch_request: NewCardBatchRequest,
+):
+        """
+        Submits many /new-card prompts as one message batch. Poll
+        GET /new-card/batch/{batch_id} for per-item status and cards.
+        """
+        if any(not request.prompt or not request.prompt.strip() for request in batch_request.requests):
+            raise HTTPException(status_code=400, detail="Prompts cannot be empty.")
+
+        try:
+            new_card_batch_service = await services.aget("new_card_batch")
+            return await new_card_batch_service.submit(batch_request)
+        except RuntimeError as e:
+            raise HTTPException(status_code=503, detail=str(e))
+
+@router.get("/new-card/batch/{batch_id}", response_model=NewCardBatchResponse)
+async def get_new_card_batch(
+        batch_id: str,
+):
+        """
+        Returns the status of a /new-card batch and the validated cards of
+        every item once the batch has ended.
+        """
+        try:
+            new_card_batch_service = await services.aget("new_card_batch")
+            return await new_card_batch_service.get(batch_id)
+        except KeyError:
+            raise HTTPException(status_code=404, detail="Batch not found.")
+        except RuntimeError as e:
+            raise HTTPException(status_code=503, detail=str(e))
+
+@router.post("/new-card/execute", response_model=CardExecutionResponse)
+async def execute_card_graph(
+    execution_request: CardExecutionRequest,
+):
+    """
+    Executes a card graph returned by /new-card. Every card whose
+    dependencies are done runs concurrently with the rest of its level.
+    """
+    if not execution_request.cards:
+        raise HTTPException(status_code=400, detail="Cards cannot be empty.")
+
+    async def run_deep_search(agent_request: AgentRequest):
+        deep_search_service = await services.aget("deep_search")
+        return await deep_search_service.run_deep_search(agent_request)
+
+    # Services are resolved by the cards that need them, so a plan without
+    # phone cards runs without Vapi configured (and likewise for research).
+    card_executor = CardGraphExecutor(
+        research_runner=run_deep_search,
+        get_vapi_service=lambda: services.aget("vapi"),
+        agent_service=agent_service,
+    )
+    try:
+        return await card_executor.execute(execution_request)
+    except ValueError as e:
+        # Invalid dependency graph (unknown card_id or cycle)
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.exception(f"Unhandled exception in /new-card/execute endpoint: {e}")
+        raise HTTPException(
+            status_code=500, detail="An internal server error occurred."
+        )
+
+@router.post("/new-card/stream")
+async def stream_new_cards_from_prompt(
+        agent_request: AgentRequest,
+):
+        """
+        Streaming variant of /new-card. Sends each card as an NDJSON line as
+        soon as the model has finished writing it, then a done event.
+        """
+        if not agent_request.prompt or not agent_request.prompt.strip():
+            raise HTTPException(status_code=400, detail="Prompt cannot be empty.")
+
+        new_card_service = await services.aget("new_card")
+
+        async def event_lines():
+            async for event in new_card_service.stream_new_cards_from_prompt(agent_request):
+                yield event.model_dump_json(exclude_none=True) + "\n"
+
+        return StreamingResponse(
+            event_lines(),
+            media_type="application/x-ndjson",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
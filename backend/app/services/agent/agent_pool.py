@@ -0,0 +1,243 @@
+import asyncio
+import collections
+import logging
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Deque, Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class AgentPoolExhaustedError(Exception):
+    """Raised when no agent can be checked out because the wait queue is full."""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _reset_agent_memory(agent: Any) -> None:
+    """Clears the memory a smolagents agent kept from its previous run."""
+    agent.memory.reset()
+
+
+class AgentLease:
+    """An agent checked out of an AgentPool. Release it exactly once."""
+
+    def __init__(self, pool: "AgentPool", agent: Any, wait_time: float):
+        self.pool = pool
+        self.agent = agent
+        self.wait_time = wait_time
+        self.acquired_at = time.monotonic()
+        self._released = False
+        self._running: Optional[asyncio.Future] = None
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Runs `func(*args)` in a worker thread. A cancelled caller stops
+        waiting, but the thread cannot be stopped: the lease then keeps its
+        slot until the thread has finished (see release).
+        """
+        self._running = asyncio.ensure_future(asyncio.to_thread(func, *args))
+        return await asyncio.shield(self._running)
+
+    def release(self, discard: bool = False) -> None:
+        """
+        Returns the agent to the pool. With discard=True the agent is dropped
+        and its slot freed; if a thread started by `run` still uses it, only
+        once that thread is done.
+        """
+        if self._released:
+            return
+        self._released = True
+        if self._running is not None and not self._running.done():
+            self._running.add_done_callback(lambda running: self._release_after(running, discard))
+            return
+        self.pool._release(self, discard)
+
+    def _release_after(self, running: asyncio.Future, discard: bool) -> None:
+        if not running.cancelled() and running.exception() is not None:
+            self.pool.logger.warning(f"Abandoned agent run failed: {running.exception()}")
+        self.pool._release(self, discard)
+
+
+class AgentPool:
+    """
+    A fixed-size pool of isolated agent instances with a bounded wait queue.
+
+    Agents are created lazily by `factory`, up to `size`. When every agent is
+    busy, at most `max_waiters` requests wait (for up to `wait_timeout`
+    seconds); any further request is rejected immediately with
+    AgentPoolExhaustedError so callers can answer 429 + Retry-After.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        size: int,
+        max_waiters: int,
+        wait_timeout: Optional[float] = None,
+        reset: Callable[[Any], None] = _reset_agent_memory,
+        name: str = "agent-pool",
+    ):
+        if size < 1:
+            raise ValueError("Agent pool size must be at least 1.")
+        self.factory = factory
+        self.size = size
+        self.max_waiters = max_waiters
+        self.wait_timeout = wait_timeout
+        self.reset = reset
+        self.name = name
+        self.logger = logger
+
+        self._idle: List[Any] = []
+        self._created = 0
+        self._waiters: Deque[asyncio.Future] = collections.deque()
+        self._replacements: Set[asyncio.Task] = set()
+
+        # Metrics
+        self._acquired = 0
+        self._rejected = 0
+        self._total_wait_time = 0.0
+        self._max_wait_time = 0.0
+        self._completed = 0
+        self._total_hold_time = 0.0
+
+    async def acquire(self) -> AgentLease:
+        """Checks out an agent, waiting in the queue if all agents are busy."""
+        start_time = time.monotonic()
+
+        if self._idle:
+            agent = self._idle.pop()
+        elif self._created < self.size:
+            self._created += 1
+            try:
+                agent = await asyncio.to_thread(self.factory)
+            except Exception:
+                self._created -= 1
+                raise
+        else:
+            agent = await self._wait_for_agent()
+
+        wait_time = time.monotonic() - start_time
+        self._acquired += 1
+        self._total_wait_time += wait_time
+        self._max_wait_time = max(self._max_wait_time, wait_time)
+        return AgentLease(self, agent, wait_time)
+
+    @asynccontextmanager
+    async def checkout(self):
+        """
+        Context manager around acquire/release. The agent is discarded if the
+        block fails or is cancelled; a thread started with `lease.run` keeps
+        the slot until it finishes.
+        """
+        lease = await self.acquire()
+        try:
+            yield lease
+        except BaseException:
+            lease.release(discard=True)
+            raise
+        lease.release()
+
+    async def _wait_for_agent(self) -> Any:
+        if len(self._waiters) >= self.max_waiters:
+            self._rejected += 1
+            raise AgentPoolExhaustedError(
+                f"{self.name} is at capacity ({self.size} busy, "
+                f"{len(self._waiters)} waiting).",
+                retry_after=self.retry_after(),
+            )
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            return await asyncio.wait_for(waiter, self.wait_timeout)
+        except BaseException as e:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            # The agent may have been handed over just as we gave up.
+            if waiter.done() and not waiter.cancelled() and waiter.exception() is None:
+                self._hand_over(waiter.result())
+            if isinstance(e, asyncio.TimeoutError):
+                self._rejected += 1
+                raise AgentPoolExhaustedError(
+                    f"Timed out after {self.wait_timeout}s waiting for {self.name}.",
+                    retry_after=self.retry_after(),
+                ) from None
+            raise
+
+    def _release(self, lease: AgentLease, discard: bool) -> None:
+        self._completed += 1
+        self._total_hold_time += time.monotonic() - lease.acquired_at
+
+        agent = lease.agent
+        if not discard:
+            try:
+                self.reset(agent)
+            except Exception as e:
+                self.logger.warning(f"Failed to reset agent, discarding it: {e}")
+                discard = True
+
+        if discard:
+            self._created -= 1
+            # Free slot: build a fresh agent for the next waiter, off the event loop.
+            if self._waiters:
+                self._created += 1
+                task = asyncio.get_running_loop().create_task(self._replace())
+                self._replacements.add(task)
+                task.add_done_callback(self._replacements.discard)
+            return
+
+        self._hand_over(agent)
+
+    async def _replace(self) -> None:
+        try:
+            agent = await asyncio.to_thread(self.factory)
+        except Exception as e:
+            self._created -= 1
+            self.logger.error(f"Failed to replace discarded agent: {e}")
+            # The slot is free again; fail the waiter that was due to get it
+            # rather than leave it waiting for an agent that is not coming.
+            while self._waiters:
+                waiter = self._waiters.popleft()
+                if not waiter.done():
+                    waiter.set_exception(e)
+                    return
+            return
+        self._hand_over(agent)
+
+    def _hand_over(self, agent: Any) -> None:
+        """Gives an agent to the oldest live waiter, or parks it as idle."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(agent)
+                return
+        self._idle.append(agent)
+
+    def retry_after(self) -> int:
+        """Seconds a rejected client should wait, from the average run time."""
+        average_hold = self._total_hold_time / self._completed if self._completed else 1.0
+        return max(1, math.ceil(average_hold * (len(self._waiters) + 1) / self.size))
+
+    def stats(self) -> Dict[str, Any]:
+        """Current occupancy and cumulative queueing metrics."""
+        return {
+            "size": self.size,
+            "created": self._created,
+            "idle": len(self._idle),
+            "in_use": self._created - len(self._idle),
+            "queue_depth": len(self._waiters),
+            "max_queue_depth": self.max_waiters,
+            "acquired": self._acquired,
+            "rejected": self._rejected,
+            "average_wait_time": (
+                self._total_wait_time / self._acquired if self._acquired else 0.0
+            ),
+            "max_wait_time": self._max_wait_time,
+            "average_run_time": (
+                self._total_hold_time / self._completed if self._completed else 0.0
+            ),
+        }
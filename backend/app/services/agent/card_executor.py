@@ -0,0 +1,186 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+
+from app.services.github.schema import (
+    AgentRequest,
+    AgentResponse,
+    CardExecutionRequest,
+    CardExecutionResponse,
+    CardExecutionResult,
+    NewCardData,
+    TaskType,
+)
+from app.services.vapi.schema import OutboundCallRequest, OutboundCallResponse
+
+logger = logging.getLogger(__name__)
+
+ResearchRunner = Callable[[AgentRequest], Awaitable[AgentResponse]]
+# Returns the Vapi service; only called for plans with phone cards
+VapiServiceGetter = Callable[[], Awaitable[Any]]
+
+
+def plan_levels(cards: List[NewCardData]) -> List[List[NewCardData]]:
+    """
+    Groups cards into topological levels. Every card of a level only depends
+    on cards of earlier levels, so a whole level can run at once.
+    """
+    cards_by_id = {card.card_id: card for card in cards}
+    if len(cards_by_id) != len(cards):
+        raise ValueError("Invalid dependency graph: duplicate card_id found.")
+
+    remaining = {}
+    for card in cards:
+        for dep_id in card.dependencies:
+            if dep_id not in cards_by_id:
+                raise ValueError(
+                    f"Invalid dependency graph: Card '{card.title}' depends on "
+                    f"non-existent card_id '{dep_id}'."
+                )
+        remaining[card.card_id] = set(card.dependencies)
+
+    levels = []
+    while remaining:
+        ready = [card_id for card_id, deps in remaining.items() if not deps]
+        if not ready:
+            raise ValueError(
+                "Invalid dependency graph: cycle detected between cards "
+                f"{sorted(remaining)}."
+            )
+        levels.append([cards_by_id[card_id] for card_id in ready])
+        for card_id in ready:
+            del remaining[card_id]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+    return levels
+
+
+class CardGraphExecutor:
+    """Runs a card graph level by level, executing every ready card concurrently."""
+
+    def __init__(self, research_runner: ResearchRunner, get_vapi_service: VapiServiceGetter, agent_service):
+        self.research_runner = research_runner
+        self.get_vapi_service = get_vapi_service
+        self.agent_service = agent_service
+        self.logger = logger
+
+    async def execute(self, request: CardExecutionRequest) -> CardExecutionResponse:
+        """
+        Executes all cards of the request. A card whose dependency did not
+        complete is skipped instead of being run on missing inputs.
+        """
+        start_time = time.time()
+        levels = plan_levels(request.cards)
+        results: Dict[str, CardExecutionResult] = {}
+
+        for level_index, level in enumerate(levels):
+            self.logger.info(
+                f"Executing level {level_index + 1}/{len(levels)} with {len(level)} card(s)"
+            )
+            level_results = await asyncio.gather(
+                *(
+                    self._execute_card(card, level_index, request, results)
+                    for card in level
+                )
+            )
+            for result in level_results:
+                results[result.card_id] = result
+
+        execution_time = time.time() - start_time
+        self.logger.info(
+            f"Executed {len(results)} card(s) in {len(levels)} level(s) in {execution_time:.2f}s"
+        )
+        return CardExecutionResponse(
+            results=list(results.values()),
+            level_count=len(levels),
+            execution_time=execution_time,
+        )
+
+    async def _execute_card(
+        self,
+        card: NewCardData,
+        level: int,
+        request: CardExecutionRequest,
+        completed: Dict[str, CardExecutionResult],
+    ) -> CardExecutionResult:
+        """Dispatches a single card to the service matching its task type."""
+        blocked_by = [
+            dep_id for dep_id in card.dependencies if completed[dep_id].status != "done"
+        ]
+        if blocked_by:
+            return CardExecutionResult(
+                card_id=card.card_id,
+                task_type=card.task_type,
+                status="skipped",
+                level=level,
+                error=f"Dependencies not completed: {', '.join(blocked_by)}",
+            )
+
+        upstream = [
+            completed[dep_id].response
+            for dep_id in card.dependencies
+            if completed[dep_id].response
+        ]
+        start_time = time.time()
+        try:
+            if card.task_type == TaskType.RESEARCH:
+                response_text, metadata = await self._run_research(card)
+            elif card.task_type == TaskType.PHONE:
+                response_text, metadata = await self._run_phone(card, request, upstream)
+            else:
+                response_text, metadata = await self._run_agent(card)
+        except Exception as e:
+            self.logger.error(f"Card '{card.card_id}' failed: {e}")
+            return CardExecutionResult(
+                card_id=card.card_id,
+                task_type=card.task_type,
+                status="failed",
+                level=level,
+                error=str(e),
+                execution_time=time.time() - start_time,
+            )
+
+        return CardExecutionResult(
+            card_id=card.card_id,
+            task_type=card.task_type,
+            status="done",
+            level=level,
+            response=response_text,
+            execution_time=time.time() - start_time,
+            metadata=metadata,
+        )
+
+    async def _run_research(self, card: NewCardData):
+        prompt = f"{card.title} - {card.description}" if card.description else card.title
+        result = await self.research_runner(AgentRequest(prompt=prompt))
+        return result.response, {"agent_id": result.agent_id, **(result.metadata or {})}
+
+    async def _run_phone(
+        self,
+        card: NewCardData,
+        request: CardExecutionRequest,
+        upstream: List[str],
+    ):
+        if not request.target_number or not request.contact_name:
+            raise ValueError("target_number and contact_name are required for phone tasks.")
+
+        # Brief the contact with the research this card waited for, if any.
+        market_overview = "\n\n".join(upstream) if upstream else card.description
+        vapi_service = await self.get_vapi_service()
+        result: OutboundCallResponse = await vapi_service.make_outbound_call(
+            OutboundCallRequest(
+                target_number=request.target_number,
+                market_overview=market_overview,
+                name=request.contact_name,
+                action_to_take=card.title,
+            )
+        )
+        if not result.success:
+            raise RuntimeError(result.message)
+        return result.message, {"call_id": result.call_id, **(result.metadata or {})}
+
+    async def _run_agent(self, card: NewCardData):
+        prompt = f"Title: {card.title}\nDescription: {card.description}"
+        result = await self.agent_service.process_prompt(AgentRequest(prompt=prompt))
+        return result.response, {"agent_id": result.agent_id, **(result.metadata or {})}
@@ -1,17 +1,33 @@
 import asyncio
 import logging
 import os
+import threading
 import time
 import uuid
+from typing import AsyncIterator
 
 from smolagents import CodeAgent, LiteLLMModel
 from smolagents.default_tools import DuckDuckGoSearchTool
+from smolagents.memory import ActionStep, FinalAnswerStep, PlanningStep
 
+from app.config import settings
+from app.database import async_session_maker
+from app.services.agent.agent_pool import AgentLease, AgentPool
+from app.services.agent.result_cache import DeepSearchResultCache, make_cache_key
 # Using the requested import path
-from app.services.github.schema import AgentRequest, AgentResponse
+from app.services.github.schema import AgentRequest, AgentResponse, DeepSearchStreamEvent
 
 logger = logging.getLogger(__name__)
 
+# Size of the pieces the final answer is split into when streaming.
+FINAL_ANSWER_CHUNK_SIZE = 400
+
+_STREAM_END = object()
+
+MODEL_ID = "claude-sonnet-4-20250514"
+MAX_STEPS = 2
+ANSWER_INSTRUCTIONS = "The final answer should be less then 50 sentences."
+
 
 def _create_agent() -> CodeAgent:
     """Initializes the expensive agent object."""
@@ -19,36 +35,209 @@ def _create_agent() -> CodeAgent:
     if "ANTHROPIC_API_KEY" not in os.environ:
         raise RuntimeError("ANTHROPIC_API_KEY environment variable not set.")
 
-    model_id = "claude-sonnet-4-20250514"
-    model = LiteLLMModel(model_id=model_id, temperature=0.1)
+    model = LiteLLMModel(model_id=MODEL_ID, temperature=0.1)
     search_tool = DuckDuckGoSearchTool()
-    agent = CodeAgent(tools=[search_tool], model=model, max_steps=2)
+    agent = CodeAgent(tools=[search_tool], model=model, max_steps=MAX_STEPS)
     logger.info("Deep Search Agent created successfully!")
     return agent
 
 
 # --- One-Time Initialization ---
-# This agent is created once when the module is first imported.
-deep_search_agent = _create_agent()
+# Each concurrent request gets its own agent from this pool, so runs never
+# share memory. Agents are created on first use, up to the pool size.
+deep_search_pool = AgentPool(
+    _create_agent,
+    size=settings.DEEP_SEARCH_POOL_SIZE,
+    max_waiters=settings.DEEP_SEARCH_MAX_QUEUE,
+    wait_timeout=settings.DEEP_SEARCH_QUEUE_TIMEOUT,
+    name="deep-search-pool",
+)
 AGENT_ID = f"deep-search-func-{str(uuid.uuid4())[:8]}"
 
+# Answers are keyed by the normalized prompt and everything that shapes them.
+AGENT_CONFIG = {
+    "model_id": MODEL_ID,
+    "max_steps": MAX_STEPS,
+    "instructions": ANSWER_INSTRUCTIONS,
+}
+result_cache = DeepSearchResultCache(
+    ttl=settings.DEEP_SEARCH_CACHE_TTL,
+    max_entries=settings.DEEP_SEARCH_CACHE_MAX_ENTRIES,
+    session_maker=async_session_maker if settings.DEEP_SEARCH_CACHE_PERSIST else None,
+)
+
 
-async def run_deep_search(agent_request: AgentRequest) -> AgentResponse:
-    """Runs the agent with a user's prompt."""
+def _build_prompt(agent_request: AgentRequest) -> str:
+    return agent_request.prompt + "\n\n" + ANSWER_INSTRUCTIONS
+
+
+async def run_deep_search(
+    agent_request: AgentRequest,
+    bypass_cache: bool = False,
+    refresh_cache: bool = False,
+) -> AgentResponse:
+    """
+    Runs the agent with a user's prompt, serving repeated prompts from the
+    result cache. `bypass_cache` skips the cache entirely; `refresh_cache`
+    ignores any cached answer but stores the new one.
+    """
     start_time = time.time()
-    prompt = agent_request.prompt+"\n\nThe final answer should be less then 50 sentences."
+    prompt = _build_prompt(agent_request)
+    cache_key = make_cache_key(agent_request.prompt, AGENT_CONFIG)
+
+    if not bypass_cache and not refresh_cache:
+        cached_answer, tier = await result_cache.get(cache_key)
+        if cached_answer is not None:
+            logger.info(f"Deep search cache hit ({tier}) for: '{prompt[:70]}...'")
+            return AgentResponse(
+                response=cached_answer,
+                agent_id=AGENT_ID,
+                execution_time=time.time() - start_time,
+                metadata={"prompt_length": len(prompt), "cache_hit": True, "cache_tier": tier},
+            )
+
     logger.info(f"Agent running search for: '{prompt[:70]}...'")
 
-    try:
-        # Run the synchronous agent.run in a separate thread
-        final_answer = await asyncio.to_thread(deep_search_agent.run, prompt)
-    except Exception as e:
-        raise RuntimeError(f"Agent execution failed: {e}")
+    # AgentPoolExhaustedError propagates so the route can answer 429.
+    async with deep_search_pool.checkout() as lease:
+        try:
+            # Run the synchronous agent.run in a separate thread
+            final_answer = await lease.run(lease.agent.run, prompt)
+        except Exception as e:
+            raise RuntimeError(f"Agent execution failed: {e}")
+
+    final_answer = str(final_answer)
+    if not bypass_cache:
+        await result_cache.set(cache_key, agent_request.prompt, final_answer, AGENT_CONFIG)
 
     execution_time = time.time() - start_time
     return AgentResponse(
         response=final_answer,
         agent_id=AGENT_ID,
         execution_time=execution_time,
-        metadata={"prompt_length": len(prompt)},
-    )
\ No newline at end of file
+        metadata={
+            "prompt_length": len(prompt),
+            "queue_wait_time": lease.wait_time,
+            "cache_hit": False,
+            "cache_tier": None,
+            "cache_mode": "bypass" if bypass_cache else "refresh" if refresh_cache else "default",
+        },
+    )
+
+
+def _events_from_step(step) -> list[DeepSearchStreamEvent]:
+    """Converts a smolagents memory step into stream events."""
+    if isinstance(step, PlanningStep):
+        return [DeepSearchStreamEvent(type="planning", content=step.plan)]
+
+    if isinstance(step, ActionStep):
+        events = [
+            DeepSearchStreamEvent(
+                type="tool_call",
+                step_number=step.step_number,
+                content=str(tool_call.arguments),
+                metadata={"tool_name": tool_call.name},
+            )
+            for tool_call in step.tool_calls or []
+        ]
+        if step.observations:
+            events.append(
+                DeepSearchStreamEvent(
+                    type="tool_result",
+                    step_number=step.step_number,
+                    content=step.observations,
+                )
+            )
+        events.append(
+            DeepSearchStreamEvent(
+                type="step",
+                step_number=step.step_number,
+                content=str(step.model_output) if step.model_output else None,
+                metadata={
+                    "error": str(step.error) if step.error else None,
+                    "duration": step.timing.duration if step.timing else None,
+                },
+            )
+        )
+        return events
+
+    if isinstance(step, FinalAnswerStep):
+        answer = str(step.output)
+        return [
+            DeepSearchStreamEvent(type="final_answer", content=answer[i : i + FINAL_ANSWER_CHUNK_SIZE])
+            for i in range(0, len(answer), FINAL_ANSWER_CHUNK_SIZE)
+        ]
+
+    # Token deltas and intermediate tool objects are reported through the
+    # ActionStep they belong to.
+    return []
+
+
+async def stream_deep_search(
+    agent_request: AgentRequest,
+) -> AsyncIterator[DeepSearchStreamEvent]:
+    """
+    Checks out an agent and starts it on the user's prompt. The returned
+    iterator yields each step as soon as the agent produces it, followed by
+    the final answer in chunks.
+
+    The agent is acquired before anything is streamed, so a full pool raises
+    AgentPoolExhaustedError here rather than mid-stream.
+    """
+    start_time = time.time()
+    prompt = _build_prompt(agent_request)
+    lease = await deep_search_pool.acquire()
+    logger.info(f"Agent streaming search for: '{prompt[:70]}...'")
+
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    cancelled = threading.Event()
+
+    def produce():
+        # Runs in a worker thread; every step is handed back to the event loop.
+        try:
+            for step in lease.agent.run(prompt, stream=True):
+                if cancelled.is_set():
+                    break
+                loop.call_soon_threadsafe(queue.put_nowait, step)
+        except Exception as e:
+            loop.call_soon_threadsafe(queue.put_nowait, e)
+        finally:
+            # Only the thread knows when the agent is no longer in use.
+            loop.call_soon_threadsafe(lease.release)
+            loop.call_soon_threadsafe(queue.put_nowait, _STREAM_END)
+
+    loop.run_in_executor(None, produce)
+    return _drain_stream(queue, cancelled, lease, prompt, start_time)
+
+
+async def _drain_stream(
+    queue: asyncio.Queue,
+    cancelled: threading.Event,
+    lease: AgentLease,
+    prompt: str,
+    start_time: float,
+) -> AsyncIterator[DeepSearchStreamEvent]:
+    try:
+        while (item := await queue.get()) is not _STREAM_END:
+            if isinstance(item, Exception):
+                logger.error(f"Agent execution failed while streaming: {item}")
+                yield DeepSearchStreamEvent(
+                    type="error", content=f"Agent execution failed: {item}"
+                )
+                continue
+            for event in _events_from_step(item):
+                yield event
+
+        yield DeepSearchStreamEvent(
+            type="done",
+            metadata={
+                "agent_id": AGENT_ID,
+                "execution_time": time.time() - start_time,
+                "prompt_length": len(prompt),
+                "queue_wait_time": lease.wait_time,
+            },
+        )
+    finally:
+        # Stops the agent after its current step if the client went away.
+        cancelled.set()
@@ -0,0 +1,114 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Output formats and the file extension each one is stored and served with.
+FORMAT_EXTENSIONS = {"PNG": "png", "WEBP": "webp", "JPEG": "jpg"}
+MEDIA_TYPES = {"png": "image/png", "webp": "image/webp", "jpg": "image/jpeg"}
+
+_KEY_PATTERN = re.compile(r"^[0-9a-f]{64}\.(png|webp|jpg)$")
+
+
+def make_image_key(prompt: str, model_id: str, parameters: Dict[str, Any]) -> str:
+    """
+    Content address of an image: a hash of everything that determines it,
+    followed by the extension of `parameters["format"]`.
+    """
+    payload = json.dumps(
+        {"prompt": prompt, "model_id": model_id, "parameters": parameters},
+        sort_keys=True,
+    )
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    return f"{digest}.{FORMAT_EXTENSIONS[parameters['format']]}"
+
+
+def media_type_for(key: str) -> str:
+    return MEDIA_TYPES[key.rsplit(".", 1)[-1]]
+
+
+class ImageCache:
+    """
+    Size-bounded on-disk cache of generated images, addressed by
+    make_image_key. The key is also the ETag, since the bytes stored under a
+    key never change. When the cache grows past `max_bytes` the least
+    recently used files (by mtime, refreshed on every hit) are evicted.
+
+    Methods do blocking file I/O; call them through asyncio.to_thread.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._total_bytes = sum(path.stat().st_size for path in self._files())
+
+    def _files(self):
+        return (
+            path for path in self.directory.glob("*/*") if _KEY_PATTERN.match(path.name)
+        )
+
+    def path_for(self, key: str) -> Path:
+        if not _KEY_PATTERN.match(key):
+            raise ValueError(f"Invalid image key: {key!r}")
+        return self.directory / key[:2] / key
+
+    def get(self, key: str) -> Optional[Path]:
+        """Returns the cached file for `key`, marking it recently used."""
+        path = self.path_for(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def put(self, key: str, data: bytes) -> Path:
+        """Stores `data` under `key` atomically, then evicts to stay in budget."""
+        path = self.path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{key}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+
+        with self._lock:
+            previous_size = path.stat().st_size if path.exists() else 0
+            os.replace(tmp_path, path)
+            self._total_bytes += len(data) - previous_size
+            if self._total_bytes > self.max_bytes:
+                self._evict(keep=path)
+        return path
+
+    def _evict(self, keep: Path) -> None:
+        files = sorted(
+            (entry.stat().st_mtime, entry)
+            for entry in self._files()
+            if entry != keep
+        )
+        for _, entry in files:
+            if self._total_bytes <= self.max_bytes:
+                break
+            try:
+                size = entry.stat().st_size
+                entry.unlink()
+            except FileNotFoundError:
+                continue
+            self._total_bytes -= size
+            logger.info(f"Evicted cached image {entry.name}")
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+
+# --- One-Time Initialization ---
+# Rendered images are kept on disk by content address so repeated prompts
+# never reach the HF API again.
+image_cache = ImageCache(settings.IMAGE_CACHE_DIR, settings.IMAGE_CACHE_MAX_BYTES)
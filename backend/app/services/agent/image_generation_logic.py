@@ -4,58 +4,197 @@ import io
 import logging
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
 
 from huggingface_hub import InferenceClient
 from huggingface_hub.utils import HfHubHTTPError
 
+from app.config import settings
+from app.services.agent.image_cache import image_cache, make_image_key
+from app.services.agent.image_variants import render_variant
 from app.services.github.schema import (
     ImageGenerationRequest,
     ImageGenerationResponse,
+    ImageVariant,
 )
 
 logger = logging.getLogger(__name__)
 
 # --- One-Time Initialization ---
 
-# Define the model and initialize the client once when the module is loaded.
 MODEL_ID = "stabilityai/stable-diffusion-xl-base-1.0"
-HF_TOKEN = os.getenv("HF_TOKEN")
 
-if not HF_TOKEN:
-    raise RuntimeError(
-        "HF_TOKEN environment variable not set. Please add it to your .env file."
-    )
+# Client of the Hugging Face Inference API, created by get_inference_client
+# when the image_generation service is first used (see app.services.registry).
+inference_client: Optional[InferenceClient] = None
+
+
+def get_inference_client() -> InferenceClient:
+    """
+    Returns the Inference API client, creating it on first call. Raises
+    RuntimeError when HF_TOKEN is not set.
+    """
+    global inference_client
+    if inference_client is None:
+        hf_token = os.getenv("HF_TOKEN")
+        if not hf_token:
+            raise RuntimeError(
+                "HF_TOKEN environment variable not set. Please add it to your .env file."
+            )
+        # We pass the token and the billing information for the hackathon.
+        inference_client = InferenceClient(
+            model=MODEL_ID, token=hf_token, bill_to="agents-hack",
+        )
+    return inference_client
+
+
+IMAGE_FORMAT = "PNG"
+IMAGE_ROUTE_PREFIX = "/chat/images"
 
-# Initialize the client to call the Hugging Face Inference API
-# We pass the token and the billing information for the hackathon.
-inference_client = InferenceClient(
-    model=MODEL_ID, token=HF_TOKEN, bill_to="agents-hack",
+# Resizing and encoding variants is CPU-bound; Pillow releases the GIL while
+# doing it, so a small thread pool encodes several variants in parallel.
+variant_executor = ThreadPoolExecutor(
+    max_workers=settings.IMAGE_VARIANT_WORKERS, thread_name_prefix="image-variant"
 )
 
+# Renders in progress, so concurrent requests for one key share the work.
+_in_flight: dict[str, asyncio.Future] = {}
+
 
 async def generate_image_for_task(
     request: ImageGenerationRequest,
 ) -> ImageGenerationResponse:
     """
-    Generates an image using the Hugging Face Inference API and returns it
-    as a Base64 string.
+    Returns URLs to the requested format/size variants of the image for the
+    request's prompt. The full-resolution source is generated with the
+    Hugging Face Inference API only if it is not cached yet, and each
+    variant is derived from it once and then cached on its own.
     """
-    logger.info(f"Generating image for prompt: '{request.prompt[:70]}...'")
     start_time = time.time()
+    source_key = make_image_key(request.prompt, MODEL_ID, {"format": IMAGE_FORMAT})
+    widths = request.sizes or [None]
+    variant_keys = [
+        (width, _variant_key(request.prompt, source_key, request.format, width))
+        for width in widths
+    ]
+
+    paths = [await asyncio.to_thread(image_cache.get, key) for _, key in variant_keys]
+    cached = all(path is not None for path in paths)
+    if cached:
+        logger.info(f"Image cache hit for prompt: '{request.prompt[:70]}...'")
+    else:
+        source_path = await _shared(
+            source_key, lambda: _source_path(request.prompt, source_key)
+        )
+        paths = await asyncio.gather(
+            *(
+                _shared(
+                    key,
+                    lambda width=width, key=key: _store_variant(
+                        source_path, key, request.format, width
+                    ),
+                )
+                for width, key in variant_keys
+            )
+        )
+
+    variants = []
+    for (width, key), path in zip(variant_keys, paths):
+        size_bytes = (await asyncio.to_thread(path.stat)).st_size
+        variants.append(
+            ImageVariant(
+                format=request.format,
+                width=width,
+                image_url=f"{IMAGE_ROUTE_PREFIX}/{key}",
+                image_key=key,
+                size_bytes=size_bytes,
+            )
+        )
+
+    img_str = None
+    if request.include_base64:
+        img_bytes = await asyncio.to_thread(paths[0].read_bytes)
+        img_str = base64.b64encode(img_bytes).decode("utf-8")
+
+    execution_time = time.time() - start_time
+    logger.info(
+        f"{len(variants)} image variant(s) ready in {execution_time:.2f}s "
+        f"(cached: {cached})"
+    )
+
+    return ImageGenerationResponse(
+        image_url=variants[0].image_url,
+        image_key=variants[0].image_key,
+        variants=variants,
+        cached=cached,
+        image_base64=img_str,
+        model_id=MODEL_ID,
+    )
+
+
+def _variant_key(prompt: str, source_key: str, image_format: str, width) -> str:
+    # The full-resolution PNG is the source itself.
+    if image_format == IMAGE_FORMAT and width is None:
+        return source_key
+    return make_image_key(prompt, MODEL_ID, {"format": image_format, "width": width})
+
+
+async def _shared(key: str, make_coroutine) -> Path:
+    """Runs `make_coroutine()` once per key, however many requests await it."""
+    future = _in_flight.get(key)
+    if future is None:
+        future = asyncio.ensure_future(make_coroutine())
+        _in_flight[key] = future
+        future.add_done_callback(lambda _: _in_flight.pop(key, None))
+    # A disconnecting client must not cancel work others may share.
+    return await asyncio.shield(future)
+
+
+async def _source_path(prompt: str, source_key: str) -> Path:
+    path = await asyncio.to_thread(image_cache.get, source_key)
+    if path is not None:
+        return path
+    return await _render_and_store(prompt, source_key)
+
+
+async def _store_variant(
+    source_path: Path, key: str, image_format: str, width
+) -> Path:
+    """Encodes one variant from the cached source and writes it to the cache."""
+    if key == source_path.name:
+        return source_path
+    path = await asyncio.to_thread(image_cache.get, key)
+    if path is not None:
+        return path
+
+    loop = asyncio.get_running_loop()
+    try:
+        source = await asyncio.to_thread(source_path.read_bytes)
+        data = await loop.run_in_executor(
+            variant_executor, render_variant, source, image_format, width
+        )
+    except Exception as e:
+        logger.error(f"Failed to render {image_format} variant (width {width}): {e}")
+        raise RuntimeError("An unexpected error occurred.")
+    return await asyncio.to_thread(image_cache.put, key, data)
+
+
+async def _render_and_store(prompt: str, image_key: str) -> Path:
+    """Generates the image and writes it to the cache."""
+    logger.info(f"Generating image for prompt: '{prompt[:70]}...'")
+    start_time = time.time()
+    client = get_inference_client()
 
     try:
         # The client's text_to_image method is synchronous (blocking).
         # We run it in a separate thread to keep the server responsive.
-        image = await asyncio.to_thread(
-            inference_client.text_to_image, request.prompt
-        )
+        image = await asyncio.to_thread(client.text_to_image, prompt)
 
-        # Convert the returned PIL Image object to a Base64 string.
         buffered = io.BytesIO()
-        image.save(buffered, format="PNG")
-        img_bytes = buffered.getvalue()
-        img_base64 = base64.b64encode(img_bytes)
-        img_str = img_base64.decode("utf-8")
+        image.save(buffered, format=IMAGE_FORMAT)
+        path = await asyncio.to_thread(image_cache.put, image_key, buffered.getvalue())
 
     except HfHubHTTPError as e:
         # Handle specific API errors from Hugging Face
@@ -66,7 +205,5 @@ async def generate_image_for_task(
         logger.error(f"An unexpected error occurred during image generation: {e}")
         raise RuntimeError("An unexpected error occurred.")
 
-    execution_time = time.time() - start_time
-    logger.info(f"Image generated successfully in {execution_time:.2f}s")
-
-    return ImageGenerationResponse(image_base64=img_str, model_id=MODEL_ID)
\ No newline at end of file
+    logger.info(f"Image generated successfully in {time.time() - start_time:.2f}s")
+    return path
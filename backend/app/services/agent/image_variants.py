@@ -0,0 +1,33 @@
+import io
+from typing import Optional
+
+from PIL import Image
+
+# Encoder options per output format. WebP and JPEG are lossy and an order of
+# magnitude smaller than PNG at card thumbnail sizes.
+SAVE_OPTIONS = {
+    "PNG": {"optimize": True},
+    "WEBP": {"quality": 80, "method": 4},
+    "JPEG": {"quality": 85, "optimize": True, "progressive": True},
+}
+
+
+def render_variant(source: bytes, image_format: str, width: Optional[int]) -> bytes:
+    """
+    Re-encodes `source` in `image_format`, downscaled to `width` pixels wide
+    with the aspect ratio preserved. Images are never upscaled; a `width` of
+    None keeps the original resolution.
+
+    CPU-bound; run it in a worker thread.
+    """
+    with Image.open(io.BytesIO(source)) as image:
+        image.load()
+        if width is not None and width < image.width:
+            height = max(1, round(image.height * width / image.width))
+            image = image.resize((width, height), Image.Resampling.LANCZOS)
+        if image_format == "JPEG" and image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+
+        buffered = io.BytesIO()
+        image.save(buffered, format=image_format, **SAVE_OPTIONS[image_format])
+    return buffered.getvalue()
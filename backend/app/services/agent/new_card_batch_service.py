@@ -0,0 +1,219 @@
+import asyncio
+import json
+import logging
+import uuid
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import anthropic
+from pydantic import ValidationError
+
+from app.config import settings
+from app.services.agent.new_card_service import (
+    _build_message_params,
+    claude_client,
+    parse_cards_from_response,
+)
+from app.services.github.schema import (
+    NewCardBatchItem,
+    NewCardBatchRequest,
+    NewCardBatchResponse,
+)
+
+logger = logging.getLogger(__name__)
+
+# Number of ended batches whose parsed results are kept in memory.
+MAX_ENDED_BATCHES = 256
+
+# (status, response_text, error) for one item of a batch, where status is one
+# of the Message Batches result types: succeeded, errored, canceled, expired.
+BatchResult = Tuple[str, Optional[str], Optional[str]]
+
+
+class AnthropicBatchBackend:
+    """Submits planner calls through the Anthropic Message Batches API."""
+
+    def __init__(self, client: anthropic.AsyncAnthropic):
+        self.client = client
+
+    async def submit(self, requests: List[Tuple[str, dict]]) -> str:
+        batch = await self.client.messages.batches.create(
+            requests=[
+                {"custom_id": custom_id, "params": params}
+                for custom_id, params in requests
+            ]
+        )
+        return batch.id
+
+    async def status(self, batch_id: str) -> Tuple[str, Dict[str, int]]:
+        try:
+            batch = await self.client.messages.batches.retrieve(batch_id)
+        except anthropic.NotFoundError:
+            raise KeyError(batch_id)
+        return batch.processing_status, batch.request_counts.model_dump()
+
+    async def results(self, batch_id: str) -> Dict[str, BatchResult]:
+        results = {}
+        async for entry in await self.client.messages.batches.results(batch_id):
+            result = entry.result
+            if result.type == "succeeded":
+                results[entry.custom_id] = ("succeeded", result.message.content[0].text, None)
+            elif result.type == "errored":
+                results[entry.custom_id] = ("errored", None, str(result.error.error.message))
+            else:
+                results[entry.custom_id] = (result.type, None, f"Request {result.type}.")
+        return results
+
+
+class LocalBatchBackend:
+    """
+    In-process stand-in for the Message Batches API, used in tests and local
+    development. Requests run concurrently through `create_message`, which
+    takes the message params and returns the response text.
+    """
+
+    def __init__(
+        self,
+        create_message: Callable[[dict], Awaitable[str]],
+        max_concurrency: int = 8,
+    ):
+        self.create_message = create_message
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self._batches: Dict[str, Dict[str, Optional[BatchResult]]] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    async def submit(self, requests: List[Tuple[str, dict]]) -> str:
+        batch_id = f"local-batch-{uuid.uuid4().hex[:12]}"
+        self._batches[batch_id] = {custom_id: None for custom_id, _ in requests}
+        self._tasks[batch_id] = asyncio.create_task(self._run(batch_id, requests))
+        return batch_id
+
+    async def _run(self, batch_id: str, requests: List[Tuple[str, dict]]) -> None:
+        async def run_one(custom_id: str, params: dict):
+            async with self.semaphore:
+                try:
+                    text = await self.create_message(params)
+                    self._batches[batch_id][custom_id] = ("succeeded", text, None)
+                except Exception as e:
+                    self._batches[batch_id][custom_id] = ("errored", None, str(e))
+
+        await asyncio.gather(*(run_one(custom_id, params) for custom_id, params in requests))
+        self._tasks.pop(batch_id, None)
+
+    async def status(self, batch_id: str) -> Tuple[str, Dict[str, int]]:
+        items = self._batches[batch_id]
+        counts = {"processing": 0, "succeeded": 0, "errored": 0, "canceled": 0, "expired": 0}
+        for result in items.values():
+            counts["processing" if result is None else result[0]] += 1
+        return ("ended" if counts["processing"] == 0 else "in_progress"), counts
+
+    async def results(self, batch_id: str) -> Dict[str, BatchResult]:
+        return {
+            custom_id: result
+            for custom_id, result in self._batches[batch_id].items()
+            if result is not None
+        }
+
+
+class NewCardBatchService:
+    """Turns many prompts into validated card lists through a batch backend."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.logger = logger
+        # custom_ids per batch submitted by this worker, and parsed results
+        # of ended batches so polling does not download them again.
+        self._custom_ids: Dict[str, List[str]] = {}
+        self._ended: Dict[str, NewCardBatchResponse] = {}
+
+    async def submit(self, batch_request: NewCardBatchRequest) -> NewCardBatchResponse:
+        requests = [
+            (f"item-{index}", _build_message_params(agent_request.prompt))
+            for index, agent_request in enumerate(batch_request.requests)
+        ]
+        try:
+            batch_id = await self.backend.submit(requests)
+        except anthropic.APIError as e:
+            raise RuntimeError(f"Batch submission failed: {e}")
+
+        self._custom_ids[batch_id] = [custom_id for custom_id, _ in requests]
+        self.logger.info(f"Submitted new-card batch {batch_id} with {len(requests)} item(s)")
+        return await self.get(batch_id)
+
+    async def get(self, batch_id: str) -> NewCardBatchResponse:
+        """
+        Returns per-item status. Cards are parsed and validated once the
+        batch has ended. Raises KeyError for unknown batch ids.
+        """
+        if batch_id in self._ended:
+            return self._ended[batch_id]
+
+        try:
+            processing_status, counts = await self.backend.status(batch_id)
+            results = (
+                await self.backend.results(batch_id)
+                if processing_status == "ended"
+                else None
+            )
+        except anthropic.APIError as e:
+            raise RuntimeError(f"Batch status lookup failed: {e}")
+
+        if processing_status != "ended":
+            items = [
+                NewCardBatchItem(custom_id=custom_id, status="pending")
+                for custom_id in self._custom_ids.get(batch_id, [])
+            ]
+            return NewCardBatchResponse(
+                batch_id=batch_id,
+                status=processing_status,
+                request_counts=counts,
+                items=items,
+            )
+
+        items = [
+            self._to_item(custom_id, results[custom_id])
+            for custom_id in sorted(results, key=_item_index)
+        ]
+        response = NewCardBatchResponse(
+            batch_id=batch_id,
+            status="ended",
+            request_counts=counts,
+            items=items,
+        )
+        self._ended[batch_id] = response
+        if len(self._ended) > MAX_ENDED_BATCHES:
+            self._ended.pop(next(iter(self._ended)))
+        self._custom_ids.pop(batch_id, None)
+        return response
+
+    def _to_item(self, custom_id: str, result: BatchResult) -> NewCardBatchItem:
+        status, text, error = result
+        if status != "succeeded":
+            return NewCardBatchItem(custom_id=custom_id, status="failed", error=error)
+        try:
+            cards = parse_cards_from_response(text)
+        except (ValidationError, json.JSONDecodeError, TypeError, ValueError) as e:
+            return NewCardBatchItem(
+                custom_id=custom_id,
+                status="failed",
+                error=f"AI model returned invalid data: {e}",
+            )
+        return NewCardBatchItem(custom_id=custom_id, status="succeeded", card_data=cards)
+
+
+def _item_index(custom_id: str) -> int:
+    return int(custom_id.rsplit("-", 1)[-1])
+
+
+async def _create_message_text(params: dict) -> str:
+    message = await claude_client.messages.create(**params)
+    return message.content[0].text
+
+
+def _create_backend():
+    if settings.NEW_CARD_BATCH_BACKEND == "local":
+        return LocalBatchBackend(_create_message_text)
+    return AnthropicBatchBackend(claude_client)
+
+
+# --- One-Time Initialization ---
+new_card_batch_service = NewCardBatchService(_create_backend())
@@ -3,15 +3,17 @@ import json
 import logging
 import time
 import uuid
-
+from typing import AsyncIterator
 
 import anthropic
 from pydantic import ValidationError
 
+from app.services.agent.partial_json import IncrementalCardParser
 from app.services.github.schema import (
     AgentRequest,
     NewCardAgentResponse,
     NewCardData,
+    NewCardStreamEvent,
 )
 
 logger = logging.getLogger(__name__)
@@ -21,13 +23,138 @@ logger = logging.getLogger(__name__)
 # This client is created once when the module is first imported.
 claude_client = anthropic.AsyncAnthropic()
 AGENT_ID = f"new-card-func-{str(uuid.uuid4())[:8]}"
+MODEL_ID = "claude-sonnet-4-20250514"
+MAX_TOKENS = 5000  # Increased for more complex structures
+MAX_RETRIES = 3
+BASE_RETRY_DELAY = 2  # seconds
+
+
+# Fixed example plans shown to the model after the instructions. Together
+# with the card schema they make the system prompt long enough for Anthropic
+# to cache it (Sonnet 4 caches prefixes of 1024 tokens or more).
+FEW_SHOT_EXAMPLES = [
+    (
+        "Find out how big the German electric vehicle market is and let my supervisor know.",
+        {
+            "cards": [
+                {
+                    "card_id": "task-1",
+                    "title": "Research German EV Market",
+                    "description": "Analyze the size, growth and key players of the German market for electric vehicles.",
+                    "task_type": "research_task",
+                    "status": "todo",
+                    "dependencies": [],
+                },
+                {
+                    "card_id": "task-2",
+                    "title": "Call Supervisor",
+                    "description": "Inform the supervisor of the results of the market research.",
+                    "task_type": "phone_task",
+                    "status": "todo",
+                    "dependencies": ["task-1"],
+                },
+            ]
+        },
+    ),
+    (
+        "Call our three regional leads to tell them the Q3 pricing update goes live on Monday.",
+        {
+            "cards": [
+                {
+                    "card_id": "task-1",
+                    "title": "Call North Region Lead",
+                    "description": "Tell the north region lead that the Q3 pricing update goes live on Monday.",
+                    "task_type": "phone_task",
+                    "status": "todo",
+                    "dependencies": [],
+                },
+                {
+                    "card_id": "task-2",
+                    "title": "Call South Region Lead",
+                    "description": "Tell the south region lead that the Q3 pricing update goes live on Monday.",
+                    "task_type": "phone_task",
+                    "status": "todo",
+                    "dependencies": [],
+                },
+                {
+                    "card_id": "task-3",
+                    "title": "Call West Region Lead",
+                    "description": "Tell the west region lead that the Q3 pricing update goes live on Monday.",
+                    "task_type": "phone_task",
+                    "status": "todo",
+                    "dependencies": [],
+                },
+            ]
+        },
+    ),
+    (
+        "I need to understand which competitors offer battery leasing in France, then brief an "
+        "industry expert and after that update the sales director with what the expert thinks.",
+        {
+            "cards": [
+                {
+                    "card_id": "task-1",
+                    "title": "Research Battery Leasing Offers in France",
+                    "description": "List the competitors offering battery leasing in France, with their prices and contract terms.",
+                    "task_type": "research_task",
+                    "status": "todo",
+                    "dependencies": [],
+                },
+                {
+                    "card_id": "task-2",
+                    "title": "Call Industry Expert",
+                    "description": "Present the battery leasing findings to an industry expert and collect their opinion.",
+                    "task_type": "phone_task",
+                    "status": "todo",
+                    "dependencies": ["task-1"],
+                },
+                {
+                    "card_id": "task-3",
+                    "title": "Call Sales Director",
+                    "description": "Update the sales director with the research results and the expert's opinion.",
+                    "task_type": "phone_task",
+                    "status": "todo",
+                    "dependencies": ["task-2"],
+                },
+            ]
+        },
+    ),
+    (
+        "Research the latest regulations on drone deliveries in the EU.",
+        {
+            "cards": [
+                {
+                    "card_id": "task-1",
+                    "title": "Research EU Drone Delivery Regulations",
+                    "description": "Summarize the current EU rules for commercial drone deliveries, including permits, "
+                    "flight restrictions and upcoming changes.",
+                    "task_type": "research_task",
+                    "status": "todo",
+                    "dependencies": [],
+                },
+            ]
+        },
+    ),
+]
+
+
+def _cards_schema() -> dict:
+    """JSON schema of the expected response: {"cards": [NewCardData, ...]}."""
+    card_schema = NewCardData.model_json_schema()
+    definitions = card_schema.pop("$defs", {})
+    return {
+        "type": "object",
+        "properties": {"cards": {"type": "array", "items": card_schema}},
+        "required": ["cards"],
+        "$defs": definitions,
+    }
 
 
 def _get_system_prompt() -> str:
     """
     Updated prompt to instruct the LLM to create tasks with dependencies.
     """
-    return """
+    instructions = """
     You are an expert project manager. Your job is to analyze a user's request and break it down into a series of logical, actionable task cards with dependencies.
 
     You MUST respond with a single JSON object with a single key, "cards", containing a list of task card objects.
@@ -39,32 +166,32 @@ def _get_system_prompt() -> str:
     4.  Crucially, for any card that depends on another, add the prerequisite card's `card_id` to its `dependencies` list. The first task(s) should have an empty `dependencies` list.
     
     Only create one research task maximum.
-    **Correct JSON Output Structure Example:**
-    ```json
-    {
-      "cards": [
-        {
-          "card_id": "task-1",
-          "title": "Research German EV Market",
-          "description": "Analyze the German market for electric vehicles.",
-          "task_type": "research_task",
-          "status": "todo",
-          "parameters": { "topics": ["market size", "key players"], "scope": "Market Analysis" },
-          "dependencies": []
-        },
+    Dependencies must only reference `card_id`s of cards in the same response and must never form a cycle.
+    """
+    schema = json.dumps(_cards_schema(), indent=2)
+    examples = "\n\n".join(
+        f"Request: {request}\nResponse:\n```json\n{json.dumps(response, indent=2)}\n```"
+        for request, response in FEW_SHOT_EXAMPLES
+    )
+    return (
+        f"{instructions}\n"
+        f"**JSON Schema of the response:**\n```json\n{schema}\n```\n\n"
+        f"**Examples of requests and correct responses:**\n\n{examples}\n"
+    )
+
+def _get_system_blocks() -> list[dict]:
+    """
+    Wraps the static planning prompt (instructions, card schema and
+    examples) in a system block marked as cacheable, so Anthropic can reuse
+    its prefix across /new-card calls.
+    """
+    return [
         {
-          "card_id": "task-2",
-          "title": "Call Supervisor",
-          "description": "Inform supervisor of the results of the market research.",
-          "task_type": "phone_task",
-          "status": "todo",
-          "parameters": null,
-          "dependencies": ["task-1"]
+            "type": "text",
+            "text": _get_system_prompt(),
+            "cache_control": {"type": "ephemeral"},
         }
-      ]
-    }
-    ```
-    """
+    ]
 
 def _extract_json_from_response(text: str) -> str:
     """
@@ -82,6 +209,38 @@ def _extract_json_from_response(text: str) -> str:
     return text[start_index : end_index + 1]
 
 
+def _build_message_params(prompt: str) -> dict:
+    """Parameters of the planner call, shared by the interactive and batch paths."""
+    return {
+        "model": MODEL_ID,
+        "max_tokens": MAX_TOKENS,
+        "system": _get_system_blocks(),
+        "messages": [{"role": "user", "content": prompt}],
+    }
+
+
+def parse_cards_from_response(response_text: str) -> list[NewCardData]:
+    """
+    Extracts the cards from a planner response and validates each card and
+    the dependency graph. Raises ValueError, ValidationError or
+    JSONDecodeError on bad output.
+    """
+    cleaned_json_text = _extract_json_from_response(response_text)
+    response_json = json.loads(cleaned_json_text)
+
+    if "error" in response_json:
+        raise ValueError(response_json["error"])
+
+    card_list_json = response_json.get("cards")
+    if not isinstance(card_list_json, list):
+        raise ValueError("AI response is missing the 'cards' list.")
+
+    # Validate each card and then validate the dependency graph
+    validated_cards = [NewCardData(**card) for card in card_list_json]
+    _validate_dependencies(validated_cards)
+    return validated_cards
+
+
 async def create_new_card_from_prompt(
     agent_request: AgentRequest,
 ) -> NewCardAgentResponse:
@@ -91,32 +250,16 @@ async def create_new_card_from_prompt(
     start_time = time.time()
     logger.info(f"Agent processing prompt: '{agent_request.prompt[:70]}...'")
 
-    max_retries = 3
-    base_delay = 2  # seconds
+    max_retries = MAX_RETRIES
+    base_delay = BASE_RETRY_DELAY
     
     for attempt in range(max_retries):
         try:
             message = await claude_client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=5000,  # Increased for more complex structures
-                system=_get_system_prompt(),
-                messages=[{"role": "user", "content": agent_request.prompt}],
+                **_build_message_params(agent_request.prompt)
             )
 
-            response_text = message.content[0].text
-            cleaned_json_text = _extract_json_from_response(response_text)
-            response_json = json.loads(cleaned_json_text)
-
-            if "error" in response_json:
-                raise ValueError(response_json["error"])
-
-            card_list_json = response_json.get("cards")
-            if not isinstance(card_list_json, list):
-                raise ValueError("AI response is missing the 'cards' list.")
-
-            # Validate each card and then validate the dependency graph
-            validated_cards = [NewCardData(**card) for card in card_list_json]
-            _validate_dependencies(validated_cards)
+            validated_cards = parse_cards_from_response(message.content[0].text)
             
             # Success, break out of retry loop
             break
@@ -125,10 +268,8 @@ async def create_new_card_from_prompt(
             logger.error(f"AI response failed validation: {e}")
             raise ValueError(f"AI model returned invalid data: {e}")
         except anthropic.APIError as e:
-            error_msg = str(e).lower()
-            
             # Check if it's a rate limit or overload error
-            if ("overloaded" in error_msg or "rate limit" in error_msg or "429" in error_msg or "529" in error_msg) and attempt < max_retries - 1:
+            if _is_retryable(e) and attempt < max_retries - 1:
                 delay = base_delay * (2 ** attempt)  # Exponential backoff
                 logger.warning(f"Anthropic API overloaded/rate limited (attempt {attempt + 1}/{max_retries}). Retrying in {delay} seconds...")
                 await asyncio.sleep(delay)
@@ -142,6 +283,8 @@ async def create_new_card_from_prompt(
         "model_used": message.model,
         "input_tokens": message.usage.input_tokens,
         "output_tokens": message.usage.output_tokens,
+        "cache_creation_input_tokens": message.usage.cache_creation_input_tokens or 0,
+        "cache_read_input_tokens": message.usage.cache_read_input_tokens or 0,
         "card_count": len(validated_cards),
         "attempts_made": attempt + 1,
     }
@@ -154,6 +297,91 @@ async def create_new_card_from_prompt(
     )
 
 
+async def stream_new_cards_from_prompt(
+    agent_request: AgentRequest,
+) -> AsyncIterator[NewCardStreamEvent]:
+    """
+    Streaming variant of create_new_card_from_prompt. Consumes the model's
+    token stream and yields each card as soon as its JSON object closes and
+    validates. The dependency graph is checked once all cards are in.
+
+    Overload errors are retried only until the first card has been sent.
+    """
+    start_time = time.time()
+    logger.info(f"Agent streaming cards for prompt: '{agent_request.prompt[:70]}...'")
+
+    cards: list[NewCardData] = []
+    for attempt in range(MAX_RETRIES):
+        parser = IncrementalCardParser()
+        try:
+            async with claude_client.messages.stream(
+                **_build_message_params(agent_request.prompt)
+            ) as stream:
+                async for text in stream.text_stream:
+                    for card_json in parser.feed(text):
+                        card = NewCardData(**card_json)
+                        cards.append(card)
+                        yield NewCardStreamEvent(
+                            type="card",
+                            card=card,
+                            metadata={"elapsed": time.time() - start_time},
+                        )
+                message = await stream.get_final_message()
+
+            response_json = parser.document()
+            if "error" in response_json:
+                raise ValueError(response_json["error"])
+            if not isinstance(response_json.get("cards"), list):
+                raise ValueError("AI response is missing the 'cards' list.")
+            _validate_dependencies(cards)
+            break
+
+        except (ValidationError, json.JSONDecodeError, TypeError, ValueError) as e:
+            logger.error(f"AI response failed validation: {e}")
+            yield NewCardStreamEvent(
+                type="error", content=f"AI model returned invalid data: {e}"
+            )
+            return
+        except anthropic.APIError as e:
+            if _is_retryable(e) and not cards and attempt < MAX_RETRIES - 1:
+                delay = BASE_RETRY_DELAY * (2 ** attempt)
+                logger.warning(f"Anthropic API overloaded/rate limited (attempt {attempt + 1}/{MAX_RETRIES}). Retrying in {delay} seconds...")
+                await asyncio.sleep(delay)
+                continue
+            logger.error(f"Anthropic API error: {e}")
+            yield NewCardStreamEvent(
+                type="error",
+                content=f"AI service is currently unavailable after {attempt + 1} attempts: {e}",
+            )
+            return
+
+    yield NewCardStreamEvent(
+        type="done",
+        metadata={
+            "agent_id": AGENT_ID,
+            "execution_time": time.time() - start_time,
+            "model_used": message.model,
+            "input_tokens": message.usage.input_tokens,
+            "output_tokens": message.usage.output_tokens,
+            "cache_creation_input_tokens": message.usage.cache_creation_input_tokens or 0,
+            "cache_read_input_tokens": message.usage.cache_read_input_tokens or 0,
+            "card_count": len(cards),
+            "attempts_made": attempt + 1,
+        },
+    )
+
+
+def _is_retryable(error: anthropic.APIError) -> bool:
+    """Rate limit and overload errors are worth retrying with backoff."""
+    error_msg = str(error).lower()
+    return (
+        "overloaded" in error_msg
+        or "rate limit" in error_msg
+        or "429" in error_msg
+        or "529" in error_msg
+    )
+
+
 def _validate_dependencies(cards: list[NewCardData]):
     """
     Ensures that all listed dependencies refer to card_ids that actually exist.
@@ -0,0 +1,76 @@
+import json
+from typing import Any, Dict, List, Optional
+
+
+class IncrementalCardParser:
+    """
+    Incremental JSON scanner for the planner's `{"cards": [...]}` output.
+
+    Text is fed in arbitrary chunks as the model streams it. Every object
+    that closes directly inside an array of the top-level object is parsed
+    and returned as soon as its closing brace arrives. Anything before the
+    first `{` (such as a markdown code fence) is ignored.
+    """
+
+    def __init__(self):
+        self._buffer: List[str] = []
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escaped = False
+        self._started = False
+        self._finished = False
+        self._object_start: Optional[int] = None
+        self._position = 0
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """Consumes a chunk of text and returns the card objects it completed."""
+        completed = []
+        for char in chunk:
+            if self._finished:
+                break
+            if not self._started:
+                if char != "{":
+                    continue
+                self._started = True
+
+            self._buffer.append(char)
+            index = self._position
+            self._position += 1
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                if char == "{" and self._stack == ["{", "["]:
+                    self._object_start = index
+                self._stack.append(char)
+            elif char in "}]":
+                if not self._stack or self._stack[-1] != ("{" if char == "}" else "["):
+                    raise ValueError("Malformed JSON in AI response stream.")
+                self._stack.pop()
+                if char == "}" and self._stack == ["{", "["] and self._object_start is not None:
+                    text = "".join(self._buffer[self._object_start : index + 1])
+                    completed.append(json.loads(text))
+                    self._object_start = None
+                if not self._stack:
+                    self._finished = True
+        return completed
+
+    @property
+    def finished(self) -> bool:
+        """True once the top-level object has been closed."""
+        return self._finished
+
+    def document(self) -> Dict[str, Any]:
+        """Parses the complete top-level object once the stream is done."""
+        if not self._finished:
+            raise ValueError("No valid JSON object found in the AI response.")
+        return json.loads("".join(self._buffer))
@@ -0,0 +1,160 @@
+import collections
+import hashlib
+import json
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.models.models import DeepSearchCacheEntry
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Case- and whitespace-insensitive form of a prompt, used for cache keys."""
+    return " ".join(prompt.lower().split())
+
+
+def make_cache_key(prompt: str, agent_config: Dict[str, Any]) -> str:
+    """Hashes the normalized prompt together with the agent configuration."""
+    payload = json.dumps(
+        {"prompt": normalize_prompt(prompt), "config": agent_config}, sort_keys=True
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LRUCache:
+    """A small in-process LRU cache whose entries expire after `ttl` seconds."""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "collections.OrderedDict[str, Tuple[float, Any]]" = (
+            collections.OrderedDict()
+        )
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DeepSearchResultCache:
+    """
+    Two-tier cache for deep search answers: an in-process LRU in front of
+    the shared `deep_search_cache` Postgres table. Postgres errors are logged
+    and treated as misses so the cache never fails a request.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        max_entries: int,
+        session_maker: Optional[async_sessionmaker] = None,
+    ):
+        self.ttl = ttl
+        self.memory = LRUCache(max_entries=max_entries, ttl=ttl)
+        self.session_maker = session_maker
+        self.logger = logger
+        self._counters = {"memory_hits": 0, "postgres_hits": 0, "misses": 0}
+
+    async def get(self, key: str) -> Tuple[Optional[str], Optional[str]]:
+        """Returns (response, tier) where tier is "memory", "postgres" or None."""
+        response = self.memory.get(key)
+        if response is not None:
+            self._counters["memory_hits"] += 1
+            return response, "memory"
+
+        if self.session_maker is not None:
+            try:
+                async with self.session_maker() as session:
+                    result = await session.execute(
+                        select(DeepSearchCacheEntry).where(
+                            DeepSearchCacheEntry.cache_key == key,
+                            DeepSearchCacheEntry.expires_at > datetime.utcnow(),
+                        )
+                    )
+                    entry = result.scalars().first()
+            except Exception as e:
+                self.logger.warning(f"Deep search cache lookup failed: {e}")
+                entry = None
+
+            if entry is not None:
+                remaining = (entry.expires_at - datetime.utcnow()).total_seconds()
+                self.memory.set(key, entry.response, ttl=remaining)
+                self._counters["postgres_hits"] += 1
+                return entry.response, "postgres"
+
+        self._counters["misses"] += 1
+        return None, None
+
+    async def set(
+        self, key: str, prompt: str, response: str, agent_config: Dict[str, Any]
+    ) -> None:
+        """Stores an answer in both tiers."""
+        self.memory.set(key, response)
+        if self.session_maker is None:
+            return
+
+        now = datetime.utcnow()
+        values = {
+            "cache_key": key,
+            "prompt": prompt,
+            "response": response,
+            "agent_config": agent_config,
+            "created_at": now,
+            "expires_at": now + timedelta(seconds=self.ttl),
+        }
+        statement = insert(DeepSearchCacheEntry).values(**values)
+        statement = statement.on_conflict_do_update(
+            index_elements=[DeepSearchCacheEntry.cache_key],
+            set_={
+                "response": statement.excluded.response,
+                "agent_config": statement.excluded.agent_config,
+                "created_at": statement.excluded.created_at,
+                "expires_at": statement.excluded.expires_at,
+            },
+        )
+        try:
+            async with self.session_maker() as session:
+                await session.execute(statement)
+                # Expired rows are pruned on write through the expires_at index.
+                await session.execute(
+                    delete(DeepSearchCacheEntry).where(
+                        DeepSearchCacheEntry.expires_at <= now
+                    )
+                )
+                await session.commit()
+        except Exception as e:
+            self.logger.warning(f"Failed to persist deep search cache entry: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit counters per tier and the resulting hit rate."""
+        lookups = sum(self._counters.values())
+        hits = self._counters["memory_hits"] + self._counters["postgres_hits"]
+        return {
+            **self._counters,
+            "memory_entries": len(self.memory),
+            "hit_rate": hits / lookups if lookups else 0.0,
+        }
@@ -66,4 +66,8 @@ class AgentService:
         
         self.logger.info(f"Agent {self.agent_id} completed processing in {execution_time:.2f}s")
         
-        return response 
\ No newline at end of file
+        return response
+
+
+# --- One-Time Initialization ---
+agent_service = AgentService()
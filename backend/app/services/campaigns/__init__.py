@@ -0,0 +1 @@
+# Campaign services package 
\ No newline at end of file
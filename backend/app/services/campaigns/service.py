@@ -0,0 +1,373 @@
+import asyncio
+import logging
+import math
+import re
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from sqlalchemy import func, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.database import async_session_maker
+from app.models.models import (
+    CallCampaign,
+    CampaignCall,
+    CampaignCallStatus,
+    CampaignStatus,
+)
+from app.services.registry import ServiceUnavailableError, services
+from app.services.vapi.schema import (
+    CampaignRequest,
+    CampaignResponse,
+    OutboundCallRequest,
+)
+
+logger = logging.getLogger(__name__)
+
+_NUMBER_SEPARATORS = re.compile(r"[\s\-().]")
+
+STALE_CALL_ERROR = "Interrupted before the call was confirmed."
+
+
+def normalize_number(number: str) -> str:
+    """Strips formatting so "+33 6 11-42" and "+33611 42" dedupe together."""
+    return _NUMBER_SEPARATORS.sub("", number)
+
+
+def dedupe_calls(
+    calls: List[OutboundCallRequest],
+) -> Tuple[List[OutboundCallRequest], int]:
+    """Keeps the first call per normalized target number, in request order."""
+    seen = set()
+    unique = []
+    for call in calls:
+        number = normalize_number(call.target_number)
+        if number in seen:
+            continue
+        seen.add(number)
+        unique.append(call.model_copy(update={"target_number": number}))
+    return unique, len(calls) - len(unique)
+
+
+def in_quiet_hours(start: Optional[int], end: Optional[int], hour: int) -> bool:
+    """True if `hour` falls in [start, end), which may wrap past midnight."""
+    if start is None or end is None:
+        return False
+    if start < end:
+        return start <= hour < end
+    return hour >= start or hour < end
+
+
+class CampaignService:
+    """
+    Persists outbound call campaigns; CampaignScheduler places the calls.
+    """
+
+    def __init__(self):
+        self.logger = logger
+
+    async def create_campaign(
+        self, request: CampaignRequest, session: AsyncSession
+    ) -> CampaignResponse:
+        """
+        Stores a running campaign with one pending call per unique number.
+        Raises ValueError for an invalid schedule.
+        """
+        try:
+            ZoneInfo(request.timezone)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise ValueError(f"Unknown timezone: {request.timezone}")
+        if (request.quiet_hours_start is None) != (request.quiet_hours_end is None):
+            raise ValueError("Quiet hours need both a start and an end.")
+        if (
+            request.quiet_hours_start is not None
+            and request.quiet_hours_start == request.quiet_hours_end
+        ):
+            raise ValueError("Quiet hours cannot start and end at the same hour.")
+
+        calls, duplicates = dedupe_calls(request.calls)
+        calls_per_minute = min(
+            request.calls_per_minute or settings.CAMPAIGN_DEFAULT_CALLS_PER_MINUTE,
+            settings.CAMPAIGN_MAX_CALLS_PER_MINUTE,
+        )
+        campaign = CallCampaign(
+            id=uuid.uuid4(),
+            status=CampaignStatus.RUNNING,
+            calls_per_minute=calls_per_minute,
+            duplicates_skipped=duplicates,
+            quiet_hours_start=request.quiet_hours_start,
+            quiet_hours_end=request.quiet_hours_end,
+            timezone=request.timezone,
+        )
+        session.add(campaign)
+        await session.flush()
+        now = datetime.utcnow()
+        await session.execute(
+            insert(CampaignCall),
+            [
+                {
+                    "id": uuid.uuid4(),
+                    "campaign_id": campaign.id,
+                    "position": position,
+                    "target_number": call.target_number,
+                    "request": call.model_dump(mode="json"),
+                    "status": CampaignCallStatus.PENDING,
+                    "created_at": now,
+                }
+                for position, call in enumerate(calls)
+            ],
+        )
+        await session.commit()
+        self.logger.info(
+            f"Created campaign {campaign.id} with {len(calls)} call(s), "
+            f"{duplicates} duplicate(s) skipped"
+        )
+        return await self.get_campaign(campaign.id, session)
+
+    async def get_campaign(
+        self, campaign_id: uuid.UUID, session: AsyncSession
+    ) -> Optional[CampaignResponse]:
+        """
+        Returns the campaign with its per-status counters, or None if it
+        does not exist.
+        """
+        campaign = await session.get(CallCampaign, campaign_id)
+        if campaign is None:
+            return None
+
+        result = await session.execute(
+            select(CampaignCall.status, func.count())
+            .where(CampaignCall.campaign_id == campaign_id)
+            .group_by(CampaignCall.status)
+        )
+        counters = {status.value: 0 for status in CampaignCallStatus}
+        for status, count in result.all():
+            counters[status.value] = count
+
+        return CampaignResponse(
+            campaign_id=str(campaign.id),
+            status=campaign.status.value,
+            calls_per_minute=campaign.calls_per_minute,
+            total=sum(counters.values()),
+            duplicates_skipped=campaign.duplicates_skipped,
+            counters=counters,
+            created_at=campaign.created_at.isoformat() if campaign.created_at else None,
+            finished_at=campaign.finished_at.isoformat() if campaign.finished_at else None,
+        )
+
+    async def cancel_campaign(
+        self, campaign_id: uuid.UUID, session: AsyncSession
+    ) -> Optional[CampaignResponse]:
+        """
+        Stops a running campaign. Calls already placed are not affected.
+        """
+        campaign = await session.get(CallCampaign, campaign_id, with_for_update=True)
+        if campaign is None:
+            return None
+        if campaign.status == CampaignStatus.RUNNING:
+            now = datetime.utcnow()
+            campaign.status = CampaignStatus.CANCELED
+            campaign.finished_at = now
+            await session.execute(
+                update(CampaignCall)
+                .where(
+                    CampaignCall.campaign_id == campaign_id,
+                    CampaignCall.status == CampaignCallStatus.PENDING,
+                )
+                .values(status=CampaignCallStatus.CANCELED, finished_at=now)
+            )
+            await session.commit()
+        return await self.get_campaign(campaign_id, session)
+
+
+class CampaignScheduler:
+    """
+    Drains pending campaign calls from Postgres. Every tick locks the running
+    campaigns (skipping those another worker holds), claims as many calls as
+    each campaign's per-minute budget allows outside its quiet hours, and
+    places them through VapiService, whose dispatcher enforces the global
+    provider rate limit. All state lives in the database, so campaigns
+    resume after a restart and several workers can share the load.
+
+    Claims across all campaigns are also capped at what the phone number
+    pool can place per minute, so claimed calls never queue up in memory
+    behind the per-number throttles.
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker,
+        get_vapi_service: Callable[[], Awaitable[Any]],
+        poll_interval: float,
+        stale_call_timeout: float,
+    ):
+        self.session_maker = session_maker
+        self.get_vapi_service = get_vapi_service
+        self.poll_interval = poll_interval
+        self.stale_call_timeout = stale_call_timeout
+        self.logger = logger
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.tick()
+            except Exception as e:
+                self.logger.error(f"Campaign scheduler tick failed: {e}")
+            await asyncio.sleep(self.poll_interval)
+
+    async def tick(self) -> int:
+        """Claims and places the calls that are due. Returns how many."""
+        try:
+            vapi_service = await self.get_vapi_service()
+        except ServiceUnavailableError as e:
+            self.logger.warning(f"Campaign calls paused: {e}")
+            return 0
+
+        now = datetime.utcnow()
+        capacity = vapi_service.phone_numbers.capacity_per_minute()
+        claimed: List[Tuple[uuid.UUID, Dict[str, Any]]] = []
+        async with self.session_maker() as session:
+            await self._fail_stale_calls(session, now)
+            claimed_last_minute = await session.scalar(
+                select(func.count()).where(CampaignCall.claimed_at > now - timedelta(minutes=1))
+            )
+            budget = min(
+                math.ceil(capacity * self.poll_interval / 60), capacity - claimed_last_minute
+            )
+            result = await session.execute(
+                select(CallCampaign)
+                .where(CallCampaign.status == CampaignStatus.RUNNING)
+                .with_for_update(skip_locked=True)
+            )
+            for campaign in result.scalars().all():
+                calls = await self._claim_calls(session, campaign, now, budget)
+                budget -= len(calls)
+                claimed.extend(calls)
+            await session.commit()
+
+        await asyncio.gather(
+            *(self._place_call(vapi_service, call_id, request) for call_id, request in claimed)
+        )
+        return len(claimed)
+
+    async def _claim_calls(
+        self, session: AsyncSession, campaign: CallCampaign, now: datetime, budget: float
+    ) -> List[Tuple[uuid.UUID, Dict[str, Any]]]:
+        local_time = now.replace(tzinfo=ZoneInfo("UTC")).astimezone(ZoneInfo(campaign.timezone))
+        local_hour = local_time.hour
+        if in_quiet_hours(campaign.quiet_hours_start, campaign.quiet_hours_end, local_hour):
+            return []
+
+        claimed_last_minute = await session.scalar(
+            select(func.count()).where(
+                CampaignCall.campaign_id == campaign.id,
+                CampaignCall.claimed_at > now - timedelta(minutes=1),
+            )
+        )
+        # Spread the per-minute budget over the ticks instead of bursting it.
+        per_tick = math.ceil(campaign.calls_per_minute * self.poll_interval / 60)
+        limit = int(min(per_tick, campaign.calls_per_minute - claimed_last_minute, budget))
+        if limit <= 0:
+            return []
+
+        due = (
+            select(CampaignCall.id)
+            .where(
+                CampaignCall.campaign_id == campaign.id,
+                CampaignCall.status == CampaignCallStatus.PENDING,
+            )
+            .order_by(CampaignCall.position)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await session.execute(
+            update(CampaignCall)
+            .where(CampaignCall.id.in_(due.scalar_subquery()))
+            .values(status=CampaignCallStatus.IN_PROGRESS, claimed_at=now)
+            .returning(CampaignCall.id, CampaignCall.request)
+        )
+        claimed = [(row.id, row.request) for row in result.all()]
+
+        if not claimed:
+            in_progress = await session.scalar(
+                select(func.count()).where(
+                    CampaignCall.campaign_id == campaign.id,
+                    CampaignCall.status == CampaignCallStatus.IN_PROGRESS,
+                )
+            )
+            if not in_progress:
+                campaign.status = CampaignStatus.COMPLETED
+                campaign.finished_at = now
+                self.logger.info(f"Campaign {campaign.id} completed")
+        return claimed
+
+    async def _fail_stale_calls(self, session: AsyncSession, now: datetime) -> None:
+        # Calls left in progress by a crashed worker are failed rather than
+        # retried, so nobody is called twice.
+        await session.execute(
+            update(CampaignCall)
+            .where(
+                CampaignCall.status == CampaignCallStatus.IN_PROGRESS,
+                CampaignCall.claimed_at < now - timedelta(seconds=self.stale_call_timeout),
+            )
+            .values(status=CampaignCallStatus.FAILED, error=STALE_CALL_ERROR, finished_at=now)
+        )
+
+    async def _place_call(
+        self, vapi_service, call_id: uuid.UUID, request: Dict[str, Any]
+    ) -> None:
+        try:
+            result = await vapi_service.make_outbound_call(OutboundCallRequest(**request))
+            values = {
+                "status": CampaignCallStatus.SUCCEEDED if result.success else CampaignCallStatus.FAILED,
+                "call_id": result.call_id,
+                "error": None if result.success else result.message,
+            }
+            if result.call_id:
+                values["dispatched_at"] = datetime.utcnow()
+        except Exception as e:
+            self.logger.error(f"Campaign call {call_id} failed: {e}")
+            values = {"status": CampaignCallStatus.FAILED, "error": str(e)}
+
+        async with self.session_maker() as session:
+            # A call another worker failed as stale may still have been
+            # placed; its outcome replaces the guess.
+            await session.execute(
+                update(CampaignCall)
+                .where(
+                    CampaignCall.id == call_id,
+                    or_(
+                        CampaignCall.status == CampaignCallStatus.IN_PROGRESS,
+                        CampaignCall.error == STALE_CALL_ERROR,
+                    ),
+                )
+                .values(finished_at=datetime.utcnow(), **values)
+            )
+            await session.commit()
+
+
+# --- One-Time Initialization ---
+campaign_scheduler = CampaignScheduler(
+    async_session_maker,
+    get_vapi_service=lambda: services.aget("vapi"),
+    poll_interval=settings.CAMPAIGN_POLL_INTERVAL,
+    stale_call_timeout=settings.CAMPAIGN_STALE_CALL_TIMEOUT,
+)
@@ -0,0 +1,138 @@
+"""
+Token-budgeted context for repository chat.
+
+Retrieved hits are rendered as text blocks, deduplicated, and packed best
+first until the budget is spent, so the context of a chat turn stays the
+same size however large the repository is.
+"""
+
+import math
+import re
+from typing import Any, Dict, List, Optional
+
+# Words, short digit runs, punctuation runs and newlines, roughly as a BPE
+# tokenizer splits source code and English text
+_PIECES = re.compile(r"[A-Za-z]+|\d{1,3}|[^\sA-Za-z\d]+|\n+")
+# Config file entries: keys, [sections], Dockerfile instructions
+_TOP_LEVEL = re.compile(r"^(\[[^\]]+\]|[\w\"'.-]+\s*[:=]|[A-Z]+\s)")
+
+
+def count_tokens(text: str) -> int:
+    """
+    Estimated token count, computed locally. Long words count one token per
+    four letters and punctuation one per two characters, which slightly
+    overestimates real tokenizers, so packed context stays under budget.
+    """
+    tokens = 0
+    for piece in _PIECES.findall(text):
+        if piece[0].isalpha():
+            tokens += math.ceil(len(piece) / 4)
+        elif piece[0].isdigit() or piece[0] == "\n":
+            tokens += 1
+        else:
+            tokens += math.ceil(len(piece) / 2)
+    return tokens
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """The longest run of whole lines from the start of `text` within `max_tokens`."""
+    kept = []
+    used = 0
+    for line in text.splitlines():
+        cost = count_tokens(line) + 1
+        if used + cost > max_tokens:
+            break
+        kept.append(line)
+        used += cost
+    return "\n".join(kept)
+
+
+def summarize_config(path: str, content: str, max_tokens: int) -> str:
+    """
+    Outline of a config file (or of the start of it): its top-level keys,
+    sections or instructions, within `max_tokens`.
+    """
+    lines = content.splitlines()
+    entries = [
+        (len(line) - len(line.lstrip()), line.strip()[:120])
+        for line in lines
+        if _TOP_LEVEL.match(line.strip())
+    ]
+    # The least indented entries are the top level ("name" in package.json is indented once)
+    indent = min((depth for depth, _ in entries), default=0)
+    outline = [entry for depth, entry in entries if depth == indent]
+    header = f"Summary of {path}, top-level entries:"
+    return truncate_to_tokens("\n".join([header, *outline]), max_tokens)
+
+
+def render_hit(hit: Dict[str, Any], content: Optional[str], block_tokens: int) -> str:
+    """
+    Text block of one hit. File content is inlined up to `block_tokens`;
+    larger config files are summarized and other files truncated.
+    """
+    if "function" in hit:
+        name = f"{hit['parent']}.{hit['function']}" if hit.get("parent") else hit["function"]
+        location = f"{hit['file']}:{hit['line']}" if hit.get("line") is not None else hit["file"]
+        header = f"{hit['type']} {name} ({location})"
+        body = hit.get("snippet") or ""
+    else:
+        header = f"{hit['kind']} {hit['file']}"
+        body = content if content is not None else hit.get("snippet") or ""
+        if count_tokens(body) > block_tokens:
+            if hit["kind"] == "config" and content is not None:
+                body = summarize_config(hit["file"], content, block_tokens)
+            else:
+                body = truncate_to_tokens(body, block_tokens)
+    return f"{header}\n{body}".rstrip()
+
+
+def _overlaps(text: str, kept: List[str]) -> bool:
+    body = text.split("\n", 1)[-1].strip()
+    return any(text == other or (body and body in other) for other in kept)
+
+
+class ContextPacker:
+    """
+    Packs rendered hits, in rank order, into at most `budget` tokens. Hits
+    that repeat a kept block (same text, or a body already contained in it)
+    are skipped; hits that do not fit are dropped but smaller ones after
+    them may still be packed.
+    """
+
+    def __init__(self, budget: int, block_tokens: int):
+        self.budget = budget
+        self.block_tokens = block_tokens
+
+    def pack(
+        self, hits: List[Dict[str, Any]], contents: Dict[str, str]
+    ) -> Dict[str, Any]:
+        """
+        Returns the packed "hits" and their "blocks", the "context" text,
+        "tokens_used" and "tokens_dropped" (tokens of the distinct hits left
+        out for lack of budget).
+        """
+        ranked = sorted(hits, key=lambda hit: hit.get("score") or 0.0, reverse=True)
+        packed_hits = []
+        blocks = []
+        used = 0
+        dropped = 0
+        for hit in ranked:
+            content = contents.get(hit["file"]) if "function" not in hit else None
+            block = render_hit(hit, content, self.block_tokens)
+            if _overlaps(block, blocks):
+                continue
+            # Blocks are joined by a blank line
+            cost = count_tokens(block) + 1
+            if used + cost > self.budget:
+                dropped += cost
+                continue
+            packed_hits.append(hit)
+            blocks.append(block)
+            used += cost
+        return {
+            "hits": packed_hits,
+            "blocks": blocks,
+            "context": "\n\n".join(blocks),
+            "tokens_used": used,
+            "tokens_dropped": dropped,
+        }
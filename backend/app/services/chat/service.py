@@ -1,63 +1,98 @@
-import asyncio
 import logging
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Dict, Any
 
-from app.services.github.schema import ChatRequest, ChatResponse
+from app.config import settings
+from app.db.github_data_service import GithubDataService
+from app.services.github.schema import ChatRequest, ChatResponse, RepositorySearchResponse
+from app.services.registry import ServiceUnavailableError, services
+from .context import ContextPacker
 
 logger = logging.getLogger(__name__)
 
+# File content read per block: enough characters to fill CHAT_CONTEXT_BLOCK_TOKENS
+CONTENT_CHARS_PER_TOKEN = 8
+
 
 class ChatService:
-    """Mock chat service for repository interactions"""
-    
+    """Chat service for repository interactions, backed by the repository's indexes"""
+
     def __init__(self):
+        self.github_data_service = GithubDataService()
+        self.packer = ContextPacker(
+            budget=settings.CHAT_CONTEXT_TOKEN_BUDGET,
+            block_tokens=settings.CHAT_CONTEXT_BLOCK_TOKENS,
+        )
         self.logger = logger
-    
+
+    async def retrieve(
+        self, owner: str, repo: str, message: str, session: AsyncSession
+    ) -> RepositorySearchResponse:
+        """
+        Files and code units related to the message, nearest first, from the
+        repository's embedding index; full-text search when it has none yet
+        or the embedding service is unavailable. The embedding service (and
+        numpy) is loaded on the first chat turn.
+        """
+        limit = settings.CHAT_RETRIEVED_CANDIDATES
+        try:
+            embedding_service = await services.aget("embeddings")
+            found = await embedding_service.search(owner, repo, message, limit)
+        except ServiceUnavailableError as e:
+            self.logger.warning(f"Embedding search unavailable: {e}")
+            found = None
+        if found is None:
+            self.logger.info(f"No embedding index for {owner}/{repo}, using full-text search")
+            found = await self.github_data_service.search_repository(
+                owner, repo, message, session, limit=limit
+            )
+        return found
+
     async def chat_with_repository(
-        self, 
-        owner: str, 
-        repo: str, 
-        chat_request: ChatRequest, 
+        self,
+        owner: str,
+        repo: str,
+        chat_request: ChatRequest,
         session: AsyncSession
     ) -> ChatResponse:
         """
-        Mock implementation of chat with repository functionality
+        Answers with the parts of the repository related to the message,
+        packed under the configured token budget
         """
         self.logger.info(f"Processing chat request for {owner}/{repo}: {chat_request.message}")
-        
-        # Simulate some processing time
-        await asyncio.sleep(0.5)
-        
-        # Mock response based on the message content
-        message = chat_request.message.lower()
-        
-        if "hello" in message or "hi" in message:
-            response_text = f"Hello! I'm here to help you understand the {owner}/{repo} repository. What would you like to know about the codebase?"
-        elif "files" in message or "structure" in message:
-            response_text = f"The {owner}/{repo} repository contains various files and directories. I can help you explore specific parts of the codebase."
-            # Mock source files
-            source_files = [
-                {"README.md": "docs/README.md"},
-                {"main.py": "src/main.py"}
-            ]
-        elif "function" in message or "code" in message:
-            response_text = f"I can help you understand the code in {owner}/{repo}. Here are some relevant code snippets I found."
-            # Mock code snippets
-            code_snippets = [
-                {"function": "main", "file": "src/main.py", "line": 10}
-            ]
-            source_files = [
-                {"main.py": "src/main.py"}
-            ]
-        else:
-            response_text = f"I understand you're asking about: '{chat_request.message}'. Let me help you explore the {owner}/{repo} repository to find relevant information."
-        
-        # Build response
-        response = ChatResponse(
-            response=response_text,
-            code_snippets=locals().get('code_snippets'),
-            source_files=locals().get('source_files')
+
+        found = await self.retrieve(owner, repo, chat_request.message, session)
+        if not found.code_snippets:
+            return ChatResponse(
+                response=f"I could not find anything related to '{chat_request.message}' in {owner}/{repo}.",
+                tokens_used=0,
+                tokens_dropped=0,
+            )
+
+        file_paths = [hit["file"] for hit in found.code_snippets if "function" not in hit]
+        contents = await self.github_data_service.get_file_contents(
+            owner,
+            repo,
+            file_paths,
+            session,
+            max_chars=settings.CHAT_CONTEXT_BLOCK_TOKENS * CONTENT_CHARS_PER_TOKEN,
+        )
+        packed = self.packer.pack(found.code_snippets, contents)
+        self.logger.info(
+            f"Packed {len(packed['hits'])}/{len(found.code_snippets)} hits for {owner}/{repo}: "
+            f"{packed['tokens_used']} tokens used, {packed['tokens_dropped']} dropped"
+        )
+
+        source_files = []
+        for hit in packed["hits"]:
+            source = {hit["file"].rsplit("/", 1)[-1]: hit["file"]}
+            if source not in source_files:
+                source_files.append(source)
+
+        return ChatResponse(
+            response=f"Here is what I found in {owner}/{repo} related to '{chat_request.message}':\n\n"
+            + packed["context"],
+            code_snippets=packed["hits"],
+            source_files=source_files,
+            tokens_used=packed["tokens_used"],
+            tokens_dropped=packed["tokens_dropped"],
         )
-        
-        return response 
\ No newline at end of file
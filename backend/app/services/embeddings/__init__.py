@@ -0,0 +1 @@
+# Embedding index package 
\ No newline at end of file
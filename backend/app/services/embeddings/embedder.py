@@ -0,0 +1,98 @@
+import logging
+import re
+import zlib
+from typing import List, Optional, Protocol
+
+import numpy as np
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Splits snake_case, camelCase and PascalCase identifiers into words
+_WORDS = re.compile(r"[A-Z]?[a-z]+|[A-Z]+(?![a-z])|\d+")
+
+
+class Embedder(Protocol):
+    name: str
+    dimension: int
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """Returns L2-normalized float32 vectors, one row per text."""
+        ...
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class HashingEmbedder:
+    """
+    Lexical fallback for tests and offline machines: words and their
+    character trigrams are hashed into `dimension` signed buckets. It has no
+    notion of synonyms, so it only finds code that shares words with the
+    query; the fastembed backend is the one to use for semantic search.
+    """
+
+    def __init__(self, dimension: int, max_chars: int = 2000):
+        self.dimension = dimension
+        self.max_chars = max_chars
+        self.name = f"hashing-{dimension}"
+
+    def _features(self, text: str):
+        for word in _WORDS.findall(text[: self.max_chars]):
+            word = word.lower()
+            yield word, 1.0
+            padded = f"#{word}#"
+            for start in range(len(padded) - 2):
+                yield padded[start : start + 3], 0.5
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature, weight in self._features(text):
+                digest = zlib.crc32(feature.encode("utf-8"))
+                sign = 1.0 if digest & 0x80000000 else -1.0
+                vectors[row, digest % self.dimension] += sign * weight
+        # Dampen repeated terms before normalizing
+        vectors = np.sign(vectors) * np.sqrt(np.abs(vectors))
+        return _normalize(vectors)
+
+
+class FastEmbedEmbedder:
+    """
+    Sentence embeddings from an ONNX model run on the CPU by fastembed. The
+    model is downloaded to `cache_dir` on first use.
+    """
+
+    def __init__(self, model_name: str, cache_dir: Optional[str] = None):
+        # Imported here: loading onnxruntime takes a while, and only indexing
+        # and chat need it.
+        from fastembed import TextEmbedding
+
+        self.model = TextEmbedding(model_name, cache_dir=cache_dir)
+        self.name = f"fastembed-{model_name}"
+        self.dimension = len(next(iter(self.model.embed(["dimension probe"]))))
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = np.array(list(self.model.embed(texts)), dtype=np.float32)
+        return _normalize(vectors.reshape(len(texts), self.dimension))
+
+
+def create_embedder() -> Embedder:
+    """
+    The configured embedder. When the fastembed model cannot be loaded (no
+    network to download it, say), falls back to the hashing embedder; indexes
+    record which embedder built them, so they are rebuilt once the model loads.
+    """
+    if settings.EMBEDDING_BACKEND == "fastembed":
+        try:
+            return FastEmbedEmbedder(settings.EMBEDDING_MODEL, settings.EMBEDDING_CACHE_DIR)
+        except Exception as e:
+            logger.warning(
+                f"Embedding model {settings.EMBEDDING_MODEL} could not be loaded, "
+                f"falling back to lexical hashing: {e}"
+            )
+    return HashingEmbedder(settings.EMBEDDING_DIMENSION)
@@ -0,0 +1,204 @@
+import collections
+import json
+import logging
+import shutil
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .embedder import Embedder
+
+logger = logging.getLogger(__name__)
+
+MANIFEST = "manifest.json"
+ITEMS = "items.jsonl"
+OFFSETS = "items.offsets"
+
+
+def write_index(
+    directory: Path,
+    vectors: np.ndarray,
+    items: List[Dict[str, Any]],
+    embedder_name: str,
+    shard_rows: int,
+) -> None:
+    """
+    Writes normalized vectors as raw float32 shards of `shard_rows` rows,
+    the items as JSON lines and the byte offset of each line, so a query
+    reads only the items it returns.
+    """
+    directory.mkdir(parents=True)
+    shards = []
+    for number, start in enumerate(range(0, len(vectors), shard_rows)):
+        shard = np.ascontiguousarray(vectors[start : start + shard_rows], dtype=np.float32)
+        file_name = f"shard-{number:05d}.f32"
+        shard.tofile(directory / file_name)
+        shards.append({"file": file_name, "rows": len(shard)})
+
+    offsets = np.zeros(len(items), dtype=np.int64)
+    with open(directory / ITEMS, "wb") as file:
+        for row, item in enumerate(items):
+            offsets[row] = file.tell()
+            file.write(json.dumps(item).encode("utf-8") + b"\n")
+    offsets.tofile(directory / OFFSETS)
+
+    manifest = {
+        "embedder": embedder_name,
+        "dimension": int(vectors.shape[1]),
+        "rows": len(items),
+        "shards": shards,
+    }
+    (directory / MANIFEST).write_text(json.dumps(manifest))
+
+
+class VectorIndex:
+    """
+    Read-only view of one repository's index. Shards are memory-mapped, so
+    opening an index costs no RAM up front and the OS pages vectors in and
+    out as queries touch them.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        manifest = json.loads((directory / MANIFEST).read_text())
+        self.embedder_name = manifest["embedder"]
+        self.dimension = manifest["dimension"]
+        self.rows = manifest["rows"]
+        self.shards = [
+            np.memmap(
+                directory / shard["file"],
+                dtype=np.float32,
+                mode="r",
+                shape=(shard["rows"], self.dimension),
+            )
+            for shard in manifest["shards"]
+        ]
+        self.offsets = np.memmap(directory / OFFSETS, dtype=np.int64, mode="r") if self.rows else None
+
+    def top_k(self, queries: np.ndarray, k: int) -> List[List[tuple]]:
+        """
+        (score, row) pairs of the `k` best rows for each query vector, best
+        first. Each shard costs one matrix product for the whole batch.
+        """
+        best_scores = np.full((len(queries), 0), -np.inf, dtype=np.float32)
+        best_rows = np.zeros((len(queries), 0), dtype=np.int64)
+        base = 0
+        for shard in self.shards:
+            scores = queries @ shard.T
+            if scores.shape[1] > k:
+                top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+                scores = np.take_along_axis(scores, top, axis=1)
+            else:
+                top = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+            best_scores = np.concatenate([best_scores, scores], axis=1)
+            best_rows = np.concatenate([best_rows, top + base], axis=1)
+            base += len(shard)
+
+        order = np.argsort(-best_scores, axis=1)[:, :k]
+        return [
+            [(float(best_scores[query, column]), int(best_rows[query, column])) for column in order[query]]
+            for query in range(len(queries))
+        ]
+
+    def items(self, rows: List[int]) -> List[Dict[str, Any]]:
+        with open(self.directory / ITEMS, "rb") as file:
+            found = []
+            for row in rows:
+                file.seek(int(self.offsets[row]))
+                found.append(json.loads(file.readline()))
+            return found
+
+
+class EmbeddingIndexStore:
+    """
+    Per-repository vector indexes under `root`, one directory each. Up to
+    `max_open` indexes stay mapped (least recently used first out), so many
+    repositories remain queryable without holding them all open.
+    """
+
+    def __init__(self, root: str, embedder_factory, shard_rows: int, max_open: int):
+        self.root = Path(root)
+        self.embedder_factory = embedder_factory
+        self.shard_rows = shard_rows
+        self.max_open = max_open
+        self.logger = logger
+        self._embedder: Optional[Embedder] = None
+        self._open: "collections.OrderedDict[str, VectorIndex]" = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def embedder(self) -> Embedder:
+        with self._lock:
+            if self._embedder is None:
+                self._embedder = self.embedder_factory()
+            return self._embedder
+
+    def _directory(self, full_name: str) -> Path:
+        return self.root / full_name.replace("/", "__")
+
+    def build(self, full_name: str, items: List[Dict[str, Any]], texts: List[str]) -> int:
+        """
+        Embeds `texts` and replaces the repository's index with them and
+        their `items`. Returns the number of rows written.
+        """
+        embedder = self.embedder
+        vectors = (
+            np.concatenate([embedder.embed(texts[start : start + 256]) for start in range(0, len(texts), 256)])
+            if texts
+            else np.zeros((0, embedder.dimension), dtype=np.float32)
+        )
+        directory = self._directory(full_name)
+        staging = directory.with_name(directory.name + ".building")
+        shutil.rmtree(staging, ignore_errors=True)
+        write_index(staging, vectors, items, embedder.name, self.shard_rows)
+
+        with self._lock:
+            self._open.pop(full_name, None)
+            previous = directory.with_name(directory.name + ".previous")
+            shutil.rmtree(previous, ignore_errors=True)
+            if directory.exists():
+                directory.rename(previous)
+            staging.rename(directory)
+        shutil.rmtree(previous, ignore_errors=True)
+        return len(items)
+
+    def exists(self, full_name: str) -> bool:
+        return (self._directory(full_name) / MANIFEST).exists()
+
+    def _get(self, full_name: str) -> Optional[VectorIndex]:
+        with self._lock:
+            index = self._open.get(full_name)
+            if index is not None:
+                self._open.move_to_end(full_name)
+                return index
+            directory = self._directory(full_name)
+            if not (directory / MANIFEST).exists():
+                return None
+            index = VectorIndex(directory)
+            self._open[full_name] = index
+            while len(self._open) > self.max_open:
+                self._open.popitem(last=False)
+            return index
+
+    def search(self, full_name: str, query: str, k: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        The `k` items closest to `query`, each with its cosine "score", or
+        None when the repository has no index built by the current embedder.
+        """
+        index = self._get(full_name)
+        if index is None:
+            return None
+        embedder = self.embedder
+        if index.embedder_name != embedder.name:
+            self.logger.warning(
+                f"Embedding index of {full_name} was built by {index.embedder_name}, "
+                f"not {embedder.name}; rebuild it by re-indexing the repository"
+            )
+            return None
+        if not index.rows:
+            return []
+        hits = index.top_k(embedder.embed([query]), k)[0]
+        items = index.items([row for _, row in hits])
+        return [{**item, "score": score} for (score, _), item in zip(hits, items)]
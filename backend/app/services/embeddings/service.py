@@ -0,0 +1,86 @@
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.db.github_data_service import GithubDataService, search_response
+from app.services.github.schema import RepositorySearchResponse
+from .embedder import create_embedder
+from .index import EmbeddingIndexStore
+
+logger = logging.getLogger(__name__)
+
+SNIPPET_CHARS = 500
+
+
+def embedding_documents(
+    file_rows: List[Any], unit_rows: List[Any]
+) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    The stored hit (same keys as the full-text search hits) and the text to
+    embed for each file and code unit.
+    """
+    items = []
+    texts = []
+    for row in file_rows:
+        items.append({
+            "file": row.path,
+            "kind": row.kind.value,
+            "snippet": (row.description or row.content or "")[:SNIPPET_CHARS],
+        })
+        texts.append("\n".join(filter(None, [row.path, row.description, row.content])))
+    for row in unit_rows:
+        items.append({
+            "function": row.name,
+            "type": row.type,
+            "parent": row.parent,
+            "file": row.path,
+            "line": row.line,
+            "snippet": (row.description or "")[:SNIPPET_CHARS] or None,
+        })
+        texts.append("\n".join(filter(None, [row.parent, row.name, row.path, row.description])))
+    return items, texts
+
+
+class EmbeddingService:
+    """
+    Builds and queries the local vector index of each repository. Embedding
+    and search are CPU-bound and run in a worker thread.
+    """
+
+    def __init__(self, store: Optional[EmbeddingIndexStore] = None):
+        self.store = store or EmbeddingIndexStore(
+            settings.EMBEDDING_INDEX_DIR,
+            create_embedder,
+            shard_rows=settings.EMBEDDING_SHARD_ROWS,
+            max_open=settings.EMBEDDING_OPEN_INDEXES,
+        )
+        self.github_data_service = GithubDataService()
+        self.logger = logger
+
+    async def build_repository_index(self, owner: str, repo: str, session: AsyncSession) -> int:
+        """Re-embeds the repository's stored files and code units. Returns the row count."""
+        file_rows, unit_rows = await self.github_data_service.get_embedding_rows(owner, repo, session)
+        items, texts = embedding_documents(file_rows, unit_rows)
+        rows = await asyncio.to_thread(self.store.build, f"{owner}/{repo}", items, texts)
+        self.logger.info(f"Built the embedding index of {owner}/{repo}: {rows} rows")
+        return rows
+
+    def has_index(self, owner: str, repo: str) -> bool:
+        return self.store.exists(f"{owner}/{repo}")
+
+    async def search(
+        self, owner: str, repo: str, query: str, limit: int = 10
+    ) -> Optional[RepositorySearchResponse]:
+        """The `limit` nearest files and code units, or None if the repository has no index."""
+        hits = await asyncio.to_thread(self.store.search, f"{owner}/{repo}", query, limit)
+        if hits is None:
+            return None
+        return search_response(query, hits, limit)
+
+
+# --- One-Time Initialization ---
+# Indexes are opened on first query; the embedder is created on first use.
+embedding_service = EmbeddingService()
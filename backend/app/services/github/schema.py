@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import List, Dict, Any, Literal, Optional
+from typing import Annotated, List, Dict, Any, Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -12,11 +12,15 @@ class ChatResponse(BaseModel):
     response: str
     code_snippets: Optional[List[Dict[str, Any]]] = None
     source_files: Optional[List[Dict[str, str]]] = None
+    # Estimated tokens of repository context packed into, and left out of, the answer
+    tokens_used: Optional[int] = None
+    tokens_dropped: Optional[int] = None
 
 
 class RepositoryStatusResponse(BaseModel):
     status: str
     file_count: Optional[int] = None
+    code_unit_count: Optional[int] = None
     indexed_at: Optional[str] = None
     message: Optional[str] = None
 
@@ -79,13 +83,195 @@ class ImageGenerationRequest(BaseModel):
         description="A descriptive prompt for the image to be generated.",
         min_length=10,
     )
+    include_base64: bool = Field(
+        False,
+        description="Also embed the image as Base64 in the response (larger payload).",
+    )
+    format: Literal["PNG", "WEBP", "JPEG"] = Field(
+        "PNG", description="Output format of the returned variants."
+    )
+    sizes: List[Annotated[int, Field(ge=16, le=1024)]] = Field(
+        default_factory=list,
+        max_length=4,
+        description=(
+            "Target widths in pixels, e.g. [256] for a card thumbnail. "
+            "Empty returns the full-resolution image."
+        ),
+    )
+
+class ImageVariant(BaseModel):
+    """One format/size rendition of a generated image."""
+
+    format: str
+    width: Optional[int] = Field(
+        None, description="Target width in pixels, or None for full resolution."
+    )
+    image_url: str
+    image_key: str
+    size_bytes: int
 
 class ImageGenerationResponse(BaseModel):
     """
-    Response model containing the generated image as a Base64 string.
+    Response model pointing to the generated image, served with an ETag and
+    long-lived Cache-Control.
     """
 
-    image_base64: str = Field(
-        ..., description="The generated image, encoded as a Base64 string."
+    image_url: str = Field(..., description="URL of the first requested variant.")
+    image_key: str = Field(
+        ..., description="Content address of that variant, also used as its ETag."
+    )
+    variants: List[ImageVariant] = Field(
+        default_factory=list, description="Every requested variant, in request order."
+    )
+    cached: bool = Field(
+        False, description="True if the image was served from the cache."
+    )
+    image_base64: Optional[str] = Field(
+        None,
+        description="The first variant, encoded as a Base64 string, if requested.",
+    )
+    model_id: str = Field(..., description="The model used for generation.")
+
+class CardExecutionRequest(BaseModel):
+    """Request to execute a validated card graph produced by /chat/new-card."""
+
+    cards: list[NewCardData]
+    target_number: Optional[str] = Field(
+        None, description="Phone number (E.164) used for every phone_task card."
+    )
+    contact_name: Optional[str] = Field(
+        None, description="Name of the person called by phone_task cards."
+    )
+
+
+class CardExecutionResult(BaseModel):
+    """Outcome of a single card executed as part of a graph."""
+
+    card_id: str
+    task_type: TaskType
+    status: Literal["done", "failed", "skipped"]
+    level: int = Field(..., description="Topological level the card ran in.")
+    response: Optional[str] = None
+    error: Optional[str] = None
+    execution_time: float = 0.0
+    metadata: Optional[Dict[str, Any]] = None
+
+
+class CardExecutionResponse(BaseModel):
+    """Results for every card of an executed graph, in execution order."""
+
+    results: list[CardExecutionResult]
+    level_count: int
+    execution_time: float
+
+
+class DeepSearchStreamEvent(BaseModel):
+    """A single event of a streamed deep search, sent as one NDJSON line."""
+
+    type: Literal[
+        "planning", "tool_call", "tool_result", "step", "final_answer", "done", "error"
+    ]
+    step_number: Optional[int] = None
+    content: Optional[str] = None
+    metadata: Optional[Dict[str, Any]] = None
+
+
+class AgentPoolStats(BaseModel):
+    """Occupancy and queueing metrics of an agent pool."""
+
+    size: int
+    created: int
+    idle: int
+    in_use: int
+    queue_depth: int
+    max_queue_depth: int
+    acquired: int
+    rejected: int
+    average_wait_time: float
+    max_wait_time: float
+    average_run_time: float
+
+
+class NewCardStreamEvent(BaseModel):
+    """A single event of a streamed /new-card run, sent as one NDJSON line."""
+
+    type: Literal["card", "done", "error"]
+    card: Optional[NewCardData] = None
+    content: Optional[str] = None
+    metadata: Optional[Dict[str, Any]] = None
+
+
+class NewCardBatchRequest(BaseModel):
+    """Many /new-card prompts submitted together as one message batch."""
+
+    requests: list[AgentRequest] = Field(..., min_length=1, max_length=10000)
+
+
+class NewCardBatchItem(BaseModel):
+    """Status and validated cards of one prompt of a batch."""
+
+    custom_id: str
+    status: Literal["pending", "succeeded", "failed"]
+    card_data: Optional[list[NewCardData]] = None
+    error: Optional[str] = None
+
+
+class NewCardBatchResponse(BaseModel):
+    """Progress of a /new-card batch and the results of finished items."""
+
+    batch_id: str
+    status: Literal["in_progress", "canceling", "ended"]
+    request_counts: Dict[str, int]
+    items: list[NewCardBatchItem]
+
+
+class JobResponse(BaseModel):
+    """Status of an asynchronous agent job and its result once finished."""
+
+    job_id: str
+    kind: str
+    status: str
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: Optional[str] = None
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+
+
+class ServiceStatus(BaseModel):
+    """Readiness of a lazily initialized backend service."""
+
+    status: Literal["not_loaded", "loading", "ready", "unavailable"]
+    import_seconds: Optional[float] = Field(
+        None, description="Time spent importing the service module."
+    )
+    init_seconds: Optional[float] = Field(
+        None, description="Time spent constructing the service after import."
+    )
+    error: Optional[str] = None
+
+
+class IndexingResult(BaseModel):
+    """Outcome of one indexing run over a repository checkout."""
+
+    full_name: str
+    commit: str
+    files_indexed: int = Field(..., description="Files extracted in this run.")
+    files_reused: int = Field(
+        ..., description="Files whose git blob SHA was unchanged, reused as is."
+    )
+    files_removed: int = Field(..., description="Files indexed before but gone now.")
+    duration: float
+
+
+class RepositorySearchResponse(BaseModel):
+    """Full-text search hits over an indexed repository, best first."""
+
+    query: str
+    code_snippets: List[Dict[str, Any]] = Field(
+        default_factory=list,
+        description="Matching files and code units with a highlighted snippet.",
+    )
+    source_files: List[Dict[str, str]] = Field(
+        default_factory=list, description="File name to path of each hit's file."
     )
-    model_id: str = Field(..., description="The model used for generation.")
\ No newline at end of file
@@ -0,0 +1 @@
+# Repository indexer package 
\ No newline at end of file
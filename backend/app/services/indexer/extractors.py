@@ -0,0 +1,178 @@
+"""
+File classification and extraction for the repository indexer.
+
+This module runs inside the indexer's worker processes, so it only depends
+on the standard library and stays cheap to import.
+"""
+
+import ast
+import os
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+CODE_LANGUAGES = {
+    ".py": "python",
+    ".js": "javascript",
+    ".jsx": "javascript",
+    ".mjs": "javascript",
+    ".ts": "typescript",
+    ".tsx": "typescript",
+}
+MARKDOWN_EXTENSIONS = {".md", ".mdx", ".rst"}
+CONFIG_EXTENSIONS = {
+    ".toml": "toml",
+    ".yaml": "yaml",
+    ".yml": "yaml",
+    ".ini": "ini",
+    ".cfg": "ini",
+}
+CONFIG_FILE_NAMES = {
+    "package.json": "json",
+    "tsconfig.json": "json",
+    "vercel.json": "json",
+    "requirements.txt": "text",
+    "Dockerfile": "dockerfile",
+    "Makefile": "makefile",
+    ".env.example": "dotenv",
+}
+# Generated files with no documentation value
+IGNORED_FILE_NAMES = {"package-lock.json", "yarn.lock", "pnpm-lock.yaml", "poetry.lock", "uv.lock"}
+IGNORED_DIRECTORIES = {"node_modules", "vendor", "dist", "build", ".venv", "venv", "__pycache__"}
+
+_JSDOC = re.compile(
+    r"/\*\*(?P<doc>.*?)\*/\s*"
+    r"(?:export\s+)?(?:default\s+)?(?:async\s+)?"
+    r"(?P<keyword>function\*?|class)\s+(?P<name>[A-Za-z_$][\w$]*)",
+    re.S,
+)
+
+
+def classify(path: str) -> Optional[Tuple[str, Optional[str]]]:
+    """
+    Returns (section, language) for a repository path, where section is
+    "documentation", "documentation_md" or "config", or None to skip it.
+    """
+    parts = path.split("/")
+    if any(part in IGNORED_DIRECTORIES for part in parts[:-1]):
+        return None
+    file_name = parts[-1]
+    if file_name in IGNORED_FILE_NAMES:
+        return None
+    if file_name in CONFIG_FILE_NAMES:
+        return "config", CONFIG_FILE_NAMES[file_name]
+    if file_name.startswith("requirements") and file_name.endswith(".txt"):
+        return "config", "text"
+    extension = os.path.splitext(file_name)[1].lower()
+    if extension in CODE_LANGUAGES:
+        return "documentation", CODE_LANGUAGES[extension]
+    if extension in MARKDOWN_EXTENSIONS:
+        return "documentation_md", "markdown"
+    if extension in CONFIG_EXTENSIONS:
+        return "config", CONFIG_EXTENSIONS[extension]
+    return None
+
+
+def _first_line(text: Optional[str]) -> Optional[str]:
+    if not text:
+        return None
+    for line in text.strip().splitlines():
+        line = line.strip().lstrip("#").strip()
+        if line:
+            return line
+    return None
+
+
+def python_units(source: str) -> Tuple[Optional[str], List[Dict[str, Any]]]:
+    """Module docstring and the functions, classes and methods of a Python file."""
+    tree = ast.parse(source)
+    units = []
+
+    def visit(nodes, parent: Optional[str]) -> None:
+        for node in nodes:
+            if isinstance(node, ast.ClassDef):
+                units.append({
+                    "type": "class",
+                    "name": node.name,
+                    "parent": parent,
+                    "description": ast.get_docstring(node),
+                    "line": node.lineno,
+                })
+                visit(node.body, node.name)
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                units.append({
+                    "type": "method" if parent else "function",
+                    "name": node.name,
+                    "parent": parent,
+                    "description": ast.get_docstring(node),
+                    "line": node.lineno,
+                })
+
+    visit(tree.body, None)
+    return ast.get_docstring(tree), units
+
+
+def jsdoc_units(source: str) -> List[Dict[str, Any]]:
+    """Functions and classes preceded by a JSDoc comment."""
+    units = []
+    for match in _JSDOC.finditer(source):
+        doc = "\n".join(
+            line.strip().lstrip("*").strip() for line in match.group("doc").splitlines()
+        ).strip()
+        units.append({
+            "type": "class" if match.group("keyword") == "class" else "function",
+            "name": match.group("name"),
+            "parent": None,
+            "description": doc or None,
+            "line": source.count("\n", 0, match.start("keyword")) + 1,
+        })
+    return units
+
+
+def extract_file(root: str, path: str, section: str, language: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Builds the indexed entry of one file, or None if it cannot be read."""
+    try:
+        with open(os.path.join(root, path), encoding="utf-8") as file:
+            text = file.read()
+    except (OSError, UnicodeDecodeError):
+        return None
+
+    entry: Dict[str, Any] = {"path": path, "language": language}
+    if section == "documentation":
+        description, units = None, []
+        try:
+            if language == "python":
+                description, units = python_units(text)
+            else:
+                units = jsdoc_units(text)
+        except SyntaxError:
+            pass
+        entry["description"] = description
+        entry["units"] = units
+    else:
+        entry["description"] = _first_line(text)
+        entry["content"] = text
+    return entry
+
+
+def extract_files(
+    root: str, files: List[Tuple[str, str, Optional[str], str]], max_bytes: int
+) -> List[Dict[str, Any]]:
+    """
+    Worker entry point: extracts a chunk of (path, section, language,
+    blob_sha) files, skipping those larger than `max_bytes`. Entries keep
+    their blob SHA so the next run can reuse them when the file has not
+    changed, and their section so the caller can group them.
+    """
+    entries = []
+    for path, section, language, blob_sha in files:
+        try:
+            if os.path.getsize(os.path.join(root, path)) > max_bytes:
+                continue
+        except OSError:
+            continue
+        entry = extract_file(root, path, section, language)
+        if entry is not None:
+            entry["blob_sha"] = blob_sha
+            entry["section"] = section
+            entries.append(entry)
+    return entries
@@ -0,0 +1,234 @@
+import asyncio
+import base64
+import logging
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.db.github_data_service import INDEXED_SECTIONS, GithubDataService
+from app.models.models import RepoStatus
+from app.services.github.schema import IndexingResult
+from app.services.registry import services
+from .extractors import classify, extract_files
+
+logger = logging.getLogger(__name__)
+
+# Stored files by path: the section and blob SHA they were indexed from
+StoredFiles = Dict[str, Tuple[str, Optional[str]]]
+FileTask = Tuple[str, str, Optional[str], str]
+
+
+async def _git(*args: str, cwd: Optional[Path] = None, authenticated: bool = False) -> str:
+    process = await asyncio.create_subprocess_exec(
+        "git",
+        *(_auth_args() if authenticated else []),
+        *args,
+        cwd=cwd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stdout, stderr = await process.communicate()
+    if process.returncode != 0:
+        raise RuntimeError(f"git {args[0]} failed: {stderr.decode().strip()}")
+    return stdout.decode()
+
+
+def _auth_args() -> List[str]:
+    # Passed per command so the token never lands in .git/config
+    if not settings.GITHUB_TOKEN:
+        return []
+    credentials = base64.b64encode(f"x-access-token:{settings.GITHUB_TOKEN}".encode()).decode()
+    return ["-c", f"http.extraHeader=Authorization: Basic {credentials}"]
+
+
+def parse_ls_files(output: str) -> Dict[str, str]:
+    """Maps each tracked path to its blob SHA from `git ls-files -s -z`."""
+    blobs = {}
+    for record in output.split("\0"):
+        if not record:
+            continue
+        meta, path = record.split("\t", 1)
+        mode, sha, _ = meta.split(" ")
+        # Submodules point at commits, not blobs
+        if mode != "160000":
+            blobs[path] = sha
+    return blobs
+
+
+def plan_indexing(
+    blobs: Dict[str, str], stored: StoredFiles
+) -> Tuple[List[str], List[FileTask]]:
+    """
+    Splits the indexable files into the paths left as stored by the
+    previous run (same blob SHA and section) and files to extract again.
+    """
+    unchanged = []
+    tasks = []
+    for path, blob_sha in sorted(blobs.items()):
+        kind = classify(path)
+        if kind is None:
+            continue
+        section, language = kind
+        if stored.get(path) == (section, blob_sha):
+            unchanged.append(path)
+        else:
+            tasks.append((path, section, language, blob_sha))
+    return unchanged, tasks
+
+
+def fetch_repository_info(owner: str, repo: str) -> Dict[str, Any]:
+    """Repository metadata from the GitHub API, as create_or_update_repository expects it."""
+    # Imported here: PyGithub is only needed when a repository is indexed.
+    from github import Auth, Github
+
+    client = Github(auth=Auth.Token(settings.GITHUB_TOKEN)) if settings.GITHUB_TOKEN else Github()
+    info = client.get_repo(f"{owner}/{repo}")
+    return {
+        "id": info.id,
+        "description": info.description,
+        "default_branch": info.default_branch,
+        "stars": info.stargazers_count,
+        "forks": info.forks_count,
+        "size": info.size,
+    }
+
+
+class IndexerService:
+    """
+    Indexes a GitHub repository from a shallow local checkout. Code files
+    (docstrings, functions, classes), markdown and config files are
+    extracted in a process pool; files whose git blob SHA matches the
+    previous run are neither re-read nor rewritten.
+    """
+
+    def __init__(
+        self,
+        checkout_dir: str = settings.INDEXER_CHECKOUT_DIR,
+        executor: Optional[Executor] = None,
+        workers: Optional[int] = None,
+    ):
+        self.checkout_dir = Path(checkout_dir)
+        self.executor = executor or indexer_executor
+        self.workers = workers or settings.INDEXER_WORKERS or os.cpu_count() or 1
+        self.github_data_service = GithubDataService()
+        self.logger = logger
+
+    async def checkout(self, owner: str, repo: str) -> Path:
+        """Clones the default branch, or fast-forwards an existing checkout to it."""
+        path = self.checkout_dir / owner / repo
+        if (path / ".git").exists():
+            await _git("fetch", "--depth", "1", "origin", cwd=path, authenticated=True)
+            await _git("reset", "--hard", "FETCH_HEAD", cwd=path)
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            await _git(
+                "clone", "--depth", "1", f"https://github.com/{owner}/{repo}.git", str(path),
+                authenticated=True,
+            )
+        return path
+
+    async def index_checkout(
+        self, root: Path, stored: StoredFiles
+    ) -> Tuple[Dict[str, List[Dict[str, Any]]], List[str], Dict[str, int]]:
+        """
+        Returns the entries of each section extracted from changed and new
+        files, the stored paths to replace or remove, and the run counters.
+        """
+        blobs = parse_ls_files(await _git("ls-files", "-s", "-z", cwd=root))
+        unchanged, tasks = plan_indexing(blobs, stored)
+
+        # A few chunks per worker keeps them busy without paying IPC per file
+        chunk_size = max(1, min(64, math.ceil(len(tasks) / (self.workers * 4))))
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    self.executor,
+                    extract_files,
+                    str(root),
+                    tasks[start : start + chunk_size],
+                    settings.INDEXER_MAX_FILE_BYTES,
+                )
+                for start in range(0, len(tasks), chunk_size)
+            )
+        )
+
+        sections: Dict[str, List[Dict[str, Any]]] = {section: [] for section in INDEXED_SECTIONS}
+        files_indexed = 0
+        for entries in results:
+            for entry in entries:
+                sections[entry.pop("section")].append(entry)
+                files_indexed += 1
+        # Changed, deleted and no longer indexable files
+        kept = set(unchanged)
+        stale_paths = sorted(path for path in stored if path not in kept)
+        stats = {
+            "files_indexed": files_indexed,
+            "files_reused": len(unchanged),
+            "files_removed": len(stored.keys() - blobs.keys()),
+        }
+        return sections, stale_paths, stats
+
+    async def save_indexed_data_to_db(
+        self, owner: str, repo: str, session: AsyncSession
+    ) -> IndexingResult:
+        """
+        Indexes the repository's default branch and stores the result with
+        GithubDataService. The repository is PENDING while indexing runs and
+        FAILED if it does not complete.
+        """
+        start_time = time.perf_counter()
+        repo_info = await asyncio.to_thread(fetch_repository_info, owner, repo)
+        repository = await self.github_data_service.create_or_update_repository(
+            owner, repo, repo_info, RepoStatus.PENDING, session
+        )
+
+        try:
+            root = await self.checkout(owner, repo)
+            commit = (await _git("rev-parse", "HEAD", cwd=root)).strip()
+            stored = await self.github_data_service.get_file_blobs(repository.id, session)
+            sections, stale_paths, stats = await self.index_checkout(root, stored)
+            await self.github_data_service.save_indexed_data(
+                repository, sections, stale_paths, session
+            )
+        except Exception as e:
+            self.logger.error(f"Indexing {owner}/{repo} failed: {e}")
+            # A database error leaves the transaction aborted; start a new one
+            await session.rollback()
+            repository.status = RepoStatus.FAILED
+            await session.commit()
+            raise
+
+        try:
+            embedding_service = await services.aget("embeddings")
+            if stats["files_indexed"] or stale_paths or not embedding_service.has_index(owner, repo):
+                await embedding_service.build_repository_index(owner, repo, session)
+        except Exception as e:
+            # Chat falls back to full-text search until the next run
+            self.logger.warning(f"Embedding index of {owner}/{repo} was not built: {e}")
+
+        duration = time.perf_counter() - start_time
+        self.logger.info(
+            f"Indexed {owner}/{repo}@{commit[:8]} in {duration:.2f}s: "
+            f"{stats['files_indexed']} extracted, {stats['files_reused']} unchanged, "
+            f"{stats['files_removed']} removed"
+        )
+        return IndexingResult(
+            full_name=f"{owner}/{repo}", commit=commit, duration=duration, **stats
+        )
+
+
+# --- One-Time Initialization ---
+# Workers are spawned, not forked, so they do not inherit the event loop's
+# threads; they only import the standard-library extractors module.
+indexer_executor = ProcessPoolExecutor(
+    max_workers=settings.INDEXER_WORKERS or os.cpu_count(),
+    mp_context=multiprocessing.get_context("spawn"),
+)
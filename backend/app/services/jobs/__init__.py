@@ -0,0 +1 @@
+# Job services package 
\ No newline at end of file
@@ -0,0 +1,169 @@
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from pydantic import BaseModel
+from sqlalchemy import Update, and_, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.database import async_session_maker
+from app.models.models import AgentJob, JobKind, JobStatus
+from app.services.github.schema import JobResponse
+
+logger = logging.getLogger(__name__)
+
+
+STALE_JOB_ERROR = "Interrupted: the worker running this job stopped before it finished."
+
+# Left to a running job's own timeout before other workers call it stale
+STALE_JOB_GRACE = timedelta(minutes=1)
+
+
+class JobFailedError(Exception):
+    """Raised by a job runner to fail a job with a message instead of a result."""
+
+
+def stale_jobs_update(now: datetime, timeout: float) -> Update:
+    """
+    Fails jobs no worker is running anymore: running for longer than
+    `timeout` (plus a grace period), or still pending that long after they
+    were created. BackgroundTasks die with their worker, so these jobs
+    would otherwise never finish.
+    """
+    cutoff = now - timedelta(seconds=timeout) - STALE_JOB_GRACE
+    return (
+        update(AgentJob)
+        .where(
+            or_(
+                and_(AgentJob.status == JobStatus.RUNNING, AgentJob.started_at < cutoff),
+                and_(AgentJob.status == JobStatus.PENDING, AgentJob.created_at < cutoff),
+            )
+        )
+        .values(status=JobStatus.FAILED, error=STALE_JOB_ERROR, finished_at=now)
+    )
+
+
+class JobService:
+    """
+    Persists long-running agent work in the agent_jobs table so any worker
+    can answer status polls and results survive restarts. A job runs for at
+    most `timeout` seconds; one whose worker died is failed when it is
+    polled or when the next job is created.
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker = async_session_maker,
+        timeout: float = settings.JOB_TIMEOUT,
+    ):
+        self.session_maker = session_maker
+        self.timeout = timeout
+        self.logger = logger
+
+    async def create_job(
+        self,
+        kind: JobKind,
+        request: Dict[str, Any],
+        session: AsyncSession,
+    ) -> AgentJob:
+        """
+        Stores a new pending job, failing the stale ones in passing.
+        """
+        result = await session.execute(stale_jobs_update(datetime.utcnow(), self.timeout))
+        if result.rowcount:
+            self.logger.warning(f"Failed {result.rowcount} stale job(s)")
+        job = AgentJob(kind=kind, status=JobStatus.PENDING, request=request)
+        session.add(job)
+        await session.commit()
+        await session.refresh(job)
+        return job
+
+    async def run_job(
+        self,
+        job_id: uuid.UUID,
+        runner: Callable[[], Awaitable[BaseModel]],
+    ) -> None:
+        """
+        Executes a job and records its result or error. Runs after the
+        response was sent, so it uses its own session.
+        """
+        await self._update(job_id, status=JobStatus.RUNNING, started_at=datetime.utcnow())
+        try:
+            result = await asyncio.wait_for(runner(), self.timeout)
+        except asyncio.TimeoutError:
+            self.logger.error(f"Job {job_id} timed out after {self.timeout} seconds")
+            await self._update(
+                job_id,
+                status=JobStatus.FAILED,
+                error=f"Timed out after {self.timeout} seconds.",
+                finished_at=datetime.utcnow(),
+            )
+            return
+        except Exception as e:
+            self.logger.error(f"Job {job_id} failed: {e}")
+            await self._update(
+                job_id,
+                status=JobStatus.FAILED,
+                error=str(e),
+                finished_at=datetime.utcnow(),
+            )
+            return
+
+        await self._update(
+            job_id,
+            status=JobStatus.SUCCEEDED,
+            result=result.model_dump(mode="json"),
+            finished_at=datetime.utcnow(),
+        )
+        self.logger.info(f"Job {job_id} succeeded")
+
+    async def get_job(
+        self,
+        job_id: uuid.UUID,
+        session: AsyncSession,
+    ) -> Optional[JobResponse]:
+        """
+        Returns the job status, or None if the job does not exist. A job
+        whose worker died is reported (and stored) as failed.
+        """
+        result = await session.execute(select(AgentJob).where(AgentJob.id == job_id))
+        job = result.scalars().first()
+        if job is None:
+            return None
+        if job.status in (JobStatus.PENDING, JobStatus.RUNNING):
+            stale = await session.execute(
+                stale_jobs_update(datetime.utcnow(), self.timeout)
+                .where(AgentJob.id == job_id)
+                .execution_options(synchronize_session=False)
+            )
+            if stale.rowcount:
+                await session.commit()
+                await session.refresh(job)
+        return to_job_response(job)
+
+    async def _update(self, job_id: uuid.UUID, **values: Any) -> None:
+        async with self.session_maker() as session:
+            await session.execute(
+                update(AgentJob).where(AgentJob.id == job_id).values(**values)
+            )
+            await session.commit()
+
+
+def to_job_response(job: AgentJob) -> JobResponse:
+    return JobResponse(
+        job_id=str(job.id),
+        kind=job.kind.value,
+        status=job.status.value,
+        result=job.result,
+        error=job.error,
+        created_at=job.created_at.isoformat() if job.created_at else None,
+        started_at=job.started_at.isoformat() if job.started_at else None,
+        finished_at=job.finished_at.isoformat() if job.finished_at else None,
+    )
+
+
+# --- One-Time Initialization ---
+job_service = JobService()
@@ -0,0 +1,158 @@
+import asyncio
+import importlib
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from app.services.github.schema import ServiceStatus
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceUnavailableError(RuntimeError):
+    """Raised when a service failed to initialize, e.g. a missing API key."""
+
+
+class _Entry:
+    def __init__(self, module: str, factory: Optional[Callable[[Any], Any]]):
+        self.module = module
+        self.factory = factory
+        self.lock = threading.Lock()
+        self.instance: Any = None
+        self.ready = False
+        self.loading = False
+        self.error: Optional[str] = None
+        self.import_seconds: Optional[float] = None
+        self.init_seconds: Optional[float] = None
+
+
+class ServiceRegistry:
+    """
+    Creates heavy services (LLM clients, agents, SDKs) on first use instead
+    of at import time, so workers boot without loading litellm,
+    huggingface_hub or vapi.
+
+    A service is a module, imported when first requested, optionally turned
+    into an instance by `factory(module)`. Module-level initialization counts
+    as import time. A service that fails to initialize stays unavailable and
+    raises ServiceUnavailableError, which only fails the routes that use it.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, _Entry] = {}
+        self.logger = logger
+
+    def register(
+        self,
+        name: str,
+        module: str,
+        factory: Optional[Callable[[Any], Any]] = None,
+    ) -> None:
+        self._entries[name] = _Entry(module, factory)
+
+    def get(self, name: str) -> Any:
+        """Returns the service, initializing it on first use. Blocking."""
+        entry = self._entries[name]
+        if entry.ready:
+            return entry.instance
+
+        with entry.lock:
+            if not entry.ready and entry.error is None:
+                self._load(name, entry)
+
+        if entry.error is not None:
+            raise ServiceUnavailableError(f"Service '{name}' is unavailable: {entry.error}")
+        return entry.instance
+
+    async def aget(self, name: str) -> Any:
+        """Like get, but runs a first-time initialization in a worker thread."""
+        entry = self._entries[name]
+        if entry.ready:
+            return entry.instance
+        return await asyncio.to_thread(self.get, name)
+
+    def _load(self, name: str, entry: _Entry) -> None:
+        entry.loading = True
+        try:
+            start_time = time.perf_counter()
+            module = importlib.import_module(entry.module)
+            entry.import_seconds = time.perf_counter() - start_time
+
+            start_time = time.perf_counter()
+            instance = entry.factory(module) if entry.factory else module
+            entry.init_seconds = time.perf_counter() - start_time
+        except Exception as e:
+            entry.error = str(e) or type(e).__name__
+            self.logger.error(f"Service '{name}' failed to initialize: {entry.error}")
+            return
+        finally:
+            entry.loading = False
+
+        entry.instance = instance
+        entry.ready = True
+        self.logger.info(
+            f"Service '{name}' ready (import {entry.import_seconds:.3f}s, "
+            f"init {entry.init_seconds:.3f}s)"
+        )
+
+    async def warm_up(self, names: Optional[Iterable[str]] = None) -> None:
+        """
+        Initializes services ahead of the first request, one at a time so
+        warm-up does not compete with traffic for the whole CPU.
+        """
+        for name in names or list(self._entries):
+            try:
+                await self.aget(name)
+            except ServiceUnavailableError:
+                continue
+
+    def status(self) -> Dict[str, ServiceStatus]:
+        """Readiness and initialization cost of every registered service."""
+        statuses = {}
+        for name, entry in self._entries.items():
+            if entry.ready:
+                state = "ready"
+            elif entry.error is not None:
+                state = "unavailable"
+            elif entry.loading:
+                state = "loading"
+            else:
+                state = "not_loaded"
+            statuses[name] = ServiceStatus(
+                status=state,
+                import_seconds=entry.import_seconds,
+                init_seconds=entry.init_seconds,
+                error=entry.error,
+            )
+        return statuses
+
+
+def _image_generation(module: Any) -> Any:
+    # A missing HF_TOKEN makes the service unavailable instead of failing the import
+    module.get_inference_client()
+    return module
+
+
+# --- One-Time Initialization ---
+services = ServiceRegistry()
+services.register("new_card", "app.services.agent.new_card_service")
+services.register(
+    "new_card_batch",
+    "app.services.agent.new_card_batch_service",
+    lambda module: module.new_card_batch_service,
+)
+services.register("deep_search", "app.services.agent.deep_search_service")
+services.register(
+    "image_generation",
+    "app.services.agent.image_generation_logic",
+    _image_generation,
+)
+services.register(
+    "vapi", "app.services.vapi.service", lambda module: module.VapiService()
+)
+services.register(
+    "embeddings",
+    "app.services.embeddings.service",
+    lambda module: module.embedding_service,
+)
@@ -1,3 +1,11 @@
-from .service import VapiService
+__all__ = ["VapiService"]
 
-__all__ = ["VapiService"] 
\ No newline at end of file
+
+def __getattr__(name):
+    # Imported on first access so loading the schemas does not pull in the
+    # Vapi SDK.
+    if name == "VapiService":
+        from .service import VapiService
+
+        return VapiService
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,162 @@
+import asyncio
+import hashlib
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.models.models import VapiAssistant
+from .dispatcher import CallDispatcher
+
+logger = logging.getLogger(__name__)
+
+
+def build_assistant_config(
+    name: str,
+    prompt_template: str,
+    model_provider: str,
+    model: str,
+    voice_provider: str,
+    voice_id: str,
+) -> Dict[str, Any]:
+    """
+    Assistant definition as sent to Vapi. The prompt keeps its {{variables}};
+    Vapi fills them from each call's variable values.
+    """
+    return {
+        "name": name,
+        "model": {
+            "provider": model_provider,
+            "model": model,
+            "messages": [{"role": "system", "content": prompt_template}],
+        },
+        "voice": {"provider": voice_provider, "voiceId": voice_id},
+    }
+
+
+def assistant_config_hash(config: Dict[str, Any]) -> str:
+    """sha256 of the config, independent of key order."""
+    payload = json.dumps(config, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _is_not_found(error: Exception) -> bool:
+    return getattr(error, "status_code", None) == 404
+
+
+class AssistantManager:
+    """
+    Keeps one Vapi assistant per name in sync with its config. The assistant
+    is created on first use and updated only when the config hash changes;
+    the id and hash are cached in memory and in the `vapi_assistants` table,
+    so restarts and other workers reuse the assistant without calling Vapi.
+    Postgres errors are logged and only cost an extra sync.
+    """
+
+    def __init__(
+        self,
+        client,
+        dispatcher: CallDispatcher,
+        session_maker: Optional[async_sessionmaker] = None,
+    ):
+        self.client = client
+        self.dispatcher = dispatcher
+        self.session_maker = session_maker
+        self.logger = logger
+        # name -> (config hash, assistant id)
+        self._assistants: Dict[str, Tuple[str, str]] = {}
+        self._lock = asyncio.Lock()
+        self._counters = {"hits": 0, "created": 0, "updated": 0}
+
+    async def ensure(self, config: Dict[str, Any]) -> str:
+        """Returns the id of an assistant matching `config`, syncing it if needed."""
+        name = config["name"]
+        config_hash = assistant_config_hash(config)
+        cached = self._assistants.get(name)
+        if cached is not None and cached[0] == config_hash:
+            self._counters["hits"] += 1
+            return cached[1]
+
+        async with self._lock:
+            cached = self._assistants.get(name) or await self._load(name)
+            if cached is not None and cached[0] == config_hash:
+                self._counters["hits"] += 1
+                assistant_id = cached[1]
+            else:
+                assistant_id = await self._sync(config, cached[1] if cached else None)
+                await self._save(name, assistant_id, config_hash, config)
+            self._assistants[name] = (config_hash, assistant_id)
+            return assistant_id
+
+    async def _sync(self, config: Dict[str, Any], assistant_id: Optional[str]) -> str:
+        if assistant_id is not None:
+            try:
+                await self.dispatcher.dispatch(
+                    lambda: self.client.assistants.update(assistant_id, **config)
+                )
+                self._counters["updated"] += 1
+                self.logger.info(f"Updated Vapi assistant {config['name']} ({assistant_id})")
+                return assistant_id
+            except Exception as error:
+                # Deleted from the dashboard: fall through and recreate it.
+                if not _is_not_found(error):
+                    raise
+        assistant, _ = await self.dispatcher.dispatch(
+            lambda: self.client.assistants.create(**config)
+        )
+        self._counters["created"] += 1
+        self.logger.info(f"Created Vapi assistant {config['name']} ({assistant.id})")
+        return assistant.id
+
+    async def _load(self, name: str) -> Optional[Tuple[str, str]]:
+        if self.session_maker is None:
+            return None
+        try:
+            async with self.session_maker() as session:
+                result = await session.execute(
+                    select(VapiAssistant).where(VapiAssistant.name == name)
+                )
+                record = result.scalars().first()
+        except Exception as e:
+            self.logger.warning(f"Vapi assistant lookup failed: {e}")
+            return None
+        if record is None:
+            return None
+        return record.config_hash, record.assistant_id
+
+    async def _save(
+        self, name: str, assistant_id: str, config_hash: str, config: Dict[str, Any]
+    ) -> None:
+        if self.session_maker is None:
+            return
+        now = datetime.utcnow()
+        statement = insert(VapiAssistant).values(
+            name=name,
+            assistant_id=assistant_id,
+            config_hash=config_hash,
+            config=config,
+            created_at=now,
+            updated_at=now,
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[VapiAssistant.name],
+            set_={
+                "assistant_id": statement.excluded.assistant_id,
+                "config_hash": statement.excluded.config_hash,
+                "config": statement.excluded.config,
+                "updated_at": statement.excluded.updated_at,
+            },
+        )
+        try:
+            async with self.session_maker() as session:
+                await session.execute(statement)
+                await session.commit()
+        except Exception as e:
+            self.logger.warning(f"Failed to persist Vapi assistant {name}: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        return dict(self._counters)
@@ -0,0 +1,126 @@
+import asyncio
+import logging
+import random
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter: `rate` tokens per second, bursts of up to
+    `capacity`. Waiters are served in arrival order.
+    """
+
+    def __init__(self, rate: float, capacity: int, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self._tokens = float(capacity)
+        self._updated_at = clock()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = self.clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def try_acquire(self) -> bool:
+        """Takes a token if one is available right now."""
+        self._refill()
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    def wait_time(self) -> float:
+        """Seconds until the next token is available."""
+        self._refill()
+        return max(0.0, (1 - self._tokens) / self.rate)
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+
+def _is_rate_limited(error: Exception) -> bool:
+    return getattr(error, "status_code", None) == 429
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    headers = getattr(error, "headers", None) or {}
+    value = {key.lower(): val for key, val in headers.items()}.get("retry-after")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class CallDispatcher:
+    """
+    Runs blocking Vapi SDK calls in worker threads so the event loop keeps
+    serving other requests. Calls are admitted through a token bucket and a
+    concurrency cap, and 429 responses are retried with jittered
+    exponential backoff (honouring Retry-After when Vapi sends it).
+    """
+
+    def __init__(
+        self,
+        rate_per_second: float,
+        burst: int,
+        max_concurrency: int,
+        max_retries: int,
+        base_retry_delay: float,
+        max_retry_delay: float = 30.0,
+    ):
+        self.bucket = TokenBucket(rate_per_second, burst)
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.max_retries = max_retries
+        self.base_retry_delay = base_retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.logger = logger
+
+    async def dispatch(self, create: Callable[[], Any]) -> Tuple[Any, Dict[str, Any]]:
+        """
+        Calls `create()` in a thread and returns its result together with
+        dispatch stats: time spent queued for a slot or token, attempts made
+        and time spent backing off after 429s. Other errors propagate.
+        """
+        queue_wait_time = 0.0
+        backoff_time = 0.0
+        attempt = 0
+        while True:
+            attempt += 1
+            queued_at = time.monotonic()
+            async with self.semaphore:
+                await self.bucket.acquire()
+                queue_wait_time += time.monotonic() - queued_at
+                try:
+                    result = await asyncio.to_thread(create)
+                except Exception as error:
+                    if not _is_rate_limited(error) or attempt > self.max_retries:
+                        raise
+                    delay = _retry_after(error)
+                    if delay is None:
+                        # Full jitter keeps retries of a burst from re-colliding.
+                        delay = random.uniform(
+                            0,
+                            min(self.max_retry_delay, self.base_retry_delay * 2 ** (attempt - 1)),
+                        )
+                    self.logger.warning(
+                        f"Vapi rate limit hit (attempt {attempt}), retrying in {delay:.2f}s"
+                    )
+                else:
+                    return result, {
+                        "queue_wait_time": queue_wait_time,
+                        "attempts": attempt,
+                        "rate_limit_backoff_time": backoff_time,
+                    }
+            # Back off outside the semaphore so other calls can proceed.
+            await asyncio.sleep(delay)
+            backoff_time += delay
@@ -0,0 +1,150 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Dict, List, Literal, Optional
+
+from .dispatcher import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+SelectionStrategy = Literal["lru", "least_loaded"]
+
+
+def is_line_failure(error: BaseException) -> bool:
+    """
+    Whether a failed call says something about the line it was placed on:
+    server errors, 429s left after the dispatcher's retries, and errors
+    without an HTTP status (network or telephony failures). Other 4xx
+    errors, like an invalid customer number, are the request's fault.
+    """
+    if not isinstance(error, Exception):
+        return False
+    status_code = getattr(error, "status_code", None)
+    return status_code is None or status_code >= 500 or status_code == 429
+
+
+class PhoneNumber:
+    """State of one outbound line: its own throttle, load and health."""
+
+    def __init__(self, phone_number_id: str, bucket: TokenBucket):
+        self.id = phone_number_id
+        self.bucket = bucket
+        self.in_flight = 0
+        self.last_used_at = 0.0
+        self.consecutive_failures = 0
+        self.quarantined_until = 0.0
+        self.calls = 0
+        self.failures = 0
+
+
+class PhoneNumberPool:
+    """
+    Spreads outbound calls over several Vapi phone numbers.
+
+    Each call takes the best available number: the least recently used one
+    ("lru") or the one with the fewest calls being placed ("least_loaded").
+    Every number is throttled separately by its own token bucket, so
+    capacity grows with the number of lines. After `failure_threshold`
+    consecutive failures a number is quarantined for `quarantine_seconds`.
+    """
+
+    def __init__(
+        self,
+        phone_number_ids: List[str],
+        strategy: SelectionStrategy,
+        calls_per_minute: float,
+        failure_threshold: int,
+        quarantine_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if not phone_number_ids:
+            raise ValueError("At least one Vapi phone number id is required")
+        self.strategy = strategy
+        self.calls_per_minute = calls_per_minute
+        self.failure_threshold = failure_threshold
+        self.quarantine_seconds = quarantine_seconds
+        self.clock = clock
+        self.numbers = [
+            PhoneNumber(
+                phone_number_id,
+                TokenBucket(calls_per_minute / 60, capacity=1, clock=clock),
+            )
+            for phone_number_id in dict.fromkeys(phone_number_ids)
+        ]
+        self.logger = logger
+
+    def _candidates(self) -> List[PhoneNumber]:
+        now = self.clock()
+        available = [number for number in self.numbers if number.quarantined_until <= now]
+        if self.strategy == "least_loaded":
+            return sorted(available, key=lambda number: (number.in_flight, number.last_used_at))
+        return sorted(available, key=lambda number: number.last_used_at)
+
+    def capacity_per_minute(self) -> float:
+        """Calls per minute the numbers out of quarantine can place."""
+        return len(self._candidates()) * self.calls_per_minute
+
+    async def acquire(self) -> PhoneNumber:
+        """
+        Waits for a number whose throttle allows a call. Raises RuntimeError
+        when every number is quarantined.
+        """
+        while True:
+            candidates = self._candidates()
+            if not candidates:
+                raise RuntimeError("Every Vapi phone number is quarantined after repeated failures")
+            for number in candidates:
+                if number.bucket.try_acquire():
+                    number.in_flight += 1
+                    number.last_used_at = self.clock()
+                    number.calls += 1
+                    return number
+            await asyncio.sleep(min(number.bucket.wait_time() for number in candidates))
+
+    def release(self, number: PhoneNumber, success: Optional[bool]) -> None:
+        """Frees the number; `success` None leaves its health unchanged."""
+        number.in_flight -= 1
+        if success is None:
+            return
+        if success:
+            number.consecutive_failures = 0
+            return
+        number.failures += 1
+        number.consecutive_failures += 1
+        if number.consecutive_failures >= self.failure_threshold:
+            number.quarantined_until = self.clock() + self.quarantine_seconds
+            number.consecutive_failures = 0
+            self.logger.warning(
+                f"Phone number {number.id} quarantined for {self.quarantine_seconds:.0f}s "
+                f"after {self.failure_threshold} consecutive failures"
+            )
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[PhoneNumber]:
+        """
+        Acquires a number and records whether the call placed with it
+        failed. Only line failures count towards quarantine; cancellation
+        and errors caused by the request leave the number's health as is.
+        """
+        number = await self.acquire()
+        try:
+            yield number
+        except BaseException as error:
+            self.release(number, success=False if is_line_failure(error) else None)
+            raise
+        self.release(number, success=True)
+
+    def stats(self) -> List[Dict[str, object]]:
+        now = self.clock()
+        return [
+            {
+                "phone_number_id": number.id,
+                "in_flight": number.in_flight,
+                "calls": number.calls,
+                "failures": number.failures,
+                "quarantined": number.quarantined_until > now,
+                "quarantine_remaining": max(0.0, number.quarantined_until - now),
+            }
+            for number in self.numbers
+        ]
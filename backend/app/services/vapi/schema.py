@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Optional, Dict, Any, List
 
 
 class OutboundCallRequest(BaseModel):
@@ -25,4 +25,56 @@ class OutboundCallResponse(BaseModel):
     message: str
     assistant_id: Optional[str] = None
     execution_time: float
-    metadata: Optional[Dict[str, Any]] = None 
\ No newline at end of file
+    metadata: Optional[Dict[str, Any]] = None 
+
+
+class CampaignRequest(BaseModel):
+    calls: List[OutboundCallRequest] = Field(..., min_length=1, max_length=10000)
+    calls_per_minute: Optional[int] = Field(
+        None, ge=1, description="Budget d'appels par minute (défaut : CAMPAIGN_DEFAULT_CALLS_PER_MINUTE)"
+    )
+    quiet_hours_start: Optional[int] = Field(
+        None, ge=0, le=23, description="Début des heures creuses (heure locale, incluse)"
+    )
+    quiet_hours_end: Optional[int] = Field(
+        None, ge=0, le=23, description="Fin des heures creuses (heure locale, exclue)"
+    )
+    timezone: str = Field("UTC", description="Fuseau horaire IANA des heures creuses")
+
+
+class CampaignResponse(BaseModel):
+    campaign_id: str
+    status: str
+    calls_per_minute: int
+    total: int
+    duplicates_skipped: int = 0
+    counters: Dict[str, int] = Field(
+        ..., description="Nombre d'appels par statut (pending, in_progress, succeeded, failed, canceled)"
+    )
+    created_at: Optional[str] = None
+    finished_at: Optional[str] = None
+
+
+class VapiWebhookMessage(BaseModel):
+    """Message envoyé par Vapi au server URL ; les champs dépendent du type."""
+
+    model_config = ConfigDict(extra="allow")
+
+    type: str
+    call: Optional[Dict[str, Any]] = None
+    status: Optional[str] = None
+
+
+class VapiWebhookRequest(BaseModel):
+    message: VapiWebhookMessage
+
+
+class CallResultResponse(BaseModel):
+    call_id: str
+    status: Optional[str] = Field(None, description="Dernier statut connu (queued, ringing, in-progress, ended)")
+    ended_reason: Optional[str] = None
+    transcript: Optional[str] = None
+    summary: Optional[str] = None
+    recording_url: Optional[str] = None
+    events_count: int
+    last_event_at: Optional[str] = None
@@ -1,10 +1,15 @@
 import os
 import time
 import logging
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
 from dotenv import load_dotenv
 from vapi import Vapi
 
+from app.config import settings
+from app.database import async_session_maker
+from .assistants import AssistantManager, build_assistant_config
+from .dispatcher import CallDispatcher
+from .phone_numbers import PhoneNumberPool
 from .schema import OutboundCallRequest, OutboundCallResponse
 
 logger = logging.getLogger(__name__)
@@ -24,11 +29,26 @@ class VapiService:
             
         self.client = Vapi(token=api_key)
         self.logger = logger
+
+        # Les appels SDK sont bloquants : ils passent par le dispatcher
+        # (thread, rate limit, retries sur 429)
+        self.dispatcher = CallDispatcher(
+            rate_per_second=settings.VAPI_CALLS_PER_SECOND,
+            burst=settings.VAPI_CALL_BURST,
+            max_concurrency=settings.VAPI_MAX_CONCURRENT_CALLS,
+            max_retries=settings.VAPI_MAX_RETRIES,
+            base_retry_delay=settings.VAPI_RETRY_BASE_DELAY,
+        )
         
-        # Configuration des IDs (tes vraies valeurs)
-        self.phone_number_id = "a8e48b07-00d4-40dc-89bd-25211eaf744b"
-        self.assistant_id = "ad4b6b43-8188-47b5-9c68-aa4905002264"
-        
+        # Numéros sortants : chaque appel prend le meilleur numéro disponible
+        self.phone_numbers = PhoneNumberPool(
+            settings.VAPI_PHONE_NUMBER_IDS,
+            strategy=settings.VAPI_NUMBER_SELECTION,
+            calls_per_minute=settings.VAPI_NUMBER_CALLS_PER_MINUTE,
+            failure_threshold=settings.VAPI_NUMBER_FAILURE_THRESHOLD,
+            quarantine_seconds=settings.VAPI_NUMBER_QUARANTINE_SECONDS,
+        )
+
         # Prompt système pour l'assistant
         self.system_prompt = """
 You are InsightBot, an internal voice assistant.
@@ -44,6 +64,44 @@ Guidelines:
 Here is the Market Overview you must summarise:
 {{market_overview}}
 """
+
+        # Assistant géré : créé puis mis à jour sur Vapi seulement quand sa
+        # config (prompt, modèle, voix) change. VAPI_ASSISTANT_ID force un
+        # assistant existant, utilisé tel quel.
+        self.assistant_config = build_assistant_config(
+            name=settings.VAPI_ASSISTANT_NAME,
+            prompt_template=self.system_prompt,
+            model_provider=settings.VAPI_ASSISTANT_MODEL_PROVIDER,
+            model=settings.VAPI_ASSISTANT_MODEL,
+            voice_provider=settings.VAPI_ASSISTANT_VOICE_PROVIDER,
+            voice_id=settings.VAPI_ASSISTANT_VOICE_ID,
+        )
+        self.assistants = AssistantManager(self.client, self.dispatcher, async_session_maker)
+
+    async def get_assistant_id(self) -> str:
+        """Id de l'assistant à appeler, synchronisé avec Vapi si besoin"""
+        if settings.VAPI_ASSISTANT_ID:
+            return settings.VAPI_ASSISTANT_ID
+        return await self.assistants.ensure(self.assistant_config)
+
+    async def _place_call(self, **call: Any) -> Tuple[Any, str, Dict[str, Any]]:
+        """
+        Crée l'appel sur un numéro du pool. Renvoie l'appel, l'id du numéro
+        et les stats du dispatcher; queue_wait_time compte aussi l'attente
+        d'un numéro libre (number_wait_time).
+        """
+        queued_at = time.monotonic()
+        async with self.phone_numbers.lease() as phone_number:
+            number_wait_time = time.monotonic() - queued_at
+            created, dispatch_stats = await self.dispatcher.dispatch(
+                lambda: self.client.calls.create(phone_number_id=phone_number.id, **call)
+            )
+        stats = {
+            **dispatch_stats,
+            "queue_wait_time": number_wait_time + dispatch_stats["queue_wait_time"],
+            "number_wait_time": number_wait_time,
+        }
+        return created, phone_number.id, stats
     
     async def make_outbound_call(self, request: OutboundCallRequest) -> OutboundCallResponse:
         """
@@ -52,12 +110,14 @@ Here is the Market Overview you must summarise:
         start_time = time.time()
         
         self.logger.info(f"Starting outbound call to {request.target_number}")
+        assistant_id = None
         
         try:
+            assistant_id = await self.get_assistant_id()
+
             # Lancement de l'appel avec les variables dynamiques
-            call = self.client.calls.create(
-                assistant_id=self.assistant_id,
-                phone_number_id=self.phone_number_id,
+            call, phone_number_id, dispatch_stats = await self._place_call(
+                assistant_id=assistant_id,
                 customer={
                     "number": request.target_number,
                 },
@@ -80,15 +140,16 @@ Here is the Market Overview you must summarise:
                 "market_overview_length": len(request.market_overview),
                 "name": request.name,
                 "action_to_take": request.action_to_take,
-                "phone_number_id": self.phone_number_id,
-                "assistant_id": self.assistant_id
+                "phone_number_id": phone_number_id,
+                "assistant_id": assistant_id,
+                **dispatch_stats,
             }
             
             return OutboundCallResponse(
                 success=True,
                 call_id=call.id,
                 message="Appel sortant déclenché avec succès",
-                assistant_id=self.assistant_id,
+                assistant_id=assistant_id,
                 execution_time=execution_time,
                 metadata=metadata
             )
@@ -103,7 +164,7 @@ Here is the Market Overview you must summarise:
                 success=False,
                 call_id=None,
                 message=error_message,
-                assistant_id=self.assistant_id,
+                assistant_id=assistant_id,
                 execution_time=execution_time,
                 metadata={"error": str(error)}
             )
@@ -115,11 +176,13 @@ Here is the Market Overview you must summarise:
         start_time = time.time()
         
         self.logger.info(f"Starting simple outbound call to {target_number}")
+        assistant_id = None
         
         try:
-            call = self.client.calls.create(
-                assistant_id=self.assistant_id,
-                phone_number_id=self.phone_number_id,
+            assistant_id = await self.get_assistant_id()
+
+            call, phone_number_id, dispatch_stats = await self._place_call(
+                assistant_id=assistant_id,
                 customer={
                     "number": target_number,
                 },
@@ -131,16 +194,17 @@ Here is the Market Overview you must summarise:
             
             metadata = {
                 "target_number": target_number,
-                "phone_number_id": self.phone_number_id,
-                "assistant_id": self.assistant_id,
-                "call_type": "simple"
+                "phone_number_id": phone_number_id,
+                "assistant_id": assistant_id,
+                "call_type": "simple",
+                **dispatch_stats,
             }
             
             return OutboundCallResponse(
                 success=True,
                 call_id=call.id,
                 message="Appel simple déclenché avec succès",
-                assistant_id=self.assistant_id,
+                assistant_id=assistant_id,
                 execution_time=execution_time,
                 metadata=metadata
             )
@@ -155,7 +219,7 @@ Here is the Market Overview you must summarise:
                 success=False,
                 call_id=None,
                 message=error_message,
-                assistant_id=self.assistant_id,
+                assistant_id=assistant_id,
                 execution_time=execution_time,
                 metadata={"error": str(error), "call_type": "simple"}
             ) 
\ No newline at end of file
@@ -0,0 +1,220 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import async_session_maker
+from app.models.models import CallEvent
+from .schema import CallResultResponse, VapiWebhookMessage
+
+logger = logging.getLogger(__name__)
+
+# Server messages worth keeping. Partial transcripts and speech/conversation
+# updates are acknowledged but dropped: the end-of-call report repeats them.
+STORED_EVENT_TYPES = {"status-update", "end-of-call-report", "transcript", "hang"}
+
+
+def to_call_event(message: VapiWebhookMessage) -> Optional[Dict[str, Any]]:
+    """Row values for a webhook message, or None if it is not stored."""
+    call_id = (message.call or {}).get("id")
+    if not call_id or message.type not in STORED_EVENT_TYPES:
+        return None
+    payload = message.model_dump(mode="json", exclude_none=True)
+    if message.type == "transcript" and payload.get("transcriptType") != "final":
+        return None
+    payload.pop("call", None)
+    return {
+        "call_id": call_id,
+        "event_type": message.type,
+        "status": message.status or ("ended" if message.type == "end-of-call-report" else None),
+        "payload": payload,
+        "received_at": datetime.utcnow(),
+    }
+
+
+# Longest wait between two attempts to write the same batch
+MAX_RETRY_DELAY = 30.0
+# Attempts left for a batch once the writer is stopping, so shutdown ends
+STOPPING_ATTEMPTS = 3
+
+# Queued by stop() behind the last accepted event
+_STOP = object()
+
+
+class CallEventWriter:
+    """
+    Buffers webhook events in memory and appends them to call_events in
+    batches, so the webhook can acknowledge Vapi without waiting on
+    Postgres. A batch is written once it holds `batch_size` events or
+    `flush_interval` seconds after its first event. When the buffer is full
+    or the writer is stopping, submit raises RuntimeError and Vapi retries
+    the delivery later.
+
+    Acknowledged events are never given up while the process runs: a batch
+    that fails to write is retried with backoff, and the buffer filling up
+    meanwhile turns new deliveries away. Only a batch still failing while
+    the writer stops is dropped (and counted).
+
+    Without a running flush task (before startup or after shutdown) events
+    are written before the delivery is acknowledged.
+    """
+
+    def __init__(
+        self,
+        write_batch: Callable[[List[Dict[str, Any]]], Awaitable[None]],
+        batch_size: int,
+        flush_interval: float,
+        max_queue: int,
+    ):
+        self.write_batch = write_batch
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.logger = logger
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+        self._counters = {"received": 0, "written": 0, "dropped": 0, "batches": 0, "retries": 0}
+
+    def start(self) -> None:
+        if self._task is None:
+            self._stopping.clear()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Stops accepting events and waits for the flush task to write every
+        event already accepted. The task is never cancelled mid-write.
+        """
+        if self._task is None:
+            return
+        self._stopping.set()
+        # Waits for room if the queue is full; the flush task keeps draining it
+        await self.queue.put(_STOP)
+        await self._task
+        self._task = None
+
+    async def submit(self, event: Dict[str, Any]) -> None:
+        if self._task is None:
+            try:
+                await self.write_batch([event])
+            except Exception as e:
+                self.logger.error(f"Failed to write call event: {e}")
+                raise RuntimeError("Could not store the call event, retry later.")
+            self._counters["received"] += 1
+            self._counters["written"] += 1
+            self._counters["batches"] += 1
+            return
+        if self._stopping.is_set():
+            raise RuntimeError("Call event writer is stopping, retry later.")
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            raise RuntimeError("Call event buffer is full, retry later.")
+        self._counters["received"] += 1
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            event = await self.queue.get()
+            if event is _STOP:
+                return
+            batch = [event]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    event = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if event is _STOP:
+                    await self._flush(batch)
+                    return
+                batch.append(event)
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[Dict[str, Any]]) -> None:
+        """Writes the batch, retrying until it is stored or the writer stops."""
+        delay = self.flush_interval
+        attempts_left = STOPPING_ATTEMPTS
+        while True:
+            try:
+                await self.write_batch(batch)
+            except Exception as e:
+                self.logger.error(f"Failed to write {len(batch)} call event(s): {e}")
+                if self._stopping.is_set():
+                    attempts_left -= 1
+                    if attempts_left == 0:
+                        self.logger.error(f"Dropping {len(batch)} acknowledged call event(s) at shutdown")
+                        self._counters["dropped"] += len(batch)
+                        return
+                self._counters["retries"] += 1
+                # Stopping cuts the backoff short
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                if self._stopping.is_set():
+                    await asyncio.sleep(self.flush_interval)
+                delay = min(delay * 2, MAX_RETRY_DELAY)
+                continue
+            self._counters["written"] += len(batch)
+            self._counters["batches"] += 1
+            return
+
+    def stats(self) -> Dict[str, int]:
+        return {**self._counters, "buffered": self.queue.qsize()}
+
+
+async def _insert_call_events(events: List[Dict[str, Any]]) -> None:
+    async with async_session_maker() as session:
+        await session.execute(insert(CallEvent), events)
+        await session.commit()
+
+
+def build_call_result(call_id: str, events: Sequence[CallEvent]) -> CallResultResponse:
+    """Folds a call's events, oldest first, into its latest known state."""
+    result = CallResultResponse(call_id=call_id, events_count=len(events))
+    transcript_lines = []
+    for event in events:
+        payload = event.payload or {}
+        if event.status:
+            result.status = event.status
+        result.ended_reason = payload.get("endedReason", result.ended_reason)
+        if event.event_type == "transcript":
+            transcript_lines.append(f"{payload.get('role', 'unknown')}: {payload.get('transcript', '')}")
+        elif event.event_type == "end-of-call-report":
+            artifact = payload.get("artifact") or {}
+            analysis = payload.get("analysis") or {}
+            result.transcript = artifact.get("transcript") or payload.get("transcript")
+            result.summary = analysis.get("summary") or payload.get("summary")
+            result.recording_url = artifact.get("recordingUrl") or payload.get("recordingUrl")
+        result.last_event_at = event.received_at.isoformat() if event.received_at else None
+    if result.transcript is None and transcript_lines:
+        result.transcript = "\n".join(transcript_lines)
+    return result
+
+
+async def get_call_result(call_id: str, session: AsyncSession) -> Optional[CallResultResponse]:
+    """Returns the call's state from its stored events, or None if none arrived."""
+    result = await session.execute(
+        select(CallEvent).where(CallEvent.call_id == call_id).order_by(CallEvent.id)
+    )
+    events = result.scalars().all()
+    if not events:
+        return None
+    return build_call_result(call_id, events)
+
+
+# --- One-Time Initialization ---
+call_event_writer = CallEventWriter(
+    _insert_call_events,
+    batch_size=settings.CALL_EVENT_BATCH_SIZE,
+    flush_interval=settings.CALL_EVENT_FLUSH_INTERVAL,
+    max_queue=settings.CALL_EVENT_QUEUE_SIZE,
+)
@@ -0,0 +1,68 @@
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+from app.routes.groups import ROUTE_GROUPS
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Dependencies that dominate import time; reported when an entry loads them.
+HEAVY_MODULES = ["anthropic", "smolagents", "litellm", "huggingface_hub", "vapi"]
+
+# Runs in a fresh interpreter, so every measurement is a cold import.
+PROBE = """
+import json, runpy, sys, time
+start = time.perf_counter()
+runpy.run_path(sys.argv[1])
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    "seconds": elapsed,
+    "heavy_modules": [name for name in sys.argv[2:] if name in sys.modules],
+}))
+"""
+
+
+def measure(entry: Path, runs: int) -> dict:
+    samples = []
+    heavy_modules = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE, str(entry), *HEAVY_MODULES],
+            cwd=BACKEND_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        samples.append(result["seconds"])
+        heavy_modules = result["heavy_modules"]
+    return {
+        "median": statistics.median(samples),
+        "max": max(samples),
+        "heavy_modules": heavy_modules,
+    }
+
+
+def benchmark_cold_start(runs: int):
+    """
+    Imports every Vercel entry (api/index.py and one per route group) in a
+    fresh process `runs` times and prints the import time of each.
+    """
+    entries = ["index", *ROUTE_GROUPS]
+    print(f"{'entry':<14}{'median (s)':>12}{'max (s)':>10}  heavy modules loaded")
+    for name in entries:
+        entry = BACKEND_DIR / "api" / f"{name}.py"
+        result = measure(entry, runs)
+        print(
+            f"{name:<14}{result['median']:>12.3f}{result['max']:>10.3f}  "
+            f"{', '.join(result['heavy_modules']) or '-'}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=benchmark_cold_start.__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    benchmark_cold_start(parser.parse_args().runs)
@@ -0,0 +1,44 @@
+import json
+from pathlib import Path
+
+from app.routes.groups import ROUTE_GROUPS
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+API_DIR = BACKEND_DIR / "api"
+VERCEL_CONFIGS = [BACKEND_DIR / "vercel.json", BACKEND_DIR / "vercel.prod.json"]
+
+ENTRY_TEMPLATE = '''# Generated by `python -m commands.build_vercel_entrypoints`. Do not edit.
+from app.factory import create_group_app
+from app.routes.{group} import router
+
+app = create_group_app("{group}", router)
+'''
+
+
+def build_entrypoints():
+    """
+    Writes one ASGI entry per route group to api/<group>.py, serving only
+    the router of app/routes/<group>.py, and points the group's paths at it
+    in the Vercel configs. Everything else still goes to api/index.py.
+    """
+    routes = []
+    for group, definition in ROUTE_GROUPS.items():
+        entry = API_DIR / f"{group}.py"
+        entry.write_text(ENTRY_TEMPLATE.format(group=group))
+        print(f"Wrote api/{entry.name}")
+        # Vercel uses the first matching route, so exclusions come first
+        for prefix in definition["excludes"]:
+            routes.append({"src": f"{prefix}(/.*)?", "dest": "api/index.py"})
+        for prefix in definition["prefixes"]:
+            routes.append({"src": f"{prefix}(/.*)?", "dest": f"api/{group}.py"})
+    routes.append({"src": "/(.*)", "dest": "api/index.py"})
+
+    for config_path in VERCEL_CONFIGS:
+        config = json.loads(config_path.read_text())
+        config["routes"] = routes
+        config_path.write_text(json.dumps(config, indent=2) + "\n")
+        print(f"Updated routes in {config_path.name}")
+
+
+if __name__ == "__main__":
+    build_entrypoints()
@@ -0,0 +1,29 @@
+import json
+
+from commands import build_vercel_entrypoints
+from app.routes.groups import ROUTE_GROUPS
+
+
+def test_build_entrypoints_writes_entries_and_routes(tmp_path, monkeypatch):
+    config_path = tmp_path / "vercel.json"
+    config_path.write_text(json.dumps({"buildCommand": "make", "routes": []}))
+    monkeypatch.setattr(build_vercel_entrypoints, "API_DIR", tmp_path)
+    monkeypatch.setattr(build_vercel_entrypoints, "VERCEL_CONFIGS", [config_path])
+
+    build_vercel_entrypoints.build_entrypoints()
+
+    for group in ROUTE_GROUPS:
+        entry = (tmp_path / f"{group}.py").read_text()
+        assert f"from app.routes.{group} import router" in entry
+        assert f'create_group_app("{group}", router)' in entry
+
+    config = json.loads(config_path.read_text())
+    assert config["buildCommand"] == "make"
+    assert {"src": "/chat/deep-search(/.*)?", "dest": "api/deep_search.py"} in config["routes"]
+    assert config["routes"][-1] == {"src": "/(.*)", "dest": "api/index.py"}
+    campaigns = config["routes"].index(
+        {"src": "/chat/outbound-call/campaigns(/.*)?", "dest": "api/index.py"}
+    )
+    assert campaigns < config["routes"].index(
+        {"src": "/chat/outbound-call(/.*)?", "dest": "api/calls.py"}
+    )
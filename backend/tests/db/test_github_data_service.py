@@ -0,0 +1,272 @@
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.db.github_data_service import (
+    GithubDataService,
+    build_file_rows,
+    build_search_response,
+    indexed_entries_query,
+    repository_renames,
+    repository_row,
+    repository_upsert,
+    search_statements,
+)
+from app.models.models import IndexedFileKind, RepoStatus
+
+REPO_INFO = {"id": 7, "description": "Billing", "default_branch": "main", "stars": 3, "forks": 1, "size": 42}
+
+
+class _RecordingSession:
+    def __init__(self):
+        self.statements = []
+        self.committed = False
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        if statement.is_update:
+            return None
+        names = [
+            value for key, value in statement.compile().params.items() if key.startswith("full_name_m")
+        ]
+        rows = [(name, number) for number, name in enumerate(names)]
+        return SimpleNamespace(tuples=lambda: SimpleNamespace(all=lambda: rows))
+
+    async def commit(self):
+        self.committed = True
+
+
+def test_build_file_rows_flattens_entries_and_units():
+    documentation = [
+        {
+            "path": "app/main.py",
+            "language": "python",
+            "description": "Entry point.",
+            "units": [
+                {"type": "class", "name": "App", "line": 3},
+                {"type": "method", "name": "run", "parent": "App", "line": 7},
+                {"type": "function", "name": ""},
+            ],
+        },
+        {"path": "app/main.py", "units": [{"type": "function", "name": "dup"}]},
+        {"language": "python"},
+    ]
+    markdown = [{"path": "README.md", "content": "# Title"}]
+    config = [{"path": "pyproject.toml", "content": "[project]"}]
+
+    rows = build_file_rows(documentation, markdown, config)
+
+    assert [(row["kind"], row["path"]) for row, _ in rows] == [
+        (IndexedFileKind.DOCUMENTATION, "app/main.py"),
+        (IndexedFileKind.MARKDOWN, "README.md"),
+        (IndexedFileKind.CONFIG, "pyproject.toml"),
+    ]
+    file_row, units = rows[0]
+    assert file_row["description"] == "Entry point."
+    assert [(unit["type"], unit["name"], unit["parent"]) for unit in units] == [
+        ("class", "App", None),
+        ("method", "run", "App"),
+    ]
+    assert rows[1][1] == [] and rows[1][0]["content"] == "# Title"
+
+
+
+def test_indexed_entries_are_built_from_the_tables_in_postgres():
+    statement = indexed_entries_query(
+        "owner/repo", "documentation", path_prefix="src/", limit=20
+    )
+    compiled = statement.compile(dialect=postgresql.dialect())
+    sql = str(compiled)
+
+    assert "jsonb_build_object('path', repository_files.path" in sql
+    assert "jsonb_agg(jsonb_build_object('type', code_units.type" in sql
+    assert "repository_files.path LIKE" in sql and "LIMIT" in sql
+    assert compiled.params["kind_1"] == IndexedFileKind.DOCUMENTATION
+    # "/" is the LIKE escape character, so the prefix is escaped
+    assert compiled.params["path_1"] == "src//"
+
+
+def test_config_files_match_on_file_name():
+    statement = indexed_entries_query("owner/repo", "config", names=["pyproject.toml"])
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+
+    assert "regexp_replace(repository_files.path" in sql
+    assert "code_units" not in sql
+
+
+def test_unknown_section_is_rejected():
+    with pytest.raises(ValueError):
+        indexed_entries_query("owner/repo", "secrets")
+
+
+def test_search_ranks_in_postgres_and_highlights_only_kept_rows():
+    files, units = search_statements("owner/repo", "invoice total", limit=5)
+
+    for statement in (files, units):
+        sql = str(statement.compile(dialect=postgresql.dialect()))
+        select_list, rest = sql.split("FROM", 1)
+        assert "ts_headline" in select_list and "ts_headline" not in rest
+        assert "search_vector @@ websearch_to_tsquery" in rest
+        assert rest.index("LIMIT") < rest.index(") AS anon_1")
+
+def test_search_response_merges_hits_by_score():
+    file_rows = [
+        SimpleNamespace(path="docs/billing.md", kind=IndexedFileKind.MARKDOWN, snippet="<b>Invoice</b>", score=0.4),
+    ]
+    unit_rows = [
+        SimpleNamespace(name="total", type="function", parent=None, line=4, path="src/billing.py", snippet="", score=0.9),
+        SimpleNamespace(name="send", type="method", parent="Invoice", line=12, path="src/billing.py", snippet="Sends it", score=0.2),
+    ]
+
+    response = build_search_response("invoice", file_rows, unit_rows, limit=2)
+
+    assert [hit.get("function", hit["file"]) for hit in response.code_snippets] == [
+        "total",
+        "docs/billing.md",
+    ]
+    assert response.code_snippets[0]["snippet"] is None
+    assert response.source_files == [
+        {"billing.py": "src/billing.py"},
+        {"billing.md": "docs/billing.md"},
+    ]
+
+
+def test_repository_upsert_is_one_statement_keyed_on_full_name():
+    single = str(
+        repository_upsert([repository_row("acme", "billing", REPO_INFO)], RepoStatus.INDEXED)
+        .compile(dialect=postgresql.dialect())
+    )
+    bulk = str(
+        repository_upsert([repository_row("acme", "billing", REPO_INFO)])
+        .compile(dialect=postgresql.dialect())
+    )
+
+    assert "ON CONFLICT (full_name) DO UPDATE SET github_id = excluded.github_id" in single
+    assert "status = excluded.status" in single and "indexed_at = excluded.indexed_at" in single
+    # Registering a repository list keeps the status of repositories already indexed
+    assert "status =" not in bulk.split("DO UPDATE", 1)[1]
+
+
+@pytest.mark.asyncio
+async def test_upsert_repositories_batches_and_dedupes():
+    session = _RecordingSession()
+    repositories = [
+        {"owner": "acme", "repo": f"repo-{number}", **REPO_INFO, "id": number} for number in range(5)
+    ]
+    repositories.append({"owner": "acme", "repo": "repo-0", **REPO_INFO, "id": 0, "stars": 9})
+
+    ids = await GithubDataService().upsert_repositories(repositories, session, batch_size=2)
+
+    # One rename and one upsert statement per batch
+    assert len(session.statements) == 6
+    assert sorted(ids) == [f"acme/repo-{number}" for number in range(5)]
+    assert session.committed
+
+
+@pytest.mark.asyncio
+async def test_file_contents_are_truncated_in_postgres():
+    statements = []
+
+    async def execute(statement):
+        statements.append(statement)
+        return []
+
+    session = SimpleNamespace(execute=execute)
+    await GithubDataService().get_file_contents(
+        "acme", "billing", ["pyproject.toml"], session, max_chars=4800
+    )
+
+    sql = str(statements[0].compile(dialect=postgresql.dialect()))
+    assert "left(repository_files.content, %(left_1)s) AS content" in sql
+
+
+@pytest.mark.asyncio
+async def test_renamed_repositories_are_moved_before_the_upsert():
+    session = _RecordingSession()
+    repositories = [
+        {"owner": "acme", "repo": "billing", **REPO_INFO},
+        # Renamed then transferred: the same GitHub id under a new full name
+        {"owner": "acme-labs", "repo": "invoices", **REPO_INFO},
+        {"owner": "acme", "repo": "web", **REPO_INFO, "id": 8},
+    ]
+
+    ids = await GithubDataService().upsert_repositories(repositories, session)
+
+    renames, upsert = session.statements
+    sql = str(renames.compile(dialect=postgresql.dialect()))
+    assert sql.startswith("UPDATE repositories SET owner=moved.owner, name=moved.name, full_name=moved.full_name")
+    assert "WHERE repositories.github_id = moved.github_id AND repositories.full_name != moved.full_name" in sql
+    params = renames.compile().params
+    assert [params["param_1"], params["param_4"], params["param_5"]] == [7, "acme-labs/invoices", 8]
+    assert sorted(ids) == ["acme-labs/invoices", "acme/web"]
+    assert "excluded.github_id" in str(upsert.compile(dialect=postgresql.dialect()))
+
+
+def test_repositories_without_a_github_id_need_no_rename():
+    row = repository_row("acme", "billing", {**REPO_INFO, "id": None})
+    assert repository_renames([row]) is None
+
+
+@pytest.mark.asyncio
+async def test_saving_a_run_only_writes_changed_and_removed_files():
+    statements = []
+
+    async def execute(statement, parameters=None):
+        statements.append((statement, parameters))
+        sql = str(statement.compile(dialect=postgresql.dialect()))
+        if sql.startswith("DELETE FROM code_units"):
+            return SimpleNamespace(rowcount=3)
+        if sql.startswith("DELETE FROM repository_files"):
+            kinds = [IndexedFileKind.DOCUMENTATION, IndexedFileKind.DOCUMENTATION]
+            return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: kinds))
+        if sql.startswith("INSERT INTO repository_files"):
+            return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: [10]))
+
+    async def commit():
+        pass
+
+    session = SimpleNamespace(execute=execute, commit=commit)
+    repository = SimpleNamespace(
+        id=1, full_name="acme/billing", code_unit_count=20,
+        indexed_data={"summary": {"documentation_files": 5, "markdown_files": 1, "config_files": 2}},
+    )
+    changed = {
+        "documentation": [
+            {"path": "b.py", "blob_sha": "2" * 40, "units": [{"type": "function", "name": "b"}, {"type": "function", "name": "c"}]},
+        ],
+    }
+
+    await GithubDataService().save_indexed_data(repository, changed, ["a.py", "b.py"], session)
+
+    delete_units, delete_files, insert_files, insert_units = statements
+    assert "repository_files.path IN" in str(delete_units[0].compile(dialect=postgresql.dialect()))
+    assert "repository_files.path IN" in str(delete_files[0].compile(dialect=postgresql.dialect()))
+    assert [row["path"] for row in insert_files[1]] == ["b.py"]
+    assert insert_files[1][0]["blob_sha"] == "2" * 40
+    assert [row["file_id"] for row in insert_units[1]] == [10, 10]
+    assert repository.file_count == 7
+    assert repository.code_unit_count == 19
+    assert repository.indexed_data["summary"]["documentation_files"] == 4
+    assert repository.status == RepoStatus.INDEXED
+
+
+@pytest.mark.asyncio
+async def test_an_unchanged_run_writes_no_rows():
+    statements = []
+
+    async def execute(statement, parameters=None):
+        statements.append(statement)
+
+    async def commit():
+        pass
+
+    repository = SimpleNamespace(
+        id=1, full_name="acme/billing", code_unit_count=4, indexed_data={"summary": {"config_files": 2}},
+    )
+    await GithubDataService().save_indexed_data(
+        repository, {}, [], SimpleNamespace(execute=execute, commit=commit)
+    )
+
+    assert statements == []
+    assert repository.file_count == 2 and repository.code_unit_count == 4
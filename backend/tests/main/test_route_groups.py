@@ -0,0 +1,62 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from app.factory import create_group_app
+from app.main import app
+from app.routes import agent
+from app.routes.groups import ROUTE_GROUPS, matches_group
+
+
+def test_matches_group_on_whole_path_segments():
+    assert matches_group("/chat/deep-search", "deep_search")
+    assert matches_group("/chat/deep-search/jobs", "deep_search")
+    assert not matches_group("/chat/deep-searching", "deep_search")
+    assert matches_group("/chat/outbound-call/numbers", "calls")
+    assert not matches_group("/chat/outbound-call/campaigns/1/cancel", "calls")
+
+
+def test_group_app_mounts_only_its_routes():
+    group_app = create_group_app("agent", agent.router)
+
+    paths = {route.path for route in group_app.routes if route.path.startswith("/chat")}
+
+    assert paths == {"/chat/agent"}
+
+
+def test_each_group_router_serves_exactly_its_paths():
+    for group in ROUTE_GROUPS:
+        module = __import__(f"app.routes.{group}", fromlist=["router"])
+        paths = {route.path for route in module.router.routes}
+        assert paths and all(matches_group(path, group) for path in paths), group
+
+    ungrouped = [
+        route.path
+        for route in app.routes
+        if route.path.startswith("/chat") and not any(matches_group(route.path, group) for group in ROUTE_GROUPS)
+    ]
+    assert all(
+        path.startswith((
+            "/chat/repositories", "/chat/database", "/chat/services",
+            "/chat/outbound-call/webhook", "/chat/outbound-call/campaigns",
+        ))
+        for path in ungrouped
+    )
+
+
+def test_group_entry_does_not_import_the_other_routes():
+    # A fresh interpreter, since this one has already imported every route.
+    probe = (
+        "import json, sys, app.factory, app.routes.agent;"
+        "print(json.dumps(sorted(name for name in sys.modules if name.startswith(('app.routes', 'app.main', 'app.database')))))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", probe],
+        cwd=Path(__file__).resolve().parents[2],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+
+    assert json.loads(output.strip().splitlines()[-1]) == ["app.routes", "app.routes.agent", "app.routes.groups"]
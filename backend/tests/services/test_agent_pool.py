@@ -0,0 +1,130 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.services.agent.agent_pool import AgentPool, AgentPoolExhaustedError
+
+
+def make_pool(size=1, max_waiters=1, wait_timeout=None):
+    created = []
+
+    def factory():
+        agent = object()
+        created.append(agent)
+        return agent
+
+    pool = AgentPool(factory, size=size, max_waiters=max_waiters, wait_timeout=wait_timeout, reset=lambda agent: None)
+    return pool, created
+
+
+@pytest.mark.asyncio
+async def test_agents_are_created_lazily_and_reused():
+    pool, created = make_pool(size=2)
+
+    lease = await pool.acquire()
+    lease.release()
+    lease = await pool.acquire()
+
+    assert len(created) == 1
+    assert lease.agent is created[0]
+    assert pool.stats()["in_use"] == 1
+
+
+@pytest.mark.asyncio
+async def test_waiter_receives_released_agent():
+    pool, created = make_pool(size=1, max_waiters=1)
+    first = await pool.acquire()
+
+    waiter = asyncio.create_task(pool.acquire())
+    await asyncio.sleep(0)
+    assert pool.stats()["queue_depth"] == 1
+
+    first.release()
+    second = await waiter
+
+    assert second.agent is first.agent
+    assert second.wait_time > 0
+    assert pool.stats()["queue_depth"] == 0
+
+
+@pytest.mark.asyncio
+async def test_full_queue_is_rejected_with_retry_after():
+    pool, _ = make_pool(size=1, max_waiters=1)
+    await pool.acquire()
+    waiter = asyncio.create_task(pool.acquire())
+    await asyncio.sleep(0)
+
+    with pytest.raises(AgentPoolExhaustedError) as exc_info:
+        await pool.acquire()
+
+    assert exc_info.value.retry_after >= 1
+    assert pool.stats()["rejected"] == 1
+    waiter.cancel()
+
+
+@pytest.mark.asyncio
+async def test_wait_timeout_rejects_and_failed_checkout_discards_agent():
+    pool, created = make_pool(size=1, max_waiters=1, wait_timeout=0.01)
+    lease = await pool.acquire()
+
+    with pytest.raises(AgentPoolExhaustedError):
+        await pool.acquire()
+
+    lease.release()
+    with pytest.raises(RuntimeError):
+        async with pool.checkout():
+            raise RuntimeError("agent crashed")
+
+    lease = await pool.acquire()
+    assert lease.agent is created[1]
+
+
+
+@pytest.mark.asyncio
+async def test_discarded_agent_is_replaced_for_the_waiter_or_fails_it():
+    pool, created = make_pool(size=1, max_waiters=1)
+    lease = await pool.acquire()
+    waiter = asyncio.create_task(pool.acquire())
+    await asyncio.sleep(0)
+
+    lease.release(discard=True)
+    lease = await waiter
+    assert lease.agent is created[1]
+
+    def broken_factory():
+        raise RuntimeError("model unavailable")
+
+    pool.factory = broken_factory
+    waiter = asyncio.create_task(pool.acquire())
+    await asyncio.sleep(0)
+    lease.release(discard=True)
+
+    with pytest.raises(RuntimeError, match="model unavailable"):
+        await asyncio.wait_for(waiter, 1)
+    assert pool.stats()["created"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_run_keeps_its_slot_until_the_thread_finishes():
+    pool, created = make_pool(size=1, max_waiters=1)
+    finish = threading.Event()
+
+    async def run():
+        async with pool.checkout() as lease:
+            await lease.run(finish.wait)
+
+    task = asyncio.create_task(run())
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    waiter = asyncio.create_task(pool.acquire())
+    await asyncio.sleep(0.01)
+    assert not waiter.done()
+    assert pool.stats()["created"] == 1
+
+    finish.set()
+    lease = await asyncio.wait_for(waiter, 1)
+    assert lease.agent is created[1]
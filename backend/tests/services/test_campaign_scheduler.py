@@ -0,0 +1,135 @@
+import uuid
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.config import settings
+from app.models.models import CallCampaign, CampaignCall, CampaignCallStatus, CampaignStatus
+from app.services.campaigns.service import STALE_CALL_ERROR, CampaignScheduler
+from app.services.vapi.phone_numbers import PhoneNumberPool
+
+
+@pytest_asyncio.fixture
+async def session_maker():
+    """Campaign tables in the test database, created and dropped around each test."""
+    if not settings.TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    engine = create_async_engine(settings.TEST_DATABASE_URL)
+    tables = [CallCampaign.__table__, CampaignCall.__table__]
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda sync_conn: CallCampaign.metadata.create_all(sync_conn, tables=tables))
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(lambda sync_conn: CallCampaign.metadata.drop_all(sync_conn, tables=tables))
+    await engine.dispose()
+
+
+class _FakeVapiService:
+    def __init__(self, numbers=1, calls_per_minute=10.0):
+        self.phone_numbers = PhoneNumberPool(
+            [f"number-{index}" for index in range(numbers)],
+            strategy="lru",
+            calls_per_minute=calls_per_minute,
+            failure_threshold=3,
+            quarantine_seconds=300,
+        )
+        self.placed = []
+
+    async def make_outbound_call(self, request):
+        self.placed.append(request.target_number)
+        return SimpleNamespace(success=True, call_id=f"call-{len(self.placed)}", message="Placed")
+
+
+def _request(number):
+    return {
+        "target_number": number, "market_overview": "Overview", "name": "Jane", "action_to_take": "Call back",
+    }
+
+
+async def _campaign(session, count, calls_per_minute=60, **call_fields):
+    campaign = CallCampaign(
+        id=uuid.uuid4(), status=CampaignStatus.RUNNING, calls_per_minute=calls_per_minute,
+        duplicates_skipped=0, timezone="UTC",
+    )
+    session.add(campaign)
+    await session.flush()
+    calls = [
+        CampaignCall(
+            id=uuid.uuid4(), campaign_id=campaign.id, position=position,
+            target_number=f"+3361100{position:04d}", request=_request(f"+3361100{position:04d}"),
+            status=CampaignCallStatus.PENDING, **call_fields,
+        )
+        for position in range(count)
+    ]
+    session.add_all(calls)
+    await session.commit()
+    return campaign, calls
+
+
+def _scheduler(session_maker, vapi_service, poll_interval=60.0):
+    async def get_vapi_service():
+        return vapi_service
+
+    return CampaignScheduler(
+        session_maker, get_vapi_service, poll_interval=poll_interval, stale_call_timeout=600
+    )
+
+
+async def _calls(session_maker, campaign_id):
+    async with session_maker() as session:
+        result = await session.execute(
+            select(CampaignCall).where(CampaignCall.campaign_id == campaign_id).order_by(CampaignCall.position)
+        )
+        return result.scalars().all()
+
+
+@pytest.mark.asyncio
+async def test_claims_are_capped_at_what_the_numbers_can_place(session_maker):
+    async with session_maker() as session:
+        campaign, _ = await _campaign(session, 30, calls_per_minute=60)
+    vapi_service = _FakeVapiService(numbers=1, calls_per_minute=10.0)
+    scheduler = _scheduler(session_maker, vapi_service)
+
+    assert await scheduler.tick() == 10
+    # The minute's pool budget is spent, whatever the campaign allows
+    assert await scheduler.tick() == 0
+
+    calls = await _calls(session_maker, campaign.id)
+    placed = [call for call in calls if call.status == CampaignCallStatus.SUCCEEDED]
+    assert [call.position for call in placed] == list(range(10))
+    assert all(call.claimed_at and call.dispatched_at >= call.claimed_at and call.call_id for call in placed)
+    assert sum(call.status == CampaignCallStatus.PENDING for call in calls) == 20
+    assert all(call.claimed_at is None and call.dispatched_at is None for call in calls[10:])
+
+
+@pytest.mark.asyncio
+async def test_stale_calls_fail_but_a_late_result_is_kept(session_maker):
+    now = datetime.utcnow()
+    async with session_maker() as session:
+        stale_campaign, (stale,) = await _campaign(
+            session, 1, status=CampaignCallStatus.IN_PROGRESS, claimed_at=now - timedelta(hours=1)
+        )
+        recent_campaign, (recent,) = await _campaign(
+            session, 1, status=CampaignCallStatus.IN_PROGRESS, claimed_at=now
+        )
+    vapi_service = _FakeVapiService()
+    scheduler = _scheduler(session_maker, vapi_service)
+
+    assert await scheduler.tick() == 0
+
+    (stale_call,) = await _calls(session_maker, stale_campaign.id)
+    (recent_call,) = await _calls(session_maker, recent_campaign.id)
+    assert stale_call.status == CampaignCallStatus.FAILED
+    assert stale_call.error == STALE_CALL_ERROR
+    assert recent_call.status == CampaignCallStatus.IN_PROGRESS
+
+    # The worker that claimed the stale call placed it after all
+    await scheduler._place_call(vapi_service, stale.id, stale.request)
+    (stale_call,) = await _calls(session_maker, stale_campaign.id)
+    assert stale_call.status == CampaignCallStatus.SUCCEEDED
+    assert stale_call.call_id == "call-1"
+    assert stale_call.dispatched_at is not None
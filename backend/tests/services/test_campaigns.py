@@ -0,0 +1,30 @@
+from app.services.campaigns.service import dedupe_calls, in_quiet_hours, normalize_number
+from app.services.vapi.schema import OutboundCallRequest
+
+
+def _call(number, name="Jane"):
+    return OutboundCallRequest(
+        target_number=number, market_overview="Overview", name=name, action_to_take="Call back"
+    )
+
+
+def test_calls_are_deduplicated_by_normalized_number():
+    calls = [_call("+33 6 11-42 13 34", "first"), _call("+33611421334", "second"), _call("+441234")]
+
+    unique, duplicates = dedupe_calls(calls)
+
+    assert duplicates == 1
+    assert [(call.target_number, call.name) for call in unique] == [
+        ("+33611421334", "first"),
+        ("+441234", "Jane"),
+    ]
+    assert normalize_number("+1 (415) 555.0100") == "+14155550100"
+
+
+def test_quiet_hours_may_wrap_past_midnight():
+    assert not in_quiet_hours(None, None, 3)
+    assert in_quiet_hours(12, 14, 13)
+    assert not in_quiet_hours(12, 14, 14)
+    assert in_quiet_hours(21, 8, 23)
+    assert in_quiet_hours(21, 8, 7)
+    assert not in_quiet_hours(21, 8, 8)
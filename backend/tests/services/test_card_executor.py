@@ -0,0 +1,122 @@
+import asyncio
+import time
+
+import pytest
+
+from app.services.agent.card_executor import CardGraphExecutor, plan_levels
+from app.services.github.schema import (
+    AgentResponse,
+    CardExecutionRequest,
+    NewCardData,
+)
+from app.services.vapi.schema import OutboundCallResponse
+
+
+def make_card(card_id, task_type="research_task", dependencies=None):
+    return NewCardData(
+        card_id=card_id,
+        title=f"Title {card_id}",
+        description=f"Description {card_id}",
+        task_type=task_type,
+        dependencies=dependencies or [],
+    )
+
+
+def make_executor(mocker, research_delay=0.0):
+    async def research_runner(agent_request):
+        await asyncio.sleep(research_delay)
+        return AgentResponse(
+            response=f"research for {agent_request.prompt}",
+            agent_id="deep-search",
+            execution_time=research_delay,
+        )
+
+    vapi_service = mocker.Mock()
+    vapi_service.make_outbound_call = mocker.AsyncMock(
+        return_value=OutboundCallResponse(
+            success=True, call_id="call-1", message="ok", execution_time=0.0
+        )
+    )
+    get_vapi_service = mocker.AsyncMock(return_value=vapi_service)
+    return CardGraphExecutor(research_runner, get_vapi_service, mocker.Mock()), vapi_service
+
+
+def test_plan_levels_groups_independent_cards():
+    cards = [
+        make_card("task-1"),
+        make_card("task-2"),
+        make_card("task-3", "phone_task", ["task-1", "task-2"]),
+    ]
+
+    levels = plan_levels(cards)
+
+    assert [[card.card_id for card in level] for level in levels] == [
+        ["task-1", "task-2"],
+        ["task-3"],
+    ]
+
+
+@pytest.mark.parametrize(
+    "cards",
+    [
+        [make_card("task-1", dependencies=["task-9"])],
+        [make_card("task-1", dependencies=["task-2"]), make_card("task-2", dependencies=["task-1"])],
+    ],
+)
+def test_plan_levels_rejects_invalid_graphs(cards):
+    with pytest.raises(ValueError):
+        plan_levels(cards)
+
+
+@pytest.mark.asyncio
+async def test_independent_cards_run_concurrently(mocker):
+    executor, _ = make_executor(mocker, research_delay=0.2)
+    request = CardExecutionRequest(cards=[make_card(f"task-{i}") for i in range(3)])
+
+    start = time.monotonic()
+    response = await executor.execute(request)
+
+    assert time.monotonic() - start < 0.5
+    assert response.level_count == 1
+    assert all(result.status == "done" for result in response.results)
+
+
+@pytest.mark.asyncio
+async def test_phone_card_receives_research_and_skips_on_failure(mocker):
+    executor, vapi_service = make_executor(mocker)
+    request = CardExecutionRequest(
+        cards=[make_card("task-1"), make_card("task-2", "phone_task", ["task-1"])],
+        target_number="+33600000000",
+        contact_name="Jane",
+    )
+
+    response = await executor.execute(request)
+
+    call_request = vapi_service.make_outbound_call.call_args.args[0]
+    assert call_request.market_overview == "research for Title task-1 - Description task-1"
+    assert [result.status for result in response.results] == ["done", "done"]
+
+    executor.research_runner = mocker.AsyncMock(side_effect=RuntimeError("boom"))
+    response = await executor.execute(request)
+
+    assert [result.status for result in response.results] == ["failed", "skipped"]
+
+
+@pytest.mark.asyncio
+async def test_vapi_is_only_resolved_for_phone_cards(mocker):
+    executor, _ = make_executor(mocker)
+    executor.get_vapi_service.side_effect = RuntimeError("VAPI_API_KEY not set")
+
+    response = await executor.execute(CardExecutionRequest(cards=[make_card("task-1")]))
+    assert [result.status for result in response.results] == ["done"]
+    executor.get_vapi_service.assert_not_called()
+
+    response = await executor.execute(
+        CardExecutionRequest(
+            cards=[make_card("task-1", task_type="phone_task")],
+            target_number="+33611421334",
+            contact_name="Ada",
+        )
+    )
+    assert response.results[0].status == "failed"
+    assert "VAPI_API_KEY" in response.results[0].error
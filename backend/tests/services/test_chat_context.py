@@ -0,0 +1,62 @@
+from app.services.chat.context import ContextPacker, count_tokens, render_hit, summarize_config
+
+PYPROJECT = "\n".join(
+    ["[project]", 'name = "billing"', "dependencies = ["]
+    + [f'    "package-{number}>=1.0",' for number in range(200)]
+    + ["]", "", "[tool.ruff]", "line-length = 100"]
+)
+
+
+def _unit(name, score, snippet, file="src/billing.py"):
+    return {
+        "function": name, "type": "function", "parent": None, "file": file,
+        "line": 1, "snippet": snippet, "score": score,
+    }
+
+
+def test_count_tokens_estimates_words_and_symbols():
+    assert count_tokens("") == 0
+    assert count_tokens("send invoice") == 3
+    assert count_tokens("def total(items):\n    return 42") == 11
+    assert count_tokens("a " * 1000) == 1000
+
+
+def test_large_config_files_are_summarized():
+    summary = summarize_config("pyproject.toml", PYPROJECT, max_tokens=100)
+
+    assert summary.splitlines()[1:] == [
+        "[project]", 'name = "billing"', "dependencies = [", "[tool.ruff]", "line-length = 100",
+    ]
+    assert count_tokens(summary) <= 100
+
+    packed = ContextPacker(budget=1000, block_tokens=100).pack(
+        [{"file": "pyproject.toml", "kind": "config", "snippet": "[project]", "score": 1.0}],
+        {"pyproject.toml": PYPROJECT},
+    )
+    assert "package-199" not in packed["context"]
+    assert packed["context"].startswith("config pyproject.toml\nSummary of pyproject.toml, top-level")
+
+
+def test_packs_best_hits_under_budget_and_skips_duplicates():
+    hits = [
+        _unit("long", 0.9, "word " * 200),
+        _unit("total", 0.8, "Sums the items."),
+        _unit("total", 0.7, "Sums the items."),
+        {"file": "README.md", "kind": "markdown", "snippet": "Billing", "score": 0.5},
+    ]
+
+    packed = ContextPacker(budget=60, block_tokens=600).pack(
+        hits, {"README.md": "# Billing\n\nHow it works."}
+    )
+
+    assert [hit.get("function", hit["file"]) for hit in packed["hits"]] == ["total", "README.md"]
+    assert packed["tokens_used"] == count_tokens(packed["context"]) + 1 <= 60
+    assert packed["tokens_dropped"] == count_tokens("function long (src/billing.py:1)\n" + "word " * 200) + 1
+
+
+def test_units_without_a_line_render_without_it():
+    hit = _unit("total", 0.8, "Sums the items.")
+    assert render_hit(hit, None, 600).startswith("function total (src/billing.py:1)\n")
+
+    hit["line"] = None
+    assert render_hit(hit, None, 600).startswith("function total (src/billing.py)\n")
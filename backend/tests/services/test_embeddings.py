@@ -0,0 +1,103 @@
+import numpy as np
+
+from app.services.embeddings import embedder as embedder_module
+from app.services.embeddings.embedder import HashingEmbedder, create_embedder
+from app.services.embeddings.index import EmbeddingIndexStore, VectorIndex
+
+
+class _FixedEmbedder:
+    name = "fixed"
+
+    def __init__(self, vectors):
+        self.vectors = vectors
+        self.dimension = vectors.shape[1]
+
+    def embed(self, texts):
+        return self.vectors[: len(texts)]
+
+
+def _store(tmp_path, shard_rows=2, max_open=4):
+    return EmbeddingIndexStore(
+        str(tmp_path), lambda: HashingEmbedder(256), shard_rows=shard_rows, max_open=max_open
+    )
+
+
+def test_hashing_embedder_matches_identifier_words():
+    embedder = HashingEmbedder(256)
+    query, near, far = embedder.embed(
+        ["outbound calls", "make_outbound_call", "render the invoice template"]
+    )
+
+    assert query.dtype == np.float32
+    assert np.isclose(np.linalg.norm(query), 1.0)
+    assert query @ near > query @ far
+
+
+def test_search_merges_top_k_across_shards(tmp_path):
+    store = _store(tmp_path)
+    texts = [
+        "send invoice email",
+        "parse yaml config",
+        "outbound phone call",
+        "invoice totals",
+        "retry webhook delivery",
+    ]
+    items = [{"file": f"src/{number}.py", "kind": "documentation"} for number in range(len(texts))]
+    store.build("acme/billing", items, texts)
+
+    index = VectorIndex(tmp_path / "acme__billing")
+    assert [len(shard) for shard in index.shards] == [2, 2, 1]
+
+    hits = store.search("acme/billing", "invoice", k=2)
+    assert [hit["file"] for hit in hits] == ["src/3.py", "src/0.py"]
+    assert hits[0]["score"] >= hits[1]["score"]
+
+
+def test_batched_top_k_equals_brute_force(tmp_path):
+    vectors = np.random.default_rng(0).normal(size=(50, 8)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    store = EmbeddingIndexStore(
+        str(tmp_path), lambda: _FixedEmbedder(vectors), shard_rows=7, max_open=1
+    )
+    store.build("acme/api", [{"row": row} for row in range(50)], ["x"] * 50)
+
+    queries = vectors[:3]
+    found = VectorIndex(tmp_path / "acme__api").top_k(queries, 5)
+
+    expected = np.argsort(-(queries @ vectors.T), axis=1)[:, :5]
+    assert [[row for _, row in hits] for hits in found] == expected.tolist()
+
+
+def test_missing_stale_and_evicted_indexes(tmp_path):
+    store = _store(tmp_path, max_open=1)
+    assert store.search("acme/none", "invoice", k=3) is None
+
+    store.build("acme/a", [{"file": "a.py"}], ["invoice"])
+    store.build("acme/b", [{"file": "b.py"}], ["invoice"])
+    assert store.search("acme/a", "invoice", k=3)[0]["file"] == "a.py"
+    assert store.search("acme/b", "invoice", k=3)[0]["file"] == "b.py"
+    assert list(store._open) == ["acme/b"]
+
+    store.build("acme/empty", [], [])
+    assert store.search("acme/empty", "invoice", k=3) == []
+
+    other = EmbeddingIndexStore(str(tmp_path), lambda: HashingEmbedder(128), shard_rows=2, max_open=1)
+    assert other.search("acme/a", "invoice", k=3) is None
+
+
+def test_fastembed_is_the_default_with_an_offline_fallback(monkeypatch):
+    loaded = []
+
+    class Model:
+        def __init__(self, model_name, cache_dir):
+            loaded.append(model_name)
+
+    monkeypatch.setattr(embedder_module, "FastEmbedEmbedder", Model)
+    assert isinstance(create_embedder(), Model)
+    assert loaded == ["BAAI/bge-small-en-v1.5"]
+
+    def unavailable(model_name, cache_dir):
+        raise OSError("model download failed")
+
+    monkeypatch.setattr(embedder_module, "FastEmbedEmbedder", unavailable)
+    assert isinstance(create_embedder(), HashingEmbedder)
@@ -0,0 +1,49 @@
+import os
+
+import pytest
+
+from app.services.agent.image_cache import ImageCache, make_image_key
+
+
+def test_image_key_depends_on_prompt_model_and_parameters():
+    key = make_image_key("a red fox", "model-a", {"format": "PNG"})
+
+    assert key == make_image_key("a red fox", "model-a", {"format": "PNG"})
+    assert key != make_image_key("a red fox", "model-b", {"format": "PNG"})
+    assert key != make_image_key("a red fox", "model-a", {"format": "PNG", "width": 256})
+    assert make_image_key("a red fox", "model-a", {"format": "WEBP"}).endswith(".webp")
+
+
+def test_put_and_get_round_trip(tmp_path):
+    cache = ImageCache(str(tmp_path), max_bytes=1024)
+    key = make_image_key("a red fox", "model-a", {"format": "PNG"})
+
+    assert cache.get(key) is None
+    cache.put(key, b"image-bytes")
+
+    assert cache.get(key).read_bytes() == b"image-bytes"
+    assert cache.total_bytes == len(b"image-bytes")
+
+
+def test_least_recently_used_images_are_evicted(tmp_path):
+    cache = ImageCache(str(tmp_path), max_bytes=25)
+    keys = [make_image_key(f"prompt {i}", "model-a", {"format": "PNG"}) for i in range(3)]
+    cache.put(keys[0], b"x" * 10)
+    cache.put(keys[1], b"x" * 10)
+    os.utime(cache.path_for(keys[0]), (1, 1))
+    os.utime(cache.path_for(keys[1]), (2, 2))
+
+    cache.put(keys[2], b"x" * 10)
+
+    assert cache.get(keys[0]) is None
+    assert cache.get(keys[1]) is not None
+    assert cache.total_bytes == 20
+
+
+def test_invalid_keys_are_rejected(tmp_path):
+    cache = ImageCache(str(tmp_path), max_bytes=1024)
+
+    with pytest.raises(ValueError):
+        cache.get("../../etc/passwd")
+    with pytest.raises(ValueError):
+        cache.get("a" * 64 + ".exe")
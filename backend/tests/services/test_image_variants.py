@@ -0,0 +1,28 @@
+import io
+
+import pytest
+from PIL import Image
+
+from app.services.agent.image_variants import render_variant
+
+
+def _png(width, height):
+    buffered = io.BytesIO()
+    Image.new("RGBA", (width, height), (200, 30, 30, 255)).save(buffered, format="PNG")
+    return buffered.getvalue()
+
+
+@pytest.mark.parametrize("image_format", ["PNG", "WEBP", "JPEG"])
+def test_variant_is_downscaled_and_reencoded(image_format):
+    data = render_variant(_png(1024, 512), image_format, 256)
+
+    with Image.open(io.BytesIO(data)) as image:
+        assert image.format == image_format
+        assert image.size == (256, 128)
+
+
+def test_variant_is_never_upscaled():
+    data = render_variant(_png(100, 50), "WEBP", 512)
+
+    with Image.open(io.BytesIO(data)) as image:
+        assert image.size == (100, 50)
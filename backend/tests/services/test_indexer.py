@@ -0,0 +1,165 @@
+import multiprocessing
+import subprocess
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from app.models.models import RepoStatus
+from app.services.indexer.extractors import classify, jsdoc_units, python_units
+from app.services.indexer.service import IndexerService, parse_ls_files, plan_indexing
+
+PYTHON_SOURCE = '''"""Billing helpers."""
+
+
+def total(items):
+    """Sums the items."""
+    return sum(items)
+
+
+class Invoice:
+    """An invoice."""
+
+    async def send(self):
+        """Sends it."""
+'''
+
+
+def _repository(tmp_path, files):
+    for path, content in files.items():
+        target = tmp_path / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(content)
+    subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True)
+    subprocess.run(["git", "add", "-A"], cwd=tmp_path, check=True)
+    return tmp_path
+
+
+def test_classify_sections_and_skips():
+    assert classify("src/billing.py") == ("documentation", "python")
+    assert classify("web/app.tsx") == ("documentation", "typescript")
+    assert classify("docs/intro.md") == ("documentation_md", "markdown")
+    assert classify("backend/pyproject.toml") == ("config", "toml")
+    assert classify("requirements-dev.txt") == ("config", "text")
+    assert classify("node_modules/lib/index.js") is None
+    assert classify("package-lock.json") is None
+    assert classify("logo.png") is None
+
+
+def test_python_and_jsdoc_units():
+    description, units = python_units(PYTHON_SOURCE)
+
+    assert description == "Billing helpers."
+    assert [(unit["type"], unit["name"], unit["parent"]) for unit in units] == [
+        ("function", "total", None),
+        ("class", "Invoice", None),
+        ("method", "send", "Invoice"),
+    ]
+
+    units = jsdoc_units("/**\n * Adds two numbers.\n */\nexport function add(a, b) {}\n")
+    assert units == [
+        {"type": "function", "name": "add", "parent": None, "description": "Adds two numbers.", "line": 4}
+    ]
+
+
+def test_unchanged_blobs_are_reused():
+    blobs = {"a.py": "1" * 40, "b.py": "2" * 40, "notes.txt": "3" * 40}
+    stored = {"a.py": ("documentation", "1" * 40), "b.py": ("documentation", "0" * 40)}
+
+    unchanged, tasks = plan_indexing(blobs, stored)
+
+    assert unchanged == ["a.py"]
+    assert [task[0] for task in tasks] == ["b.py"]
+
+
+def test_parse_ls_files_skips_submodules():
+    output = (
+        "100644 " + "a" * 40 + " 0\tsrc/app.py\0"
+        "160000 " + "b" * 40 + " 0\tvendor/lib\0"
+    )
+
+    assert parse_ls_files(output) == {"src/app.py": "a" * 40}
+
+
+@pytest.mark.asyncio
+async def test_index_checkout_extracts_in_worker_processes(tmp_path):
+    root = _repository(
+        tmp_path,
+        {
+            "billing.py": PYTHON_SOURCE,
+            "README.md": "# Billing\n\nHow it works.",
+            "pyproject.toml": "[project]\nname = 'billing'\n",
+            "image.png": "not indexed",
+        },
+    )
+    executor = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+    try:
+        indexer = IndexerService(checkout_dir=str(tmp_path), executor=executor, workers=1)
+        sections, stale_paths, stats = await indexer.index_checkout(root, {})
+    finally:
+        executor.shutdown()
+
+    assert stats == {"files_indexed": 3, "files_reused": 0, "files_removed": 0}
+    assert stale_paths == []
+    assert [unit["name"] for unit in sections["documentation"][0]["units"]] == [
+        "total", "Invoice", "send",
+    ]
+    assert sections["documentation_md"][0]["description"] == "Billing"
+    assert "section" not in sections["config"][0]
+    assert len(sections["config"][0]["blob_sha"]) == 40
+
+
+@pytest.mark.asyncio
+async def test_reindexing_only_extracts_changed_files(tmp_path):
+    root = _repository(tmp_path, {"a.py": "def a():\n    pass\n", "b.py": "def b():\n    pass\n"})
+    indexer = IndexerService(checkout_dir=str(tmp_path), executor=ThreadPoolExecutor(2), workers=2)
+    sections, _, _ = await indexer.index_checkout(root, {})
+    stored = {entry["path"]: ("documentation", entry["blob_sha"]) for entry in sections["documentation"]}
+
+    (root / "b.py").write_text("def b2():\n    pass\n")
+    (root / "a.py").rename(root / "c.py")
+    subprocess.run(["git", "add", "-A"], cwd=root, check=True)
+    sections, stale_paths, stats = await indexer.index_checkout(root, stored)
+
+    assert stats == {"files_indexed": 2, "files_reused": 0, "files_removed": 1}
+    assert [entry["path"] for entry in sections["documentation"]] == ["b.py", "c.py"]
+    assert stale_paths == ["a.py", "b.py"]
+
+    (root / "d.py").write_text("")
+    subprocess.run(["git", "add", "-A"], cwd=root, check=True)
+    stored = {entry["path"]: ("documentation", entry["blob_sha"]) for entry in sections["documentation"]}
+    sections, stale_paths, stats = await indexer.index_checkout(root, stored)
+
+    assert stats == {"files_indexed": 1, "files_reused": 2, "files_removed": 0}
+    # Only the new file is written; unchanged files are left as stored
+    assert [entry["path"] for entry in sections["documentation"]] == ["d.py"]
+    assert stale_paths == []
+
+
+@pytest.mark.asyncio
+async def test_failed_run_rolls_back_before_marking_failed(tmp_path, monkeypatch):
+    calls = []
+    repository = SimpleNamespace(status=None)
+
+    class Session:
+        async def rollback(self):
+            calls.append("rollback")
+
+        async def commit(self):
+            calls.append(("commit", repository.status))
+
+    async def create_or_update_repository(*args):
+        return repository
+
+    async def checkout(owner, repo):
+        raise RuntimeError("save failed")
+
+    monkeypatch.setattr("app.services.indexer.service.fetch_repository_info", lambda owner, repo: {})
+    indexer = IndexerService(checkout_dir=str(tmp_path), executor=ThreadPoolExecutor(1), workers=1)
+    monkeypatch.setattr(indexer.github_data_service, "create_or_update_repository", create_or_update_repository)
+    monkeypatch.setattr(indexer, "checkout", checkout)
+
+    with pytest.raises(RuntimeError, match="save failed"):
+        await indexer.save_indexed_data_to_db("acme", "billing", Session())
+
+    assert calls == ["rollback", ("commit", RepoStatus.FAILED)]
@@ -0,0 +1,122 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from pydantic import BaseModel
+from sqlalchemy.dialects import postgresql
+
+from app.models.models import AgentJob, JobKind, JobStatus
+from app.services.jobs.service import (
+    STALE_JOB_ERROR,
+    JobFailedError,
+    JobService,
+    stale_jobs_update,
+)
+
+
+class _Result(BaseModel):
+    answer: str
+
+
+class _UpdateLog:
+    """Session maker whose sessions record the values of each UPDATE."""
+
+    def __init__(self):
+        self.updates = []
+
+    def __call__(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def execute(self, statement):
+        params = statement.compile().params
+        self.updates.append({key: value for key, value in params.items() if key != "id_1"})
+
+    async def commit(self):
+        pass
+
+
+async def _run(runner, timeout=5.0):
+    log = _UpdateLog()
+    await JobService(session_maker=log, timeout=timeout).run_job(uuid.uuid4(), runner)
+    return log.updates
+
+
+@pytest.mark.asyncio
+async def test_job_runs_then_records_its_result():
+    async def runner():
+        return _Result(answer="42")
+
+    running, finished = await _run(runner)
+
+    assert running["status"] == JobStatus.RUNNING and running["started_at"]
+    assert finished["status"] == JobStatus.SUCCEEDED
+    assert finished["result"] == {"answer": "42"}
+    assert finished["finished_at"] >= running["started_at"]
+
+
+@pytest.mark.asyncio
+async def test_job_errors_and_timeouts_fail_the_job():
+    async def failing():
+        raise JobFailedError("No results found.")
+
+    async def hanging():
+        await asyncio.sleep(10)
+
+    _, failed = await _run(failing)
+    assert failed["status"] == JobStatus.FAILED
+    assert failed["error"] == "No results found."
+
+    _, timed_out = await _run(hanging, timeout=0.01)
+    assert timed_out["status"] == JobStatus.FAILED
+    assert timed_out["error"].startswith("Timed out")
+
+
+def test_stale_jobs_are_running_or_pending_past_the_timeout():
+    now = datetime(2026, 10, 18, 12, 0)
+    statement = stale_jobs_update(now, timeout=600)
+    compiled = statement.compile(dialect=postgresql.dialect())
+
+    sql = str(compiled)
+    assert "agent_jobs.status = %(status_1)s AND agent_jobs.started_at < %(started_at_1)s" in sql
+    assert "agent_jobs.status = %(status_2)s AND agent_jobs.created_at < %(created_at_1)s" in sql
+    assert compiled.params["status_1"] == JobStatus.RUNNING
+    assert compiled.params["status_2"] == JobStatus.PENDING
+    assert compiled.params["started_at_1"] == now - timedelta(minutes=11)
+    assert compiled.params["error"] == STALE_JOB_ERROR
+
+
+@pytest.mark.asyncio
+async def test_polling_a_job_whose_worker_died_fails_it():
+    job = AgentJob(
+        id=uuid.uuid4(), kind=JobKind.DEEP_SEARCH, status=JobStatus.RUNNING,
+        created_at=datetime.utcnow() - timedelta(hours=2), started_at=datetime.utcnow() - timedelta(hours=2),
+    )
+    statements = []
+
+    async def execute(statement):
+        statements.append(statement)
+        if len(statements) == 1:
+            return SimpleNamespace(scalars=lambda: SimpleNamespace(first=lambda: job))
+        return SimpleNamespace(rowcount=1)
+
+    async def refresh(instance):
+        instance.status = JobStatus.FAILED
+        instance.error = STALE_JOB_ERROR
+
+    async def commit():
+        pass
+
+    session = SimpleNamespace(execute=execute, commit=commit, refresh=refresh)
+    response = await JobService(timeout=600).get_job(job.id, session)
+
+    assert response.status == "failed"
+    assert response.error == STALE_JOB_ERROR
+    assert "agent_jobs.id = " in str(statements[1].compile(dialect=postgresql.dialect()))
@@ -0,0 +1,67 @@
+import asyncio
+import json
+
+import pytest
+
+from app.services.agent.new_card_batch_service import (
+    LocalBatchBackend,
+    NewCardBatchService,
+)
+from app.services.github.schema import AgentRequest, NewCardBatchRequest
+
+
+async def fake_create_message(params):
+    prompt = params["messages"][0]["content"]
+    if prompt == "broken":
+        return "not json"
+    if prompt == "unavailable":
+        raise RuntimeError("overloaded")
+    return json.dumps(
+        {
+            "cards": [
+                {
+                    "card_id": "task-1",
+                    "title": prompt,
+                    "description": "Research",
+                    "task_type": "research_task",
+                    "dependencies": [],
+                }
+            ]
+        }
+    )
+
+
+@pytest.mark.asyncio
+async def test_local_batch_tracks_items_and_validates_cards():
+    service = NewCardBatchService(LocalBatchBackend(fake_create_message))
+    batch_request = NewCardBatchRequest(
+        requests=[
+            AgentRequest(prompt="EV market"),
+            AgentRequest(prompt="broken"),
+            AgentRequest(prompt="unavailable"),
+        ]
+    )
+
+    submitted = await service.submit(batch_request)
+    assert submitted.status == "in_progress"
+    assert [item.status for item in submitted.items] == ["pending"] * 3
+
+    batch = submitted
+    while batch.status != "ended":
+        await asyncio.sleep(0.01)
+        batch = await service.get(submitted.batch_id)
+
+    assert batch.status == "ended"
+    assert [item.custom_id for item in batch.items] == ["item-0", "item-1", "item-2"]
+    assert [item.status for item in batch.items] == ["succeeded", "failed", "failed"]
+    assert batch.items[0].card_data[0].title == "EV market"
+    assert batch.items[2].error == "overloaded"
+    assert batch.request_counts["succeeded"] == 2
+
+
+@pytest.mark.asyncio
+async def test_unknown_batch_raises_key_error():
+    service = NewCardBatchService(LocalBatchBackend(fake_create_message))
+
+    with pytest.raises(KeyError):
+        await service.get("missing")
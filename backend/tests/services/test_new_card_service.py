@@ -0,0 +1,31 @@
+import json
+
+from app.services.agent.new_card_service import (
+    FEW_SHOT_EXAMPLES,
+    _get_system_blocks,
+    parse_cards_from_response,
+)
+from app.services.chat.context import count_tokens
+
+# Shortest prefix Anthropic caches for Sonnet 4
+MIN_CACHEABLE_TOKENS = 1024
+
+
+def test_cached_system_block_is_long_enough_to_be_cached():
+    (block,) = _get_system_blocks()
+
+    assert block["cache_control"] == {"type": "ephemeral"}
+    # The local estimate and four characters per token both bound it from below
+    assert count_tokens(block["text"]) >= MIN_CACHEABLE_TOKENS
+    assert len(block["text"]) / 4 >= MIN_CACHEABLE_TOKENS
+    assert '"card_id"' in block["text"] and '"$defs"' in block["text"]
+
+
+def test_system_block_is_identical_across_calls():
+    assert _get_system_blocks() == _get_system_blocks()
+
+
+def test_few_shot_examples_are_valid_responses():
+    for _, response in FEW_SHOT_EXAMPLES:
+        cards = parse_cards_from_response(json.dumps(response))
+        assert sum(card.task_type.value == "research_task" for card in cards) <= 1
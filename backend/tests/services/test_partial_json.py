@@ -0,0 +1,46 @@
+import json
+
+import pytest
+
+from app.services.agent.partial_json import IncrementalCardParser
+
+
+RESPONSE = "```json\n" + json.dumps(
+    {
+        "cards": [
+            {"card_id": "task-1", "title": "Research {EV} \"market\"", "parameters": {"topics": ["a", "b"]}, "dependencies": []},
+            {"card_id": "task-2", "title": "Call", "parameters": None, "dependencies": ["task-1"]},
+        ]
+    },
+    indent=2,
+) + "\n```"
+
+
+def test_cards_are_emitted_as_soon_as_they_close():
+    parser = IncrementalCardParser()
+    first_card_end = RESPONSE.index('"task-2"')
+
+    first = parser.feed(RESPONSE[:first_card_end])
+    second = parser.feed(RESPONSE[first_card_end:])
+
+    assert [card["card_id"] for card in first] == ["task-1"]
+    assert first[0]["title"] == 'Research {EV} "market"'
+    assert [card["card_id"] for card in second] == ["task-2"]
+    assert parser.finished
+    assert len(parser.document()["cards"]) == 2
+
+
+def test_single_character_chunks():
+    parser = IncrementalCardParser()
+
+    cards = [card for char in RESPONSE for card in parser.feed(char)]
+
+    assert [card["card_id"] for card in cards] == ["task-1", "task-2"]
+
+
+def test_incomplete_document_is_rejected():
+    parser = IncrementalCardParser()
+    parser.feed(RESPONSE[: len(RESPONSE) // 2])
+
+    with pytest.raises(ValueError):
+        parser.document()
@@ -0,0 +1,110 @@
+import asyncio
+
+import pytest
+
+from app.services.vapi.phone_numbers import PhoneNumberPool, is_line_failure
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _pool(strategy="lru", clock=None, **overrides):
+    options = dict(calls_per_minute=60.0, failure_threshold=2, quarantine_seconds=30)
+    options.update(overrides)
+    return PhoneNumberPool(["a", "b", "c"], strategy=strategy, clock=clock or FakeClock(), **options)
+
+
+@pytest.mark.asyncio
+async def test_lru_rotates_through_numbers():
+    clock = FakeClock()
+    pool = _pool(clock=clock)
+    used = []
+    for _ in range(3):
+        number = await pool.acquire()
+        pool.release(number, success=True)
+        used.append(number.id)
+        clock.now += 0.1
+
+    assert sorted(used) == ["a", "b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_least_loaded_skips_busy_and_throttled_numbers():
+    clock = FakeClock()
+    pool = _pool(strategy="least_loaded", clock=clock)
+
+    first = await pool.acquire()
+    second = await pool.acquire()
+    third = await pool.acquire()
+    pool.release(first, success=True)
+
+    # `first` is idle again but its bucket is empty until a second passes.
+    clock.now += 1.0
+    assert (await pool.acquire()) is first
+    assert {first.id, second.id, third.id} == {"a", "b", "c"}
+
+
+@pytest.mark.asyncio
+async def test_numbers_are_quarantined_after_repeated_failures():
+    clock = FakeClock()
+    pool = _pool(clock=clock)
+    failing = pool.numbers[0]
+    for _ in range(2):
+        failing.in_flight += 1
+        pool.release(failing, success=False)
+
+    assert pool.stats()[0]["quarantined"]
+    for _ in range(2):
+        number = await pool.acquire()
+        assert number is not failing
+
+    clock.now += 31
+    assert not pool.stats()[0]["quarantined"]
+
+
+@pytest.mark.asyncio
+async def test_acquire_fails_when_every_number_is_quarantined():
+    pool = _pool(failure_threshold=1)
+    for number in pool.numbers:
+        number.in_flight += 1
+        pool.release(number, success=False)
+
+    with pytest.raises(RuntimeError):
+        await pool.acquire()
+
+
+class ApiError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+def test_only_line_and_provider_errors_are_line_failures():
+    assert is_line_failure(ApiError(500))
+    assert is_line_failure(ApiError(429))
+    assert is_line_failure(ConnectionError("socket closed"))
+    assert not is_line_failure(ApiError(400))
+    assert not is_line_failure(ApiError(422))
+    assert not is_line_failure(asyncio.CancelledError())
+
+
+@pytest.mark.asyncio
+async def test_bad_requests_and_cancellation_do_not_quarantine_a_number():
+    pool = _pool(strategy="least_loaded", failure_threshold=1)
+    for error in (ApiError(400), asyncio.CancelledError()):
+        with pytest.raises(type(error)):
+            async with pool.lease():
+                raise error
+
+    assert not any(number["quarantined"] for number in pool.stats())
+    assert all(number.in_flight == 0 for number in pool.numbers)
+
+    with pytest.raises(ApiError):
+        async with pool.lease():
+            raise ApiError(503)
+    assert sum(number["quarantined"] for number in pool.stats()) == 1
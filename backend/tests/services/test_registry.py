@@ -0,0 +1,62 @@
+import pytest
+
+from app.services.registry import ServiceRegistry, ServiceUnavailableError
+
+
+def _fail(module):
+    raise RuntimeError("API key not set.")
+
+
+def test_service_is_created_once_on_first_use():
+    registry = ServiceRegistry()
+    created = []
+    registry.register("codec", "json", lambda module: created.append(module) or module.dumps)
+
+    assert registry.status()["codec"].status == "not_loaded"
+    assert registry.get("codec")([1]) == "[1]"
+    assert registry.get("codec") is registry.get("codec")
+
+    status = registry.status()["codec"]
+    assert len(created) == 1
+    assert status.status == "ready"
+    assert status.import_seconds is not None and status.init_seconds is not None
+
+
+def test_failed_service_is_unavailable_without_affecting_others():
+    registry = ServiceRegistry()
+    registry.register("broken", "json", _fail)
+    registry.register("codec", "json")
+
+    with pytest.raises(ServiceUnavailableError, match="API key not set"):
+        registry.get("broken")
+
+    assert registry.get("codec").dumps([]) == "[]"
+    assert registry.status()["broken"].status == "unavailable"
+
+
+@pytest.mark.asyncio
+async def test_warm_up_skips_unavailable_services():
+    registry = ServiceRegistry()
+    registry.register("broken", "json", _fail)
+    registry.register("codec", "json")
+
+    await registry.warm_up()
+
+    assert {name: status.status for name, status in registry.status().items()} == {
+        "broken": "unavailable",
+        "codec": "ready",
+    }
+
+
+def test_image_generation_without_hf_token_is_unavailable_not_an_import_error(monkeypatch):
+    from app.services import registry as registry_module
+
+    monkeypatch.delenv("HF_TOKEN", raising=False)
+    registry = ServiceRegistry()
+    registry.register(
+        "image_generation", "app.services.agent.image_generation_logic", registry_module._image_generation
+    )
+
+    with pytest.raises(ServiceUnavailableError, match="HF_TOKEN"):
+        registry.get("image_generation")
+    assert registry.status()["image_generation"].import_seconds is not None
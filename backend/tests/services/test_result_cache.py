@@ -0,0 +1,41 @@
+import pytest
+
+from app.services.agent.result_cache import (
+    DeepSearchResultCache,
+    LRUCache,
+    make_cache_key,
+)
+
+
+def test_cache_key_ignores_case_and_whitespace_but_not_config():
+    config = {"model_id": "model-a", "max_steps": 2}
+
+    key = make_cache_key("Market overview  of\nEV chargers", config)
+
+    assert key == make_cache_key("  market OVERVIEW of ev chargers ", config)
+    assert key != make_cache_key("market overview of ev chargers", {**config, "max_steps": 3})
+
+
+def test_lru_cache_evicts_least_recently_used_and_expired_entries():
+    cache = LRUCache(max_entries=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+    cache.set("d", 4, ttl=0)
+    assert cache.get("d") is None
+
+
+@pytest.mark.asyncio
+async def test_memory_tier_reports_hits_and_misses():
+    cache = DeepSearchResultCache(ttl=60, max_entries=10)
+
+    assert await cache.get("key") == (None, None)
+    await cache.set("key", "prompt", "answer", {"model_id": "model-a"})
+
+    assert await cache.get("key") == ("answer", "memory")
+    assert cache.stats()["hit_rate"] == 0.5
@@ -0,0 +1,96 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.vapi.assistants import (
+    AssistantManager,
+    assistant_config_hash,
+    build_assistant_config,
+)
+from app.services.vapi.dispatcher import CallDispatcher
+
+
+class NotFound(Exception):
+    status_code = 404
+    headers = {}
+
+
+class FakeAssistants:
+    def __init__(self):
+        self.created = []
+        self.updated = []
+        self.missing = set()
+
+    def create(self, **config):
+        self.created.append(config)
+        return SimpleNamespace(id=f"assistant-{len(self.created)}")
+
+    def update(self, assistant_id, **config):
+        if assistant_id in self.missing:
+            raise NotFound()
+        self.updated.append((assistant_id, config))
+
+
+def _config(prompt="Hello {{name}}", voice_id="Elliot"):
+    return build_assistant_config(
+        name="InsightBot",
+        prompt_template=prompt,
+        model_provider="openai",
+        model="gpt-4o",
+        voice_provider="vapi",
+        voice_id=voice_id,
+    )
+
+
+def _manager():
+    assistants = FakeAssistants()
+    dispatcher = CallDispatcher(
+        rate_per_second=1000.0, burst=100, max_concurrency=4, max_retries=0, base_retry_delay=0.001
+    )
+    return AssistantManager(SimpleNamespace(assistants=assistants), dispatcher), assistants
+
+
+def test_config_hash_ignores_key_order_but_not_content():
+    config = _config()
+    reordered = dict(reversed(list(config.items())))
+
+    assert assistant_config_hash(config) == assistant_config_hash(reordered)
+    assert assistant_config_hash(config) != assistant_config_hash(_config(prompt="Hi {{name}}"))
+
+
+@pytest.mark.asyncio
+async def test_assistant_is_created_once_for_an_unchanged_config():
+    manager, assistants = _manager()
+
+    ids = await asyncio.gather(*(manager.ensure(_config()) for _ in range(5)))
+
+    assert ids == ["assistant-1"] * 5
+    assert len(assistants.created) == 1
+    assert assistants.updated == []
+    assert manager.stats()["hits"] == 4
+
+
+@pytest.mark.asyncio
+async def test_changed_config_updates_the_assistant_in_place():
+    manager, assistants = _manager()
+    await manager.ensure(_config())
+
+    assistant_id = await manager.ensure(_config(voice_id="Paige"))
+
+    assert assistant_id == "assistant-1"
+    assert len(assistants.created) == 1
+    assert assistants.updated[0][0] == "assistant-1"
+    assert assistants.updated[0][1]["voice"]["voiceId"] == "Paige"
+
+
+@pytest.mark.asyncio
+async def test_assistant_deleted_on_vapi_is_recreated():
+    manager, assistants = _manager()
+    await manager.ensure(_config())
+    assistants.missing.add("assistant-1")
+
+    assistant_id = await manager.ensure(_config(prompt="Bonjour {{name}}"))
+
+    assert assistant_id == "assistant-2"
+    assert len(assistants.created) == 2
@@ -0,0 +1,96 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.services.vapi.dispatcher import CallDispatcher
+
+
+class RateLimited(Exception):
+    status_code = 429
+    headers = {}
+
+
+def _dispatcher(**overrides):
+    options = dict(
+        rate_per_second=1000.0,
+        burst=100,
+        max_concurrency=4,
+        max_retries=3,
+        base_retry_delay=0.001,
+    )
+    options.update(overrides)
+    return CallDispatcher(**options)
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_calls_are_retried():
+    attempts = []
+
+    def create():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise RateLimited()
+        return "call-1"
+
+    result, stats = await _dispatcher().dispatch(create)
+
+    assert result == "call-1"
+    assert stats["attempts"] == 3
+    assert "queue_wait_time" in stats
+
+
+@pytest.mark.asyncio
+async def test_other_errors_and_exhausted_retries_propagate():
+    def fail():
+        raise ValueError("bad number")
+
+    def always_limited():
+        raise RateLimited()
+
+    with pytest.raises(ValueError):
+        await _dispatcher().dispatch(fail)
+    with pytest.raises(RateLimited):
+        await _dispatcher(max_retries=1).dispatch(always_limited)
+
+
+@pytest.mark.asyncio
+async def test_calls_run_off_the_event_loop_within_the_concurrency_cap():
+    lock = threading.Lock()
+    running = []
+    peak = []
+
+    def create():
+        with lock:
+            running.append(1)
+            peak.append(len(running))
+        time.sleep(0.05)
+        with lock:
+            running.pop()
+        return "ok"
+
+    dispatcher = _dispatcher(max_concurrency=2)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        for _ in range(5):
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    await asyncio.gather(ticker(), *(dispatcher.dispatch(create) for _ in range(4)))
+
+    assert max(peak) == 2
+    assert ticks == 5
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_paces_calls():
+    dispatcher = _dispatcher(rate_per_second=20.0, burst=1)
+    start = time.monotonic()
+
+    results = await asyncio.gather(*(dispatcher.dispatch(lambda: "ok") for _ in range(4)))
+
+    assert [stats["attempts"] for _, stats in results] == [1, 1, 1, 1]
+    assert time.monotonic() - start >= 0.14
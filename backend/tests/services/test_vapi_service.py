@@ -0,0 +1,31 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.vapi.dispatcher import CallDispatcher
+from app.services.vapi.phone_numbers import PhoneNumberPool
+from app.services.vapi.service import VapiService
+
+
+@pytest.mark.asyncio
+async def test_queue_wait_time_includes_the_wait_for_a_phone_number(mocker):
+    service = VapiService.__new__(VapiService)
+    service.phone_numbers = PhoneNumberPool(
+        ["a"], strategy="lru", calls_per_minute=600.0, failure_threshold=3, quarantine_seconds=30
+    )
+    service.dispatcher = CallDispatcher(
+        rate_per_second=1000.0, burst=100, max_concurrency=4, max_retries=0, base_retry_delay=0.001
+    )
+    service.client = SimpleNamespace(
+        calls=SimpleNamespace(create=mocker.Mock(side_effect=lambda **call: SimpleNamespace(id="call-1")))
+    )
+
+    await service._place_call(assistant_id="assistant-1")
+    call, phone_number_id, stats = await service._place_call(assistant_id="assistant-1")
+
+    assert (call.id, phone_number_id) == ("call-1", "a")
+    service.client.calls.create.assert_called_with(phone_number_id="a", assistant_id="assistant-1")
+    # The single number allows one call per 0.1s, so the second call waited for it
+    assert stats["number_wait_time"] >= 0.05
+    assert stats["queue_wait_time"] >= stats["number_wait_time"]
+    assert stats["attempts"] == 1
@@ -0,0 +1,158 @@
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.vapi.schema import VapiWebhookMessage
+from app.services.vapi.webhooks import CallEventWriter, build_call_result, to_call_event
+
+
+def _message(**fields):
+    return VapiWebhookMessage(call={"id": "call-1"}, **fields)
+
+
+def test_only_stored_event_types_become_rows():
+    status = to_call_event(_message(type="status-update", status="ringing"))
+
+    assert status["call_id"] == "call-1"
+    assert status["status"] == "ringing"
+    assert "call" not in status["payload"]
+    assert to_call_event(_message(type="speech-update")) is None
+    assert to_call_event(_message(type="transcript", transcriptType="partial")) is None
+    assert to_call_event(VapiWebhookMessage(type="status-update")) is None
+
+
+@pytest.mark.asyncio
+async def test_writer_flushes_events_in_batches():
+    batches = []
+
+    async def write_batch(events):
+        batches.append(list(events))
+
+    writer = CallEventWriter(write_batch, batch_size=3, flush_interval=0.05, max_queue=10)
+    writer.start()
+    for index in range(5):
+        await writer.submit({"index": index})
+    await asyncio.sleep(0.1)
+    await writer.stop()
+
+    assert [len(batch) for batch in batches] == [3, 2]
+    assert writer.stats()["written"] == 5
+
+
+@pytest.mark.asyncio
+async def test_writer_rejects_events_when_the_buffer_is_full():
+    async def write_batch(events):
+        pass
+
+    writer = CallEventWriter(write_batch, batch_size=10, flush_interval=1.0, max_queue=1)
+    writer._task = asyncio.create_task(asyncio.sleep(10))
+    await writer.submit({"index": 0})
+
+    with pytest.raises(RuntimeError):
+        await writer.submit({"index": 1})
+    writer._task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_stop_drains_without_cancelling_a_write():
+    batches = []
+    writing = asyncio.Event()
+
+    async def write_batch(events):
+        writing.set()
+        await asyncio.sleep(0.05)
+        batches.append(list(events))
+
+    writer = CallEventWriter(write_batch, batch_size=2, flush_interval=0.01, max_queue=10)
+    writer.start()
+    for index in range(2):
+        await writer.submit({"index": index})
+    await writing.wait()
+    await writer.submit({"index": 2})
+    stopping = asyncio.create_task(writer.stop())
+    await asyncio.sleep(0)
+    # Vapi redelivers what the stopping writer turns away
+    with pytest.raises(RuntimeError):
+        await writer.submit({"index": 3})
+    await stopping
+
+    assert [event["index"] for batch in batches for event in batch] == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_failed_batches_are_retried_until_written():
+    attempts = []
+
+    async def write_batch(events):
+        attempts.append(len(events))
+        if len(attempts) < 3:
+            raise ConnectionError("database unavailable")
+
+    writer = CallEventWriter(write_batch, batch_size=10, flush_interval=0.01, max_queue=10)
+    writer.start()
+    await writer.submit({"index": 0})
+    await asyncio.sleep(0.1)
+    await writer.stop()
+
+    assert attempts == [1, 1, 1]
+    assert writer.stats()["written"] == 1
+    assert writer.stats()["dropped"] == 0
+
+
+@pytest.mark.asyncio
+async def test_direct_writes_fail_the_delivery():
+    async def write_batch(events):
+        raise ConnectionError("database unavailable")
+
+    writer = CallEventWriter(write_batch, batch_size=10, flush_interval=0.01, max_queue=10)
+    with pytest.raises(RuntimeError):
+        await writer.submit({"index": 0})
+    assert writer.stats()["received"] == 0
+
+
+def test_call_result_folds_events_in_order():
+    def event(event_type, status=None, **payload):
+        return SimpleNamespace(
+            event_type=event_type, status=status, payload=payload, received_at=datetime(2026, 1, 1)
+        )
+
+    result = build_call_result(
+        "call-1",
+        [
+            event("status-update", "ringing"),
+            event("transcript", role="assistant", transcript="Hello"),
+            event(
+                "end-of-call-report",
+                "ended",
+                endedReason="customer-ended-call",
+                analysis={"summary": "Agreed to meet."},
+                artifact={"recordingUrl": "https://example.com/r.wav"},
+            ),
+        ],
+    )
+
+    assert result.status == "ended"
+    assert result.ended_reason == "customer-ended-call"
+    assert result.summary == "Agreed to meet."
+    assert result.transcript == "assistant: Hello"
+    assert result.events_count == 3
+
+
+@pytest.mark.asyncio
+async def test_webhook_requires_a_configured_secret(monkeypatch):
+    from fastapi import HTTPException
+
+    from app.routes import interface
+
+    request = SimpleNamespace(message=_message(type="status-update", status="ringing"))
+    monkeypatch.setattr(interface.settings, "VAPI_WEBHOOK_SECRET", None)
+    with pytest.raises(HTTPException) as error:
+        await interface.receive_vapi_webhook(request, x_vapi_secret=None)
+    assert error.value.status_code == 503
+
+    monkeypatch.setattr(interface.settings, "VAPI_WEBHOOK_SECRET", "s3cret")
+    with pytest.raises(HTTPException) as error:
+        await interface.receive_vapi_webhook(request, x_vapi_secret="guess")
+    assert error.value.status_code == 401
@@ -36,13 +36,12 @@ async def test_indexing_and_db_integration():
             
             # Test 2: Run indexing with database integration
             print('\n2. Running indexing with database integration...')
-            cache_name = await indexer_service.save_indexed_data_to_db(
+            result = await indexer_service.save_indexed_data_to_db(
                 owner=owner,
                 repo=repo,
                 session=session,
-                gemini_api_key=os.getenv('GEMINI_API_KEY')
             )
-            print(f'Indexing completed. Cache name: {cache_name}')
+            print(f'Indexing completed: {result}')
             
             # Test 3: Verify repository was created/updated
             print('\n3. Verifying repository in database...')